@@ -0,0 +1,46 @@
+#!/usr/bin/env python2
+
+# Find the crossover between serial and chunked parallel rendering of
+# gEDA footprints.  Prints one row per pin count:
+#   pins  serial(s)  parallel(s)  speedup
+# Usage: bench_parallel.py [jobs]
+
+import sys
+import time
+import landmaker.gedarenderer as r
+import landmaker.footprintcore as fc
+
+def warning_sink(msg):
+    pass
+
+def make_so(pins):
+    rules = fc.RulesDictionary(fc._defaultRules)
+    return r.Geda_FP_so.from_kwargs('so', rules, fc.DrillRack(),
+        warning_sink, pins=pins, padlen=fc.Dim.MM(1.3),
+        padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27),
+        span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13))
+
+def best_of(n, fn):
+    t = []
+    for i in xrange(n):
+        t0 = time.time()
+        fn()
+        t.append(time.time() - t0)
+    return min(t)
+
+def main(jobs):
+    saved = r.render_jobs, r.parallel_threshold
+    print '{0:>7s} {1:>10s} {2:>10s} {3:>8s}'.format(
+        'pins', 'serial', 'parallel', 'speedup')
+    for pins in [500, 1000, 2000, 5000, 10000, 20000, 50000, 100000]:
+        fp = make_so(pins)
+        r.render_jobs = 1
+        serial = best_of(3, lambda: list(fp.rendering(warning_sink)))
+        r.render_jobs, r.parallel_threshold = jobs, 0
+        parallel = best_of(3, lambda: list(fp.rendering(warning_sink)))
+        print '{0:7d} {1:10.4f} {2:10.4f} {3:8.2f}'.format(
+            pins, serial, parallel, serial / parallel)
+    r.render_jobs, r.parallel_threshold = saved
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python2
+
+# Time each phase of making a footprint, for every plugin over a corpus
+# of parameters from small parts to extreme ones:
+#   lex        KWParamLexer over the parameter string
+#   kwargs     parse_kwargs()
+#   build      from_kwargs(), or parse() for plugins without it
+#   courtyard  make_courtyard()
+#   render     gEDA rendering()
+# Times are seconds per call, best of several runs.  Results are written
+# as JSON and compared with a baseline; a phase slower than the baseline
+# by more than the threshold is a regression, and the exit status is 1.
+# Baselines only compare on the machine they were made on, so they are
+# not committed: the first run saves one, as does --save-baseline, and a
+# baseline from another machine is not compared with.
+#
+# Usage: bench_plugins.py [-o results.json] [-b baseline.json]
+#                         [-t threshold] [--save-baseline] [-k filter]
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+from lookaheadtools import LinesOf
+
+FORMAT = 1
+PHASES = ['lex', 'kwargs', 'build', 'courtyard', 'render']
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+
+def warning_sink(msg):
+    pass
+
+def so(pins):
+    return 'pins={0:d} padlen=1.3mm padwidth=.6mm pitch=1.27mm ' \
+           'span=10.65mm pkglen={1:.2f}mm'.format(pins, pins/2 * 1.27 + 1)
+
+def qfp(pins):
+    span = pins/4 * 0.5 + 2
+    return 'pins={0:d} padlen=0.8mm padwidth=0.25mm pitch=0.5mm ' \
+           'span={1:.1f} body={2:.1f},{2:.1f} thermal=3,3 thermalexp=2.6,2.6 ' \
+           'vias=3,3 viadrill=0.3 gang'.format(pins, span, span - 2)
+
+def bga(n):
+    return 'rows={0:d} cols={0:d} pitch=0.8mm ball=0.4mm depop=A1 ' \
+           'body={1:.1f},{1:.1f}'.format(n, n * 0.8 + 1)
+
+def header(cols):
+    return 'rows=2 cols={0:d} drill=0.04 dia=70 ' \
+           'shroud={1:d},350'.format(cols, cols * 100 + 300)
+
+# plugin: [(size, parameters)]
+corpus = {
+    'so': [('small', so(8)), ('medium', so(64)), ('large', so(512)),
+           ('extreme', so(4096))],
+    'qfp': [('small', qfp(32)), ('medium', qfp(144)), ('large', qfp(512)),
+            ('extreme', qfp(2048))],
+    'bga': [('small', bga(4)), ('medium', bga(16)), ('large', bga(40)),
+            ('extreme', bga(100))],
+    'header': [('small', header(5)), ('medium', header(40)),
+               ('large', header(200)), ('extreme', header(1000))],
+    'hole': [('small', 'pad=7mm drill=3mm')],
+    'enc': [('small', "type='RE130F'")],
+    'th2pad': [('small', "desc='foo' dia=45 spacing=450 drill=.02 artwidth=200")],
+    'usbconnmolex': [('small', "type='54819-0519'")],
+}
+
+def per_call(fn, repeat):
+    "Seconds per call of fn, best of repeat runs of at least 50 ms."
+    number = 1
+    while True:
+        t0 = time.time()
+        for i in xrange(number):
+            fn()
+        t = time.time() - t0
+        if t >= 0.05 or number >= 1 << 20:
+            break
+        number *= 2
+    best = t
+    for i in xrange(repeat - 1):
+        t0 = time.time()
+        for i in xrange(number):
+            fn()
+        best = min(best, time.time() - t0)
+    return best / number
+
+def bench(name, params, repeat):
+    "{phase: seconds per call} for one corpus entry."
+    cls = r.fp_plugins[name]
+    rules = fc.RulesDictionary({'annulus_hs': fc.Dim.MIL(20)},
+                               parent=fc._defaultRules).snapshot()
+    rack = fc.drillRacks['default']
+    kw = cls.parse_kwargs(params, cls.kwspecs)
+    if 'from_kwargs' in dir(cls):
+        build = lambda: cls.from_kwargs(name, rules, rack, warning_sink, **kw)
+    else:
+        build = lambda: cls.parse(name, params, rules, rack, warning_sink)
+    fp = build()
+    fp.make_courtyard(rules['courtyard'])
+    return {
+        'lex': per_call(lambda: list(fc.KWParamLexer(LinesOf(params))),
+                        repeat),
+        'kwargs': per_call(lambda: cls.parse_kwargs(params, cls.kwspecs),
+                           repeat),
+        'build': per_call(build, repeat),
+        'courtyard': per_call(lambda: fp.make_courtyard(rules['courtyard']),
+                              repeat),
+        'render': per_call(lambda: list(fp.rendering(warning_sink)), repeat),
+    }
+
+def run(pattern, repeat):
+    fc.activateRenderer(r.Geda_Footprint)
+    results = {}
+    for name in sorted(corpus):
+        for size, params in corpus[name]:
+            key = name + '/' + size
+            if pattern and pattern not in key:
+                continue
+            results[key] = bench(name, params, repeat)
+            print '{0:<20s}'.format(key) + ' '.join(
+                ['{0:>11s}'.format(fmt(results[key][p])) for p in PHASES])
+            sys.stdout.flush()
+    return results
+
+def fmt(t):
+    if t < 1e-3:
+        return '{0:.1f} us'.format(t * 1e6)
+    if t < 1:
+        return '{0:.2f} ms'.format(t * 1e3)
+    return '{0:.3f} s'.format(t)
+
+def compare(results, baseline, threshold, floor=5e-6):
+    """(key, phase, base, now) for each phase slower than baseline by
+    more than threshold, ignoring differences under floor seconds."""
+    slower = []
+    for key in sorted(results):
+        for phase in PHASES:
+            try:
+                base = baseline[key][phase]
+            except KeyError:
+                continue # New in this run.
+            now = results[key][phase]
+            if now > base * (1 + threshold) and now - base > floor:
+                slower.append((key, phase, base, now))
+    return slower
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark plugin phases against a baseline.')
+    parser.add_argument('-o', '--output', help='write results as JSON')
+    parser.add_argument('-b', '--baseline', default=BASELINE,
+        help='baseline JSON, default benchmarks/baseline.json; '
+             'saved by the first run')
+    parser.add_argument('-t', '--threshold', type=float, default=0.25,
+        help='allowed slowdown as a fraction, default 0.25')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+        help='runs per phase, best is kept')
+    parser.add_argument('-k', '--filter', default='',
+        help='only run entries whose plugin/size contains this')
+    parser.add_argument('--save-baseline', action='store_true',
+        help='write the results as the new baseline')
+    args = parser.parse_args()
+    print '{0:<20s}'.format('plugin/size') + ' '.join(
+        ['{0:>11s}'.format(p) for p in PHASES])
+    results = run(args.filter, args.repeat)
+    doc = {'format': FORMAT, 'python': platform.python_version(),
+           'machine': platform.node(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(doc, f, indent=1, sort_keys=True)
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump(doc, f, indent=1, sort_keys=True)
+        print 'Saved baseline', args.baseline
+        return 0
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (IOError, ValueError):
+        print 'Cannot read baseline', args.baseline
+        return 0
+    if baseline.get('format') != FORMAT:
+        print 'Baseline format differs; make a new one with --save-baseline.'
+        return 0
+    if baseline.get('machine') != doc['machine']:
+        print 'Warning: baseline was made on {0:s}, not {1:s}; ' \
+              'not compared.'.format(baseline.get('machine'), doc['machine'])
+        print 'Make a new one with --save-baseline.'
+        return 0
+    slower = compare(results, baseline['results'], args.threshold)
+    for key, phase, base, now in slower:
+        print 'REGRESSION {0:s} {1:s}: {2:s} -> {3:s} ({4:+.0f}%)'.format(
+            key, phase, fmt(base), fmt(now), (now / base - 1) * 100)
+    if slower:
+        return 1
+    print 'No phase slower than baseline by more than {0:.0f}%.'.format(
+        args.threshold * 100)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,8 +19,12 @@
 import os
 import re
 import readline
+import profiling
 
-debug = ''
+hooks = None # footprintcore.hooks, set by the main program.
+sourceFiles = [] # Files read by include and load, in order.
+errorsReported = 0 # Errors printed by include so far.
+verbsUsed = set() # Verbs dispatched so far.
 
 class CommandSyntaxError(Exception):
     # Error messgage will be in args[0].
@@ -72,24 +76,29 @@ class Cmd_include(Command):
     breadcrumbs = set()
     def execute(self, s, warning_callback):
         "s : <filename>"
+        global errorsReported
         s = s.strip()
         if s == '':
             raise CommandSyntaxError('No include file specified.')
         filename = s.split(' ')[0]
+        # Recorded even if missing: creating it changes what was read.
+        sourceFiles.append(filename)
         if not os.path.isfile(filename):
             raise CommandSyntaxError(filename + ' is not a file.')
         if filename in self.breadcrumbs:
             raise CommandSyntaxError('Recursive include encountered.')
         self.breadcrumbs.add(filename)
-        if 'i' in debug:
-            print 'from:',filename
+        if hooks.on:
+            hooks.event('include', file=filename)
         with open(filename) as f:
-            for ln in f:
-                if 'i' in debug:
-                    print 'including:',ln
+            for lineno, ln in enumerate(f, 1):
+                if hooks.on:
+                    hooks.event('include.line', file=filename, line=lineno,
+                                text=ln.rstrip('\n'))
                 try:
                     dispatchCommand(ln, warning_callback)
                 except CommandSyntaxError as e:
+                    errorsReported += 1
                     print 'Error in batch file {0:s}:'.format(filename)
                     print e.args[0]
                     break
@@ -99,6 +108,59 @@ class Cmd_include(Command):
         if longhelp:
             yield "  Execute commands from <filename>."
     
+class Cmd_load(Command):
+    "Load rule sets and drill racks from a data file."
+    def execute(self, s, warning_callback):
+        "s : <filename>"
+        filename = s.strip()
+        if filename == '':
+            raise CommandSyntaxError('No rule file specified.')
+        rf = self.ruleFiles
+        sourceFiles.append(filename)
+        try:
+            rf.install(rf.load(filename),
+                       verbs['ruleset'].ruleSets, verbs['drillrack'].drillRacks,
+                       verbs['ruleset'].rulesDictClass,
+                       verbs['drillrack'].rackClass)
+        except rf.RuleFileError as e:
+            raise CommandSyntaxError(e.args[0])
+    def helptext(self, longhelp = ''):
+        yield "load <filename>"
+        if longhelp:
+            yield "  Define rule sets and drill racks from a .json or .ini file."
+            yield "  Existing sets and racks are updated."
+
+class Cmd_profile(Command):
+    "Time the phases of fp commands."
+    last = None # Profiler of the last run, for report after off.
+    def execute(self, s, warning_callback):
+        "s : on|off|report"
+        s = s.strip()
+        if s == 'on':
+            if self.last is not None:
+                hooks.remove_sink(self.last)
+            self.last = profiling.Profiler()
+            hooks.add_sink(self.last)
+        elif s == 'off':
+            if self.last is not None:
+                hooks.remove_sink(self.last)
+        elif s == 'report' or s == '':
+            if self.last is None:
+                print 'Profiling is off.'
+                return
+            print 'Profiling is', 'on.' if self.last in hooks.sinks else 'off.'
+            for ln in self.last.report():
+                print ln
+        else:
+            raise CommandSyntaxError('Expected: profile on|off|report')
+    def helptext(self, longhelp = ''):
+        yield "profile on|off|report"
+        if longhelp:
+            yield "  Record wall and CPU time of each phase of fp commands:"
+            yield "  params, geometry, courtyard, render and write.  report"
+            yield "  totals them by plugin and lists the slowest footprints."
+            yield "  profile on starts over."
+
 class Cmd_drillrack(Command):
     "Set/inspect drill rack."
     def execute(self, s, warning_callback):
@@ -117,6 +179,10 @@ class Cmd_drillrack(Command):
                 print 'Symbolic drills:'
             for drl,sz in sym.items():
                 print drl,'=',str(sz)
+        elif s.split(' ')[0] == 'optimize':
+            self.optimize(s.split()[1:], warning_callback)
+        elif s.split(' ')[0] == 'chart':
+            self.chart(s.split()[1:], warning_callback)
         else:
             spl = s.split(' ')
             newRack, oldRack = spl[0],spl[1] if len(spl) > 1 else None
@@ -136,6 +202,54 @@ class Cmd_drillrack(Command):
                 self.drillRacks[self.currentRack] = rk
             global rack
             rack = self.drillRacks[self.currentRack]
+    def optimize(self, args, warning_callback):
+        "args : <newname> <batchfile> [<n>]"
+        if len(args) not in (2, 3):
+            raise CommandSyntaxError('Expected: drillrack optimize <newname> <batchfile> [<n>]')
+        newRack, batchFile = args[0:2]
+        try:
+            maxDrills = int(args[2]) if args[2:] else None
+        except ValueError:
+            raise CommandSyntaxError('Number of drills must be an integer.')
+        found = self.scan(batchFile, warning_callback)
+        requests = []
+        for label, footprint in found:
+            requests.extend(footprint.drill_requests(currentRules()))
+        try:
+            rk = self.rackClass.optimal(requests, maxDrills)
+        except ValueError as e:
+            raise CommandSyntaxError(e.args[0])
+        print 'Creating drill rack:',newRack
+        print '{0:d} holes in {1:d} footprints fit {2:d} drills.'.format(
+            len(requests), len(found), len(rk.drills()))
+        self.currentRack = newRack
+        self.drillRacks[self.currentRack] = rk
+        global rack
+        rack = rk
+    def chart(self, args, warning_callback):
+        "args : <batchfile>"
+        if len(args) != 1:
+            raise CommandSyntaxError('Expected: drillrack chart <batchfile>')
+        found = self.scan(args[0], warning_callback)
+        rk = self.drillRacks[self.currentRack]
+        print '{0:<16s} {1:>5s} {2:>8s} {3:>7s} {4:>10s} {5:>7s} {6:>6s}'.format(
+            'Footprint', 'Holes', 'mm', 'inch', 'Rack', 'Nearest', 'Larger')
+        for name, holes, drill, fit, near, above in rk.chart(found):
+            print '{0:<16s} {1:5d} {2:8.3f} {3:7.4f} {4:>10s} {5:>7s} {6:>6s}'.format(
+                name, holes, drill.mm, drill.inch, str(fit), near, above or '-')
+    def scan(self, batchFile, warning_callback):
+        """(label, footprint) for the footprints of batchFile, made with
+        exact drills and kept instead of written out."""
+        global rack
+        current = rack
+        rack = self.drillRacks['none']
+        verbs['fp'].scan = found = []
+        try:
+            verbs['include'].execute(batchFile, warning_callback)
+        finally:
+            verbs['fp'].scan = None
+            rack = current
+        return found
     def helptext(self, longhelp = ''):
         yield "drillrack [<name>]"
         if longhelp:
@@ -143,6 +257,13 @@ class Cmd_drillrack(Command):
             yield "  drillrack <name> ; set current drill rack to <name>."
             yield "  drillrack ? ; show drills in current rack."
             yield "  drillrack <newname> <oldname> ; create new rack from old."
+            yield "  drillrack optimize <newname> <batchfile> [<n>] ; create new"
+            yield "    rack with the fewest drills, or best n drills, for the holes"
+            yield "    of the footprints in <batchfile>, within rules drilltol"
+            yield "    and minannulus."
+            yield "  drillrack chart <batchfile> ; list the holes of the footprints"
+            yield "    in <batchfile> with their inch, current rack and number"
+            yield "    drill equivalents."
 
 class Cmd_drill(Command):
     "Add drills to drill rack."
@@ -200,47 +321,102 @@ class Cmd_ruleset(Command):
         elif s == '?':
             print 'Rules in {0:s}:'.format(self.currentSetName)
             rs = self.ruleSets[self.currentSetName]
-            for name in rs:
-                print '{0:s} = {1:s}'.format(name, str(rs[name]))
+            snap = rs.snapshot()
+            for name in sorted(snap.keys()):
+                try:
+                    value = str(snap[name])
+                except FootprintException as e:
+                    value = e.msg
+                if isinstance(snap.raw(name), ruleExprClass):
+                    value += ' [' + str(snap.raw(name)) + ']'
+                print '{0:s} = {1:s}{2:s}'.format(name, value,
+                    '' if rs.own(name) else ' (inherited)')
         else:
-            s = s.split(' ')[0] # Don't allow spaces in name.
-            if s in self.ruleSets:
-                self.currentSetName = s
-            else:
-                print 'Creating new ruleset:',s
-                rd = self.rulesDictClass()
-                self.currentSetName = s
-                self.ruleSets[s] = rd
+            t = s.split()
+            name = t[0] # Don't allow spaces in name.
+            if len(t) == 3 and t[1] == 'from':
+                if name in self.ruleSets:
+                    raise CommandSyntaxError(name + ' already exists.')
+                try:
+                    parent = self.ruleSets[t[2]]
+                except KeyError:
+                    raise CommandSyntaxError(t[2] + " doesn't exist.")
+                print 'Creating new ruleset:',name,'from',t[2]
+                self.ruleSets[name] = self.rulesDictClass(parent=parent)
+            elif len(t) != 1:
+                raise CommandSyntaxError('Expected: ruleset <name> [from <parent>]')
+            elif name not in self.ruleSets:
+                print 'Creating new ruleset:',name
+                self.ruleSets[name] = self.rulesDictClass()
+            self.currentSetName = name
             global rules
             rules = self.ruleSets[self.currentSetName]
     def helptext(self, longhelp = ''):
-        yield "ruleset [ <name> ]"
+        yield "ruleset [ <name> [ from <parent> ] ]"
         if longhelp:
             yield "  ruleset ; show current rule set and available sets."
             yield "  ruleset <name> ; set design rules to <name>."
+            yield "  ruleset <name> from <parent> ; create rule set <name>,"
+            yield "    taking rules it does not set from <parent>."
             yield "  ruleset ? ; show current rules and values."
     
+def parseRule(s, warning_callback=None):
+    """s : <rulename> = <value> <units>, returns (rulename, value).
+    The value may be an expression over other rules.  One that names
+    an unknown rule is warned about, and read as a value or text."""
+    try:
+        ruleName, setting = [x.strip() for x in s.split('=')]
+        snap = rules.snapshot()
+        expr = ruleExprClass.maybe(setting, snap)
+        if expr is not None:
+            return ruleName, expr
+        msg = ruleExprClass.unknown(setting, snap)
+        if msg and warning_callback:
+            warning_callback(ruleName + ': ' + msg)
+        m = re.match(r'([0-9.]+)(\s+)?([a-z]+)?',setting)
+        if m:
+            value, units = m.group(1),m.group(3)
+            return ruleName, dimClass.VU(value, units)
+        return ruleName, setting
+    except ValueError:
+        raise CommandSyntaxError('Rule syntax error.')
+
+def currentRules(overrides=None):
+    "Snapshot of the current rules, with overrides laid over them."
+    snap = rules.snapshot()
+    return snap.override(overrides) if overrides else snap
+
+def splitRuleOverrides(params, warning_callback=None):
+    "Split '@rule <rulename>=<value>' overrides off plugin parameters."
+    t = re.split(r'(?:^|\s)@rule\s', params)
+    return t[0].strip(), dict([parseRule(o, warning_callback)
+                               for o in t[1:]])
+
 class Cmd_rule(Command):
     "Add design rule."
     def execute(self, s, warning_callback):
         "s : <rulename> = <value> <units>"
-        try:
-            ruleName, setting = [x.strip() for x in s.split('=')]
-            m = re.match(r'([0-9.]+)(\s+)?([a-z]+)?',setting)
-            if m:
-                value, units = m.group(1),m.group(3)
-                rules[ruleName] = dimClass.VU(value, units)
-            else:
-                rules[ruleName] = setting
-        except ValueError:
-            raise CommandSyntaxError('Rule syntax error.')        
+        ruleName, value = parseRule(s, warning_callback)
+        rules[ruleName] = value
     def helptext(self, longhelp = ''):
         yield "rule <rule name>  = <value>"
         if longhelp:
             yield "  Set <rule name> to <value> in current rule set."
+            yield "  <value> may be an expression over other rules,"
+            yield "  e.g. rule pad_hs = mindrill + 2*annulus_hs"
     
+def footprintLabel(footprintname, params, filename):
+    """Name to report a footprint by: its file, else its name, else
+    (for 'fp . ...') its plug-in and parameters."""
+    if filename:
+        return filename
+    if footprintname != '.':
+        return footprintname
+    return params
+
 class Cmd_fp(Command):
     "Dipatch to footprint plug-in."
+    scan = None # A list to collect (label, footprint) in instead of rendering.
     def execute(self, s, warning_callback):
         "s : <footprintname> <fp-plug-in> <parameters>"
         t = s.strip().split(' ',1)
@@ -253,19 +429,43 @@ class Cmd_fp(Command):
         # Extract filename, if any.
         t = t[1].split('>')
         params, filename = t[0].strip(),t[1].strip() if t[1:] else ''
+        label = footprintLabel(footprintname, params, filename)
+        if hooks.on:
+            hooks.event('fp', footprint=label, plugin=params.split(' ')[0])
         footprint = self.dispatchPlugin(footprintname, params, warning_callback)
         if not footprint:
             return # Error messages generated elsewhere -- return silently.
-        if filename == '':
-            # Render to screen instead for a quick view.
-            for ln in footprint.rendering(warning_callback):
-                print ln
-        else:
-            with open(filename,'w') as f:
-                for ln in footprint.rendering(warning_callback):
-                    f.write(ln)
-                    f.write('\n')
-    def dispatchPlugin(self, footprintname, params, warning_callback):
+        if self.scan is not None:
+            self.scan.append((label, footprint))
+            return
+        self.render(footprint, filename, warning_callback)
+    def render(self, footprint, filename, warning_callback):
+        "Render footprint to filename, or to the screen if filename is ''."
+        with hooks.span('render'):
+            # Renderers for multi-layer formats write one file per layer.
+            if filename == '':
+                files = [(None, footprint.rendering(warning_callback))]
+            elif hasattr(footprint, 'layer_files'):
+                files = footprint.layer_files(filename, warning_callback)
+            else:
+                files = [(filename, footprint.rendering(warning_callback))]
+            if hooks.on:
+                # Render ahead, so writing is timed apart.
+                files = [(fn, list(lines)) for fn, lines in files]
+        with hooks.span('write'):
+            for fn, lines in files:
+                if fn is None:
+                    # Render to screen instead for a quick view.
+                    for ln in lines:
+                        print ln
+                    continue
+                with open(fn,'w') as f:
+                    for ln in lines:
+                        f.write(ln)
+                        f.write('\n')
+    def dispatchPlugin(self, footprintname, params, warning_callback,
+                       snap=None):
+        "Make a footprint under snap, by default the current rules."
         t = params.split(' ',1)
         if len(t) < 2:
             t.append('')
@@ -274,9 +474,16 @@ class Cmd_fp(Command):
             pu = self.plugins[plugin]
         except KeyError:
             raise CommandSyntaxError(plugin.join(['Plugin ',' not found.']))
+        puParams, overrides = splitRuleOverrides(puParams, warning_callback)
+        if snap is None:
+            snap = currentRules(overrides)
         try:
-            footprint = pu.parse(footprintname, puParams, rules, rack,
-                                 warning_callback)
+            with hooks.span('geometry', plugin=plugin):
+                footprint = pu.parse(footprintname, puParams, snap, rack,
+                                     warning_callback)
+            if 'courtyard' in snap:
+                with hooks.span('courtyard'):
+                    footprint.make_courtyard(snap['courtyard'])
         except FootprintException as e:
             print e.msg
             return None
@@ -304,6 +511,35 @@ class Cmd_fp(Command):
         else:
             yield "fp <footprintname> <plug-in> <parameters> [ > <filename> ]"
 
+class Cmd_drc(Command):
+    "Check a footprint against the current design rules."
+    def execute(self, s, warning_callback):
+        "s : <footprintname> <fp-plug-in> <parameters>"
+        t = s.strip().split(' ',1)
+        if len(t) < 2 or t[0] == '':
+            raise CommandSyntaxError('Expected: drc <footprintname> <plug-in> <parameters>')
+        footprintname, params = t[0], t[1].split('>')[0].strip()
+        params, overrides = splitRuleOverrides(params, warning_callback)
+        snap = currentRules(overrides)
+        footprint = verbs['fp'].dispatchPlugin(footprintname, params,
+                                               warning_callback, snap)
+        if not footprint:
+            return # Error messages generated elsewhere -- return silently.
+        violations = footprint.drc(snap)
+        for v in violations:
+            print '{0:s}: {1:s} is {2:s}, needs {3:s}'.format(
+                v.rule, v.where, str(v.actual), str(v.required))
+        print '{0:s}: {1:d} violation(s).'.format(footprintname, len(violations))
+    def helptext(self, longhelp = ''):
+        yield "drc <footprintname> <plug-in> <parameters>"
+        if longhelp:
+            yield "  Make footprint as fp does, and check it against the current rule set."
+            yield "  Rules checked, when present in the rule set:"
+            yield "    minspace   -- copper to copper between pins."
+            yield "    minmask    -- mask web between openings of different pins."
+            yield "    minannulus -- copper ring around plated holes."
+            yield "    minsilk    -- silk width, and silk to pad clearance."
+
 def collectVerbs(moduleDict):
     verbs = {}
     for key in moduleDict.keys():
@@ -328,7 +564,9 @@ def dispatchCommand(s, warningSink=nullWarningSink):
         verb = verbs[t[0]]
     except KeyError:
         raise CommandSyntaxError(t[0].join(["'","' not a command."]))
-    verb.execute(params, warningSink)
+    verbsUsed.add(t[0])
+    with hooks.span('command', verb=t[0]):
+        verb.execute(params, warningSink)
 
 def completer_words():
     buff = readline.get_line_buffer()
@@ -16,29 +16,129 @@
 #   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
 #   
 
-from collections import namedtuple
+from collections import namedtuple, deque
+import bisect
+import difflib
+import itertools
 import re
 import math as m
 import datetime as dt
 import os
+import sys
+import json
+import time
 import tokenizertools as tt
 from lookaheadtools import LinesOf
-from inspect import stack,getframeinfo
-
-debug = ''
 
 TAU = m.pi * 2.0
 HALF_PI = m.pi / 2.0
 
-def trace(name, globalVars, localVars=None):
-    callerFrameRecord = stack()[1]
-    info = getframeinfo(callerFrameRecord[0])
-    try:
-        v = localVars[name]
-    except (TypeError,KeyError):
-        v = globalVars[name]
-    print '{0:s} = {1:s} ({info.filename}:{info.function}@{info.lineno})'.format(
-        name, repr(v),info=info)
+#
+# Diagnostic events and spans
+#
+class Hooks(object):
+    """Named events and timed spans for diagnostics, passed to sinks.
+    Emit events as
+        if hooks.on:
+            hooks.event('drill', size=d)
+    so they cost one attribute check while there are no sinks, and time
+    a block as
+        with hooks.span('render', footprint=name):
+            ...
+    A sink has emit(record), record being a dict of the fields plus
+    kind ('event', 'begin' or 'end'), name, t (time.time()) and depth
+    (spans open).  An 'end' record also has wall and cpu seconds, and
+    error, the exception class name, if the block raised."""
+    def __init__(self):
+        self.sinks = []
+        self.on = False
+        self._depth = 0
+    def add_sink(self, sink):
+        self.sinks.append(sink)
+        self.on = True
+    def remove_sink(self, sink):
+        if sink in self.sinks:
+            self.sinks.remove(sink)
+        self.on = bool(self.sinks)
+    def emit(self, kind, name, fields):
+        record = dict(fields)
+        record.update(kind=kind, name=name, t=time.time(), depth=self._depth)
+        for sink in self.sinks:
+            sink.emit(record)
+    def event(self, name, **fields):
+        self.emit('event', name, fields)
+    def span(self, name, **fields):
+        if not self.on:
+            return _noSpan
+        return _Span(self, name, fields)
+
+class _NoSpan(object):
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+
+_noSpan = _NoSpan()
+
+class _Span(object):
+    def __init__(self, hooks, name, fields):
+        self.hooks = hooks
+        self.name = name
+        self.fields = fields
+    def __enter__(self):
+        self.hooks.emit('begin', self.name, self.fields)
+        self.hooks._depth += 1
+        self._start = time.time(), time.clock()
+        return self
+    def __exit__(self, exc_type, exc, tb):
+        self.hooks._depth -= 1
+        fields = dict(self.fields)
+        fields['wall'] = time.time() - self._start[0]
+        fields['cpu'] = time.clock() - self._start[1]
+        if exc_type is not None:
+            fields['error'] = exc_type.__name__
+        self.hooks.emit('end', self.name, fields)
+        return False
+
+class JsonLinesSink(object):
+    "Write each record as a line of JSON to a file name or object."
+    def __init__(self, f):
+        self.file = open(f, 'w') if isinstance(f, basestring) else f
+    def emit(self, record):
+        # Values such as Dim() are written as str().
+        self.file.write(json.dumps(record, sort_keys=True, default=str))
+        self.file.write('\n')
+    def close(self):
+        self.file.close()
+
+class RingSink(object):
+    "Keep the last size records in memory."
+    def __init__(self, size=1000):
+        self.buffer = deque(maxlen=size)
+    def emit(self, record):
+        self.buffer.append(record)
+    def records(self):
+        return list(self.buffer)
+
+class ConsoleSink(object):
+    """Print events and finished spans whose names start with one of
+    prefixes, or all of them if prefixes is None."""
+    def __init__(self, prefixes=None, out=None):
+        self.prefixes = None if prefixes is None else tuple(prefixes)
+        self.out = out
+    def emit(self, record):
+        name = record['name']
+        if record['kind'] == 'begin' or (self.prefixes is not None and
+                                         not name.startswith(self.prefixes)):
+            return
+        skip = ('kind', 'name', 't', 'depth', 'wall', 'cpu')
+        t = ['  ' * record['depth'] + name] + ['{0:s}={1:s}'.format(k,
+            str(v)) for k, v in sorted(record.items()) if k not in skip]
+        if record['kind'] == 'end':
+            t.append('({0:.2f} ms)'.format(record['wall'] * 1000.0))
+        (self.out or sys.stdout).write(' '.join(t) + '\n')
+
+hooks = Hooks()
 
 
 #
@@ -59,6 +159,12 @@ class RuleError(FootprintException):
     "Raise on validation failure."
     pass
 
+class RuleExprError(RuleError):
+    "Raise when a rule expression can not be evaluated."
+    @property
+    def msg(self):
+        return "Rule expression error: " + self.args[0]
+
 class RequiredKWError(FootprintException):
     @property
     def msg(self):
@@ -334,20 +440,21 @@ class Pt(FPCoreObj):
     def x0y(cls, y):
         return cls(Dim.VU(0,y.du),y)
     @classmethod
-    def point_row(cls, p0, p1, count):
-        pitch = p0 - p1
-        return [p0 + pitch*i for i in xrange(count)]
-    @classmethod
-    def point_array(cls, p0, p1, counts):
-        xcount, ycount = counts
-        xpitch, ypitch = p0 - Pt(p1.x,p0.y), p0 - Pt(p0.x,p1.y)
-        column_heads = cls.point_row(p0,p0+xpitch, xcount)
-        print 'column heads:',column_heads
-        t = []
-        for p in column_heads:
-            t.extend(cls.point_row(p, p+ypitch, ycount))
-            print 't',t
-        return t
+    def array(cls, xs, ys, display_units='mm'):
+        "List of Pt() from parallel lists of float mm coordinates."
+        # Bulk constructor for generated geometry: the values are already
+        # floats in valid units, so skip the per-Dim() conversions.
+        new = object.__new__
+        pts = []
+        for x, y in zip(xs, ys):
+            dx = new(Dim)
+            dx.__dict__ = {'_v': x, '_du': display_units}
+            dy = new(Dim)
+            dy.__dict__ = {'_v': y, '_du': display_units}
+            p = new(cls)
+            p.__dict__ = {'_x': dx, '_y': dy}
+            pts.append(p)
+        return pts
     def order(self, other):
         return (self, other) if self <= other else (other, self)
     def rectify(self,  other):
@@ -453,12 +560,182 @@ class Pt(FPCoreObj):
 #
 # Rules Dictionary
 #
-class RulesDictionary(dict):
-    def __getitem__(self, index):
+class RuleExpr(FPCoreObj):
+    """Rule computed from other rules, such as 'mindrill + 2*annulus_hs'.
+    Numbers may carry units; min() and max() are available.  The text is
+    compiled once, and names holds the rules it reads."""
+    _token = re.compile(r'\s*(?:'
+        r'(?P<num>[0-9]*\.?[0-9]+)(?:\s*(?P<unit>mm|mil|inch|in)(?![\w]))?'
+        r'|(?P<name>[A-Za-z_]\w*)|(?P<op>[-+*/(),]))')
+    functions = {'min': min, 'max': max}
+    def __init__(self, text):
+        self._tokens = self._tokenize(text)
+        self.text = ' '.join(text.split())
+        self.names = set()
+        self.operators = 0
+        self._pos = 0
+        self._code = self._sum()
+        if self._pos != len(self._tokens):
+            self._error('unexpected ' + repr(self._tokens[self._pos][1]))
+        del self._tokens, self._pos
+    @classmethod
+    def maybe(cls, text, rules):
+        """RuleExpr() of text if it reads as one: it must use an operator
+        or function, or name a rule, and every name in it must be a rule
+        in rules.  Else None, so text such as 'GPL-3' stays text."""
         try:
-            return super(RulesDictionary,self).__getitem__(index)
+            expr = cls(text)
+        except ValueError:
+            return None
+        if (expr.operators or expr.names) and expr.names <= set(rules):
+            return expr
+        return None
+    @classmethod
+    def unknown(cls, text, rules):
+        """Message naming the unknown rules of text that reads as an
+        expression maybe() turns down: one with an operator that names
+        a rule, or a near miss of one.  Else None, as for 'GPL-3'."""
+        try:
+            expr = cls(text)
+        except ValueError:
+            return None
+        known = set(rules)
+        missing = sorted(expr.names - known)
+        if not (expr.operators and missing):
+            return None
+        guesses = [difflib.get_close_matches(n, known, 1) for n in missing]
+        if not (expr.names & known or [g for g in guesses if g]):
+            return None
+        return 'Unknown rule {0:s} in {1:s}.'.format(
+            ', '.join([repr(n) + (' (' + g[0] + '?)' if g else '')
+                       for n, g in zip(missing, guesses)]),
+            repr(' '.join(text.split())))
+    def __reduce__(self):
+        # Compiled code does not pickle; compile it again from the text.
+        return (self.__class__, (self.text,))
+    def reprvals(self):
+        return [self.text]
+    def __str__(self):
+        return self.text
+    def __eq__(self, other):
+        return isinstance(other, RuleExpr) and self.text == other.text
+    def __ne__(self, other):
+        return not self == other
+    def __hash__(self):
+        return hash(('RuleExpr', self.text))
+    def evaluate(self, lookup):
+        "Value of the expression, looking up rule names by lookup(name)."
+        return self._code(lookup)
+    # Recursive descent compiler, one closure per node.
+    def _tokenize(self, text):
+        tokens = []
+        pos, end = 0, len(text.rstrip())
+        while pos < end:
+            mo = self._token.match(text, pos)
+            if not mo:
+                self._error('can not read ' + repr(text[pos:].strip()))
+            if mo.group('num'):
+                unit = mo.group('unit')
+                t = mo.group('num') + (' ' + unit if unit else '')
+                tokens.append(('num', t))
+            elif mo.group('name'):
+                tokens.append(('name', mo.group('name')))
+            else:
+                tokens.append(('op', mo.group('op')))
+            pos = mo.end()
+        if not tokens:
+            self._error('empty expression')
+        return tokens
+    def _error(self, what):
+        raise ValueError('Rule expression: ' + what + '.')
+    def _peek(self):
+        try:
+            return self._tokens[self._pos]
+        except IndexError:
+            return (None, None)
+    def _take(self, op):
+        if self._peek() != ('op', op):
+            self._error('expected ' + repr(op))
+        self._pos += 1
+    def _sum(self):
+        left = self._product()
+        while self._peek() in [('op','+'), ('op','-')]:
+            op = self._peek()[1]
+            self._pos += 1
+            self.operators += 1
+            right = self._product()
+            if op == '+':
+                left = (lambda a, b: lambda r: a(r) + b(r))(left, right)
+            else:
+                left = (lambda a, b: lambda r: a(r) - b(r))(left, right)
+        return left
+    def _product(self):
+        left = self._unary()
+        while self._peek() in [('op','*'), ('op','/')]:
+            op = self._peek()[1]
+            self._pos += 1
+            self.operators += 1
+            right = self._unary()
+            if op == '*':
+                left = (lambda a, b: lambda r: _times(a(r), b(r)))(left, right)
+            else:
+                left = (lambda a, b: lambda r: _divide(a(r), b(r)))(left, right)
+        return left
+    def _unary(self):
+        if self._peek() == ('op','-'):
+            self._pos += 1
+            self.operators += 1
+            arg = self._unary()
+            return lambda r: -arg(r)
+        if self._peek() == ('op','+'):
+            self._pos += 1
+            return self._unary()
+        return self._atom()
+    def _atom(self):
+        kind, t = self._peek()
+        self._pos += 1
+        if kind == 'num':
+            v = t.split()
+            value = Dim.VU(v[0], v[1]) if v[1:] else float(v[0])
+            return lambda r: value
+        if kind == 'name':
+            if self._peek() == ('op','('):
+                return self._call(t)
+            self.names.add(t)
+            return lambda r: r(t)
+        if (kind, t) == ('op','('):
+            inner = self._sum()
+            self._take(')')
+            return inner
+        self._error('unexpected ' + (repr(t) if t else 'end'))
+    def _call(self, fname):
+        try:
+            f = self.functions[fname]
         except KeyError:
-            raise RuleNotFound(index)
+            self._error('unknown function ' + repr(fname))
+        self._take('(')
+        self.operators += 1
+        args = [self._sum()]
+        while self._peek() == ('op',','):
+            self._pos += 1
+            args.append(self._sum())
+        self._take(')')
+        return lambda r: f([a(r) for a in args])
+
+def _times(a, b):
+    # Dim() scales by a number, not by another Dim().
+    if isinstance(a, Dim) and isinstance(b, Dim):
+        raise TypeError('can not multiply two dimensions')
+    return a * b
+
+def _divide(a, b):
+    if isinstance(b, Dim):
+        if not isinstance(a, Dim):
+            raise TypeError('can not divide by a dimension')
+        return a.mm / b.mm
+    return a / b
+
+class _SymbolicRules(object):
     def symb(self, value):
         "Lookup value of symblic rule, or return Dim() if called with a Dim()."
         # Why?  So footprint parsers can pick up a paramter value as either
@@ -473,6 +750,184 @@ class RulesDictionary(dict):
                 return value
             raise
 
+# Every change to any rule set takes the next version.
+_rule_versions = itertools.count(1)
+
+class RulesDictionary(_SymbolicRules, dict):
+    "Rule set.  Rules not set here are looked up in parent, if any."
+    def __init__(self, *args, **kwargs):
+        self.parent = kwargs.pop('parent', None)
+        dict.__init__(self, *args, **kwargs)
+        self.version = next(_rule_versions)
+        self._snapshot = None
+    def __setstate__(self, state):
+        # Versions count per process, so an unpickled set takes a new one.
+        self.__dict__.update(state)
+        self.version = next(_rule_versions)
+        self._snapshot = None
+    def raw(self, index):
+        "Rule as set, with a RuleExpr() left unevaluated."
+        try:
+            return super(RulesDictionary,self).__getitem__(index)
+        except KeyError:
+            if self.parent is None:
+                raise RuleNotFound(index)
+            return self.parent.raw(index)
+    def __getitem__(self, index):
+        value = self.raw(index)
+        if isinstance(value, RuleExpr):
+            # Evaluated in this set, where it may see overridden inputs.
+            return self.snapshot()[index]
+        return value
+    def __contains__(self, index):
+        return (super(RulesDictionary,self).__contains__(index) or
+                (self.parent is not None and index in self.parent))
+    def __setitem__(self, index, value):
+        super(RulesDictionary,self).__setitem__(index, value)
+        self.version = next(_rule_versions)
+    def __delitem__(self, index):
+        super(RulesDictionary,self).__delitem__(index)
+        self.version = next(_rule_versions)
+    def update(self, *args, **kwargs):
+        super(RulesDictionary,self).update(*args, **kwargs)
+        self.version = next(_rule_versions)
+    def own(self, index):
+        "True if index is set in this rule set rather than inherited."
+        return super(RulesDictionary,self).__contains__(index)
+    def chain_version(self):
+        "Version of the last change to this set or its ancestors."
+        if self.parent is None:
+            return self.version
+        return max(self.version, self.parent.chain_version())
+    def snapshot(self):
+        """RulesSnapshot() of the rules now, made once per chain version.
+        Inherited rules are shared with the parent's snapshot."""
+        version = self.chain_version()
+        snap = self.__dict__.get('_snapshot')
+        if snap is None or snap.version != version:
+            parent = None if self.parent is None else self.parent.snapshot()
+            snap = self._snapshot = RulesSnapshot(dict(self), version, parent,
+                                                  snap)
+        return snap
+
+_HASH_MASK = (1 << 61) - 1
+
+def _rule_hash(name, value):
+    # Dim() compares by value alone, so hash it that way.
+    return hash((name, float(value) if isinstance(value, Dim) else value))
+
+def _same_values(a, b):
+    # Dict equality that does not try to convert a str to a Dim().
+    if set(a) != set(b):
+        return False
+    for name, value in a.items():
+        if type(value) is not type(b[name]) or value != b[name]:
+            return False
+    return True
+
+class RulesSnapshot(_SymbolicRules, FPCoreObj):
+    """Read-only rules, as handed to plugins, optionally laid over a
+    parent snapshot.  The content hash is a sum over the rules, kept up
+    to date layer by layer, so snapshots are cheap cache keys whatever
+    their depth; version tells which change of the rule set it was
+    taken at.
+
+    RuleExpr() rules are evaluated here when first read, so inherited
+    expressions see the rules of this layer.  Values are kept with the
+    inputs they were computed from; a snapshot made from previous takes
+    over values whose expression and inputs are unchanged."""
+    def __init__(self, rules=(), version=0, parent=None, previous=None):
+        items = dict(rules)
+        h = 0 if parent is None else parent._hash
+        for name, value in items.items():
+            if parent is not None and name in parent:
+                h -= _rule_hash(name, parent.raw(name))
+            h += _rule_hash(name, value)
+        d = self.__dict__
+        d['_rules'] = items
+        d['_parent'] = parent
+        d['version'] = version
+        d['_hash'] = h & _HASH_MASK
+        d['_values'] = {}
+        d['_previous'] = {} if previous is None else previous._values
+        d['_evaluating'] = []
+    def __setattr__(self, name, value):
+        raise TypeError('Rules snapshots are read-only.')
+    def reprvals(self):
+        return [self._rules, self.version, self._parent]
+    def override(self, rules):
+        "Snapshot of rules laid over this one."
+        return RulesSnapshot(rules, self.version, self, self)
+    def raw(self, index):
+        "Rule as set, with a RuleExpr() left unevaluated."
+        try:
+            return self._rules[index]
+        except KeyError:
+            if self._parent is None:
+                raise RuleNotFound(index)
+            return self._parent.raw(index)
+    def __getitem__(self, index):
+        value = self.raw(index)
+        if isinstance(value, RuleExpr):
+            return self._evaluate(index, value)
+        return value
+    def _evaluate(self, name, expr):
+        try:
+            return self._values[name][2]
+        except KeyError:
+            pass
+        stack = self._evaluating
+        if name in stack:
+            cycle = stack[stack.index(name):] + [name]
+            raise RuleExprError('rule depends on itself: ' + ' -> '.join(cycle))
+        stack.append(name)
+        try:
+            # Inputs first, so rules are evaluated in dependency order.
+            inputs = dict([(n, self[n]) for n in expr.names])
+            memos = [self._previous]
+            if self._parent is not None:
+                memos.append(self._parent._values)
+            for memo in memos:
+                try:
+                    old_expr, old_inputs, value = memo[name]
+                except KeyError:
+                    continue
+                if old_expr == expr and _same_values(old_inputs, inputs):
+                    break
+            else:
+                try:
+                    value = expr.evaluate(inputs.__getitem__)
+                except (TypeError, ValueError, ZeroDivisionError) as e:
+                    raise RuleExprError(' '.join([name, '=', expr.text+':',
+                                                  str(e)]))
+        finally:
+            stack.pop()
+        self._values[name] = (expr, inputs, value)
+        return value
+    def __contains__(self, index):
+        return index in self._rules or \
+               (self._parent is not None and index in self._parent)
+    def keys(self):
+        if self._parent is None:
+            return self._rules.keys()
+        return list(set(self._parent.keys()).union(self._rules))
+    def items(self):
+        return [(name, self[name]) for name in self.keys()]
+    def __iter__(self):
+        return iter(self.keys())
+    def __len__(self):
+        return len(self.keys())
+    def __hash__(self):
+        return self._hash
+    def __eq__(self, other):
+        if not isinstance(other, RulesSnapshot):
+            return False
+        return self._hash == other._hash and _same_values(
+            dict([(n, self.raw(n)) for n in self.keys()]),
+            dict([(n, other.raw(n)) for n in other.keys()]))
+    def __ne__(self, other):
+        return not self == other
+
 class DrillRack(FPCoreObj):
     "Map drill size to nearest larger neighbor, or map symbolic drill name."
     # Reference table of number and letter drills.
@@ -584,9 +1039,14 @@ class DrillRack(FPCoreObj):
         '#Y': Dim.INCH(0.404),
         '#Z': Dim.INCH(0.413),
     }
+    # The table sorted by size, for bisect from size to number drill.
+    _numberIndex = sorted([(float(d), n) for n, d in number.items()])
+    _numberKeys = [k for k, n in _numberIndex]
     def __init__(self, drill_list = [], symbolic={}):
-        self._dl = sorted(drill_list)
-        self._symb = symbolic
+        self._dl = []   # Drills, ascending.
+        self._keys = [] # float(drill) for each of _dl, for bisect.
+        self._symb = dict(symbolic)
+        self.add_drills(drill_list)
     def drills(self):
         return self._dl[:]
     def symbolics(self):
@@ -595,16 +1055,27 @@ class DrillRack(FPCoreObj):
         return [self._dl, self._symb]
     def add_drill(self, aDrill):
         aDrill.mustbe(Dim, "Drills must be specified as Dim()'s")
-        existing = self[aDrill]
-        if existing == aDrill: return # Avoid adding redundant drills.
-        self._dl.append(aDrill)
-        self._dl = sorted(self._dl)
+        k = float(aDrill)
+        i = bisect.bisect_left(self._keys, k)
+        if i < len(self._keys) and self._keys[i] == k:
+            return # Avoid adding redundant drills.
+        self._keys.insert(i, k)
+        self._dl.insert(i, aDrill)
+    def add_drills(self, drills):
+        "Add a batch of drills with one sort."
+        byKey = dict(zip(self._keys, self._dl))
+        for aDrill in drills:
+            aDrill.mustbe(Dim, "Drills must be specified as Dim()'s")
+            byKey.setdefault(float(aDrill), aDrill)
+        self._keys = sorted(byKey)
+        self._dl = [byKey[k] for k in self._keys]
     def add_symbolic(self, aName, aDrill):
-        aName.mustbe(str)
+        if not isinstance(aName, str):
+            raise TypeError('Drill names must be strings.')
         aDrill.mustbe(Dim, 'Drills must be Dim().')
         self._symb[aName]=aDrill
-    def __getitem__(self, v):
-        # First do number drill or symbolic drill mapping.
+    def _requested(self, v):
+        "Map number drill or symbolic drill name to its size."
         if isinstance(v,str):
             if v[0] == '#':
                 try:
@@ -616,23 +1087,131 @@ class DrillRack(FPCoreObj):
                     v = self._symb[v]
                 except KeyError:
                     raise ValueError(v.join(['Symbolic drill ',' not found.']))
-        v.mustbe(Dim, "Drills must be Dim().")        
+        return v.mustbe(Dim, "Drills must be Dim().")
+    def __getitem__(self, v):
+        v = self._requested(v)
         # Find first drill >= to requested size.
-        dli = iter(self._dl)
-        try:
-            cur = next(dli)
-            while True:
-                if v > cur:
-                    cur = next(dli)
-                else:
-                    return cur
-        except StopIteration:
-            # Too large.  Return original drill value.
-            return v
+        i = bisect.bisect_left(self._keys, float(v))
+        if i < len(self._dl):
+            return self._dl[i]
+        # Too large.  Return original drill value.
+        return v
+    def fit_many(self, sizes):
+        """Rack drills for a sequence of sizes, as rack[size] for each.
+        Each distinct size is looked up once."""
+        keys, dl, n = self._keys, self._dl, len(self._dl)
+        fits = {}
+        out = []
+        for v in sizes:
+            key = v if isinstance(v, str) else float(
+                v.mustbe(Dim, "Drills must be Dim()."))
+            try:
+                out.append(fits[key])
+            except KeyError:
+                d = self._requested(v)
+                i = bisect.bisect_left(keys, float(d))
+                fits[key] = dl[i] if i < n else d
+                out.append(fits[key])
+        return out
+
+    @classmethod
+    def number_above(cls, size):
+        "Smallest number or letter drill of at least size, or None."
+        keys = cls._numberKeys
+        i = bisect.bisect_left(keys, float(size) - 1e-6)
+        if i == len(keys):
+            return None
+        return cls._numberIndex[i][1]
+    @classmethod
+    def nearest_number(cls, size):
+        "Number or letter drill closest in size to size."
+        keys, k = cls._numberKeys, float(size)
+        i = bisect.bisect_left(keys, k)
+        if i == len(keys) or (i > 0 and k - keys[i-1] <= keys[i] - k):
+            i -= 1
+        return cls._numberIndex[i][1]
+    def chart(self, footprints):
+        """Drill chart rows (label, holes, drill, rack drill, nearest
+        number drill, next larger number drill), one for each size of
+        round plated hole in each of footprints, a list of (label,
+        footprint).  Each size is converted once however often it
+        occurs."""
+        conv = {}
+        rows = []
+        for label, fp in footprints:
+            counts = {}
+            for pin in fp.pins:
+                for drill, annulus in pin.geo.drills():
+                    k = float(drill)
+                    try:
+                        counts[k][1] += 1
+                    except KeyError:
+                        counts[k] = [drill, 1]
+            for k in sorted(counts):
+                drill, holes = counts[k]
+                try:
+                    t = conv[k]
+                except KeyError:
+                    t = conv[k] = (self[drill], self.nearest_number(drill),
+                                   self.number_above(drill))
+                rows.append((label, holes, drill) + t)
+        return rows
+    @classmethod
+    def optimal(cls, requests, max_drills=None):
+        """Rack with the fewest drills, or with up to max_drills drills,
+        that fits every (drill, oversize) request: the next larger rack
+        drill may exceed the drill by no more than oversize mm.  Each
+        rack drill is the largest of a run of sorted sizes, so dynamic
+        programming over the runs finds the fewest drills, and among
+        those the least total oversize.  Raises ValueError if max_drills
+        can not fit."""
+        sizes = {} # float(drill): [drill, holes, oversize]
+        for drill, oversize in requests:
+            try:
+                t = sizes[float(drill)]
+                t[1] += 1
+                t[2] = min(t[2], oversize)
+            except KeyError:
+                sizes[float(drill)] = [drill, 1, oversize]
+        keys = sorted(sizes)
+        n = len(keys)
+        k = n if max_drills is None else min(n, max_drills)
+        inf = float('inf')
+        # cost[c][j]: least oversize fitting keys[:j] with c drills.
+        cost = [[0.0] + [inf] * n] + [[inf] * (n + 1) for c in xrange(k)]
+        back = [[None] * (n + 1) for c in xrange(k + 1)]
+        for j in xrange(1, n + 1):
+            top = keys[j - 1]
+            reach, over = inf, 0.0
+            for i in xrange(j - 1, -1, -1):
+                drill, holes, oversize = sizes[keys[i]]
+                reach = min(reach, keys[i] + oversize)
+                if top > reach + 1e-9:
+                    break # Longer runs only tighten reach.
+                over += holes * (top - keys[i])
+                for c in xrange(1, k + 1):
+                    if cost[c - 1][i] + over < cost[c][j]:
+                        cost[c][j] = cost[c - 1][i] + over
+                        back[c][j] = i
+        found = [c for c in xrange(k + 1) if cost[c][n] < inf]
+        if not found:
+            raise ValueError('No rack of {0:d} drills fits.'.format(k))
+        if max_drills is None:
+            c = found[0]
+        else:
+            c = min(found, key=lambda c: (cost[c][n], c))
+        drills, j = [], n
+        while c:
+            drills.append(sizes[keys[j - 1]][0])
+            j, c = back[c][j], c - 1
+        return cls(drills)
 
 class NoRack(DrillRack):
     def add_drill(self, aDrill):
         print "Can't add to drill rack 'none'."
+    def add_drills(self, drills):
+        if drills:
+            print "Can't add to drill rack 'none'."
     def add_symbolic(self, aName, aDrill):
         print "Can't add to drill rack 'none'."
 
@@ -759,6 +1338,42 @@ class ApertureMacro(Aperture):
     # Values can be expression trees.
     pass
 
+#
+# Extents of flashed apertures, in float mm, for geometry checks.
+#
+class FlashExtent(object):
+    "Mixin for primitives that flash an aperture at an offset loc."
+    def half_extent(self):
+        "(x offset, y offset, half width, half height) in mm."
+        ap = self.aperture
+        try:
+            hx = hy = float(ap.diameter) / 2.0
+        except AttributeError:
+            hx, hy = float(ap.xsize) / 2.0, float(ap.ysize) / 2.0
+        return float(self.loc.x), float(self.loc.y), hx, hy
+    def extent(self, loc, bloat=0.0):
+        "Bounding box (x0, y0, x1, y1) in mm when flashed at loc, bloated."
+        ox, oy, hx, hy = self.half_extent()
+        x, y = float(loc.x) + ox, float(loc.y) + oy
+        hx, hy = hx + float(bloat), hy + float(bloat)
+        return (x - hx, y - hy, x + hx, y + hy)
+    def shape(self, loc, bloat=0.0):
+        """Flash at loc, bloated, as a Shape(): a rectangle is a box core,
+        an obround a segment core, a circle a point core.  Polygons are
+        taken as their circumscribed circle."""
+        ap = self.aperture
+        x = float(loc.x) + float(self.loc.x)
+        y = float(loc.y) + float(self.loc.y)
+        b = float(bloat)
+        if isinstance(ap, SARectangle):
+            return Shape(x, y, float(ap.xsize) / 2.0 + b,
+                         float(ap.ysize) / 2.0 + b, 0.0)
+        if isinstance(ap, SAObround):
+            hx, hy = float(ap.xsize) / 2.0, float(ap.ysize) / 2.0
+            r = min(hx, hy)
+            return Shape(x, y, hx - r, hy - r, r + b)
+        return Shape(x, y, 0.0, 0.0, float(ap.diameter) / 2.0 + b)
+
 #
 # Mask Classes
 #
@@ -771,7 +1386,7 @@ class Mask(Primitive):
         self.serial = self.__class__._serial
         self.__class__._serial += 1
 
-class DrawnMask(Mask):
+class DrawnMask(Mask, FlashExtent):
     # A ShapeInstance. ThermalPads have a list of these.
     def __init__(self, aperture, loc):
         Primitive.__init__(self, loc.mustbe(Pt))
@@ -790,11 +1405,25 @@ class DerivedMask(Mask):
     @property
     def loc(self):
         return self.base.loc
+    def extent(self, loc, bloat=0.0):
+        return self.base.extent(loc, float(self.bloat) + float(bloat))
+    def shape(self, loc, bloat=0.0):
+        return self.base.shape(loc, float(self.bloat) + float(bloat))
 
 class NoMask(Mask):
     "Specifies no mask."
     pass
 
+class GangMask(Mask):
+    """One mask opening shared by several SMTPads: DrawnMask()s located
+    in footprint coordinates, plus the per-side bloat that formed them."""
+    def __init__(self, masks, bloat):
+        Mask.__init__(self)
+        self.masks = [mk.mustbe(DrawnMask) for mk in masks]
+        self.bloat = bloat.mustbe(Dim)
+    def reprvals(self):
+        return [self.masks, self.bloat]
+
 #
 # Hole primitives
 #
@@ -847,7 +1476,7 @@ class CopperKeepout(Primitive):
 #
 # Land pads
 # 
-class Land(Primitive):
+class Land(Primitive, FlashExtent):
     # Has a shape and a clearance.
     # Specify clearance by pad shape bloat here.
     # Specify other clearance shapes at footprint level.
@@ -886,7 +1515,36 @@ class Land(Primitive):
 # Pin Geometry Specifications
 #
 class PinGeometry(FPCoreObj):
-    pass
+    # One PinGeometry is usually shared by many PinSpecs, so renderers
+    # may keep the location independent part of its rendering in
+    # _render_cache, checked against the values it was made from.
+    # Assigning any attribute of the geometry itself invalidates it.
+    def __setattr__(self, name, value):
+        if name != '_render_cache':
+            self.__dict__.pop('_render_cache', None)
+        super(PinGeometry, self).__setattr__(name, value)
+    # Design rule checks see a geometry through these.  Shapes are
+    # Shape() in mm, sides are 'top' or 'bottom'.
+    def copper(self, loc):
+        "List of (side, shape) of lands flashed at loc."
+        return []
+    def openings(self, loc):
+        "List of (side, shape, mask) of mask openings flashed at loc."
+        return []
+    def annulus(self):
+        "Narrowest copper ring around a hole in mm, or None."
+        return None
+    def drills(self):
+        "List of (diameter, annulus in mm or None) of round plated holes."
+        return []
+
+def _mask_openings(side, mask, loc):
+    if isinstance(mask, GangMask):
+        origin = Pt.MM(0, 0)
+        return [(side, mk.shape(origin), mask) for mk in mask.masks]
+    if isinstance(mask, NoMask):
+        return []
+    return [(side, mask.shape(loc), mask)]
 
 class ThruPin(PinGeometry):
     # One PlatedHole, landing aperture(s), and apertures for masks.
@@ -951,6 +1609,28 @@ class ThruPin(PinGeometry):
     @property
     def symmetric(self):
         return self._comp_land == '='
+    def copper(self, loc):
+        return [('top', self.comp_land.shape(loc)),
+                ('bottom', self.solder_land.shape(loc))]
+    def openings(self, loc):
+        return (_mask_openings('top', self.comp_mask, loc) +
+                _mask_openings('bottom', self.solder_mask, loc))
+    def annulus(self):
+        try:
+            r = float(self.hole.diameter) / 2.0
+        except AttributeError:
+            return None # Slots are not checked.
+        hx, hy = float(self.hole.offset.x), float(self.hole.offset.y)
+        rings = []
+        for land in [self.solder_land, self.comp_land]:
+            ox, oy, ax, ay = land.half_extent()
+            rings.append(min(ax - abs(hx - ox), ay - abs(hy - oy)) - r)
+        return min(rings)
+    def drills(self):
+        try:
+            return [(self.hole.diameter, self.annulus())]
+        except AttributeError:
+            return []
     @classmethod
     def circle(cls, drill, clearance, diameter, mbloat):
         dr = fpbase.platedDrill(drill) 
@@ -1009,6 +1689,11 @@ class SMTPad(PinGeometry):
             self.onback = bool(kwargs['onback'])
         except KeyError:
             self.onback = False
+    def copper(self, loc):
+        return [('bottom' if self.onback else 'top', self.land.shape(loc))]
+    def openings(self, loc):
+        return _mask_openings('bottom' if self.onback else 'top',
+                              self.mask, loc)
     @classmethod
     def obround(cls, clearance, xsize, ysize, mbloat):
         land = fpbase.land.obround(clearance, xsize, ysize)
@@ -1016,9 +1701,28 @@ class SMTPad(PinGeometry):
     @classmethod
     def gang(cls, pads, bloat):
         """Construct gang mask by bloating extremes of listed pads,
-        set all pads to gang."""
-        # Result will be a DrawnMask()
-        pass
+        set all pads to gang.  pads is a list of PinSpec() with SMTPad()
+        geometry.  Returns the GangMask()."""
+        # Pads share a few geometries, so size each land once.
+        b = float(bloat)
+        sizes = {}
+        rects = []
+        for p in pads:
+            try:
+                ox, oy, hx, hy = sizes[p.geo]
+            except KeyError:
+                ox, oy, hx, hy = sizes[p.geo] = p.geo.land.half_extent()
+            x, y = float(p.loc.x) + ox, float(p.loc.y) + oy
+            rects.append((x - hx - b, y - hy - b, x + hx + b, y + hy + b))
+        masks = [fpbase.drawnMask.rectangle(
+                     Dim(x1 - x0, bloat.du), Dim(y1 - y0, bloat.du),
+                     Pt(Dim((x0 + x1) / 2.0, bloat.du),
+                        Dim((y0 + y1) / 2.0, bloat.du)))
+                 for x0, y0, x1, y1 in rect_union(rects)]
+        gang = fpbase.gangMask(masks, bloat)
+        for geo in sizes:
+            geo.mustbe(SMTPad).mask = gang
+        return gang
 
 class ThermalPolygon(PinGeometry):
     # Has a list of AntiMasks on each side.
@@ -1032,6 +1736,20 @@ class ThermalPolygon(PinGeometry):
         self.masks = [m.mustbe(Mask) for m in masks]
         self.pastes = [p.mustbe(Paste) for p in pastes]
         self.back_land = None if back_land is None else back_land.mustbe(Land)
+    def drills(self):
+        # Vias are not annulus checked.
+        return [(h.diameter, None) for h in self.holes
+                if isinstance(h, PlatedDrill)]
+    def copper(self, loc):
+        t = [('top', self.land.shape(loc))]
+        if self.back_land is not None:
+            t.append(('bottom', self.back_land.shape(loc)))
+        return t
+    def openings(self, loc):
+        t = []
+        for mk in self.masks:
+            t.extend(_mask_openings('top', mk, loc))
+        return t
     @classmethod
     def rectangle(cls, clearance, cu_ll, cu_ur, mask_ll, mask_ur,
                   drillsize, drill_locs):
@@ -1095,6 +1813,20 @@ class PinSpec(PinInfo):
     @name.setter
     def name(self, v):
         self._name = str(v)
+    @classmethod
+    def array(cls, locs, nums, geo, names):
+        """List of PinSpec() sharing geo, from parallel lists of Pt()
+        locations, int pin numbers and str pin names."""
+        # Bulk constructor for generated arrays, as Pt.array().
+        geo.mustbe(PinGeometry)
+        new = object.__new__
+        pins = []
+        for loc, num, name in zip(locs, nums, names):
+            p = new(cls)
+            p.__dict__ = {'_loc': loc, 'num': num, 'geo': geo, 'rot': 0,
+                          '_name': name}
+            pins.append(p)
+        return pins
 
 #
 # Silk classes
@@ -1133,7 +1865,8 @@ class SilkLine(Silk):
         self.p2 = Pt(p2)
 
 class SilkArc(Silk):
-    "Fixed radius arc."
+    """Fixed radius arc centered on loc.  Angles are in degrees,
+    counter-clockwise from the +X axis."""
     def __init__(self, loc, radius, start_angle, arc_angle, pen_width):
         super(SilkArc, self).__init__(loc, pen_width)
         self.radius = radius.mustbe(Dim)
@@ -1143,6 +1876,555 @@ class SilkArc(Silk):
         if arc_angle < 0.0 or arc_angle > 360.0:
             raise ValueError('Arc length must be between 0 and 360.')
         self.arc = arc_angle
+    def polyline(self, tolerance):
+        "List of Pt() approximating the arc within tolerance."
+        du = self.loc.x.du
+        cx, cy = float(self.loc.x), float(self.loc.y)
+        return [Pt(Dim(cx+x, du), Dim(cy+y, du)) for x, y in
+                arc_offsets(self.radius, self.start, self.arc, tolerance)]
+    def segments(self, tolerance):
+        "List of SilkLine approximating the arc, for targets without arcs."
+        p = self.polyline(tolerance)
+        return [fpbase.silkLine(p1, p2, self.pen_width)
+                for p1, p2 in zip(p[:-1], p[1:])]
+
+#
+# Arc approximation
+#
+# Segmentations depend only on (radius, start, sweep, tolerance), so they
+# are cached and shared by every arc instance with the same shape.  Angles
+# that fall on the table grid take sin/cos from a precomputed table.
+_TRIG_RES = 0.25 # Degrees per table step.
+_TRIG_STEPS = int(360 / _TRIG_RES)
+_trig_table = [(m.cos(m.radians(i * _TRIG_RES)), m.sin(m.radians(i * _TRIG_RES)))
+               for i in xrange(_TRIG_STEPS)]
+_arc_cache = {}
+_ARC_CACHE_LIMIT = 4096
+
+def _cos_sin(degrees):
+    steps = degrees / _TRIG_RES
+    i = int(round(steps))
+    if abs(steps - i) < 1e-9:
+        return _trig_table[i % _TRIG_STEPS]
+    a = m.radians(degrees)
+    return m.cos(a), m.sin(a)
+
+def arc_offsets(radius, start_angle, arc_angle, tolerance):
+    """Tuple of (x,y) offsets in mm from the arc center, approximating
+    the arc by chords that deviate from it by no more than tolerance."""
+    r, tol = float(radius), float(tolerance)
+    key = (r, float(start_angle), float(arc_angle), tol)
+    try:
+        return _arc_cache[key]
+    except KeyError:
+        pass
+    if tol <= 0.0:
+        raise ValueError('Arc tolerance must be > 0.')
+    # Chord sagitta r*(1-cos(step/2)) <= tol, step at most 90 degrees.
+    max_step = 90.0 if tol >= r else \
+        min(90.0, 2.0 * m.degrees(m.acos(1.0 - tol / r)))
+    # Whole table steps keep on-grid arcs on the table.
+    step = max(1, int(max_step / _TRIG_RES)) * _TRIG_RES
+    count = max(1, int(m.ceil(arc_angle / step - 1e-9)))
+    angles = [start_angle + step * i for i in xrange(count)]
+    angles.append(start_angle + arc_angle)
+    offsets = []
+    for a in angles:
+        c, s = _cos_sin(a)
+        offsets.append((r * c, r * s))
+    offsets = tuple(offsets)
+    if len(_arc_cache) >= _ARC_CACHE_LIMIT:
+        _arc_cache.clear()
+    _arc_cache[key] = offsets
+    return offsets
+
+#
+# Rectangle union
+#
+# Rectangles are (x0, y0, x1, y1) tuples of float mm.  Coordinates are
+# snapped to whole nanometers first so that edges computed along
+# different paths (pitch/2 from two neighbors, say) compare equal and abut.
+def _merge_runs(intervals):
+    "Merge sorted (y0, y1) intervals that overlap or touch."
+    runs = []
+    for y0, y1 in intervals:
+        if runs and y0 <= runs[-1][1]:
+            if y1 > runs[-1][1]:
+                runs[-1] = (runs[-1][0], y1)
+        else:
+            runs.append((y0, y1))
+    return runs
+
+def _remerge(runs, keys, y0, y1):
+    """Update merged runs in place after the interval (y0, y1) came into
+    or left sorted keys.  Only the runs it touches are merged again."""
+    lo = bisect.bisect_left(runs, (y0,))
+    if lo and runs[lo - 1][1] >= y0:
+        lo -= 1
+    hi = bisect.bisect_right(runs, (y1, float('inf')))
+    if lo < hi:
+        y0, y1 = min(y0, runs[lo][0]), max(y1, runs[hi - 1][1])
+    # Keys starting in the touched span are all that make it up.
+    a = bisect.bisect_left(keys, (y0,))
+    b = bisect.bisect_right(keys, (y1, float('inf')))
+    runs[lo:hi] = _merge_runs(keys[a:b])
+
+def _sweep_runs(rects):
+    """Sweep the edges of rectangles in x, keeping the count of active y
+    intervals.  Yields (x, runs) where the covered y runs change: runs
+    hold from x to the next x yielded.  Coordinates are snapped to
+    integer nanometers so that edges compare exactly."""
+    events = []
+    fl = m.floor
+    for x0, y0, x1, y1 in rects:
+        x0, y0 = fl(x0 * 1e6 + 0.5), fl(y0 * 1e6 + 0.5)
+        x1, y1 = fl(x1 * 1e6 + 0.5), fl(y1 * 1e6 + 0.5)
+        if x1 > x0 and y1 > y0:
+            events.append((x0, 1, y0, y1))
+            events.append((x1, -1, y0, y1))
+    events.sort()
+    active = {}   # (y0, y1): count
+    keys = []     # the keys of active, kept sorted
+    runs = []     # keys merged
+    i, n = 0, len(events)
+    while i < n:
+        x = events[i][0]
+        j = i
+        while j < n and events[j][0] == x:
+            j += 1
+        # Few changes against many active intervals are placed one by
+        # one; a batch as large as what is active is cheaper sorted.
+        bulk = 4 * (j - i) > len(keys)
+        # Intervals that appeared or vanished at x.  In a row of abutting
+        # pads one pad ends where the next begins, which changes nothing.
+        flipped = set()
+        for dummy, d, y0, y1 in events[i:j]:
+            key = (y0, y1)
+            c = active.get(key, 0) + d
+            if c:
+                active[key] = c
+            else:
+                del active[key]
+            if c == d or not c:
+                if not bulk:
+                    if c:
+                        bisect.insort(keys, key)
+                    else:
+                        del keys[bisect.bisect_left(keys, key)]
+                    _remerge(runs, keys, y0, y1)
+                if key in flipped:
+                    flipped.remove(key)
+                else:
+                    flipped.add(key)
+        i = j
+        if bulk:
+            keys = sorted(active)
+            runs = _merge_runs(keys)
+        if flipped:
+            yield x, list(runs)
+
+def rect_union(rects):
+    """Union of rectangles as a list of disjoint rectangles.  Extends one
+    output rectangle for as long as a covered y run survives the sweep.
+    The sweep keeps its active intervals sorted as they come and go, so
+    an edge costs a bisection, plus the runs yielded where they change."""
+    started = {}  # covered run (y0, y1): x where its rectangle began
+    out = []
+    for x, runs in _sweep_runs(rects):
+        live = set(runs)
+        for run in sorted(set(started).difference(live)):
+            out.append((started.pop(run), run[0], x, run[1]))
+        for run in live.difference(started):
+            started[run] = x
+    return [(x0 / 1e6, y0 / 1e6, x1 / 1e6, y1 / 1e6)
+            for x0, y0, x1, y1 in out]
+
+def _run_difference(a, b):
+    "Parts of sorted disjoint runs a that sorted disjoint runs b miss."
+    out, j = [], 0
+    for y0, y1 in a:
+        while j < len(b) and b[j][1] <= y0:
+            j += 1
+        k = j
+        while k < len(b) and b[k][0] < y1:
+            if b[k][0] > y0:
+                out.append((y0, b[k][0]))
+            y0 = max(y0, b[k][1])
+            k += 1
+        if y0 < y1:
+            out.append((y0, y1))
+    return out
+
+def rect_outline(rects):
+    """Outlines of the union of rectangles, as lists of (x, y) corners:
+    counter-clockwise around areas, clockwise around holes.  Each slab
+    of the sweep adds the bottom and top edges of its runs, and where
+    the runs change, the vertical edges between.  Chaining the edges
+    and dropping collinear corners leaves minimal rectilinear polygons."""
+    edges = {} # start: [end, ...]
+    last_x, last_runs = None, []
+    for x, runs in _sweep_runs(rects):
+        for y0, y1 in last_runs:
+            edges.setdefault((last_x, y0), []).append((x, y0))
+            edges.setdefault((x, y1), []).append((last_x, y1))
+        for y0, y1 in _run_difference(runs, last_runs):
+            edges.setdefault((x, y1), []).append((x, y0))
+        for y0, y1 in _run_difference(last_runs, runs):
+            edges.setdefault((x, y0), []).append((x, y1))
+        last_x, last_runs = x, runs
+    loops = []
+    while edges:
+        start = p = min(edges)
+        loop = []
+        while True:
+            loop.append(p)
+            ends = edges[p]
+            q = ends.pop()
+            if not ends:
+                del edges[p]
+            p = q
+            if p == start:
+                break
+        corners = [(x, y) for (px, py), (x, y), (nx, ny)
+                   in zip(loop[-1:] + loop[:-1], loop, loop[1:] + loop[:1])
+                   if not (px == x == nx or py == y == ny)]
+        loops.append([(x / 1e6, y / 1e6) for x, y in corners])
+    return loops
+
+def rect_complement(rects, frame):
+    "Disjoint rectangles covering frame outside the union of rects."
+    fx0, fy0, fx1, fy1 = [m.floor(v * 1e6 + 0.5) for v in frame]
+    out = []
+    last_x, last_runs = fx0, []
+    for x, runs in _sweep_runs(rects):
+        x = min(max(x, fx0), fx1)
+        if x > last_x:
+            out.extend([(last_x, y0, x, y1) for y0, y1
+                        in _run_difference([(fy0, fy1)], last_runs)])
+        last_x, last_runs = x, runs
+    if fx1 > last_x:
+        out.append((last_x, fy0, fx1, fy1))
+    return [(x0 / 1e6, y0 / 1e6, x1 / 1e6, y1 / 1e6)
+            for x0, y0, x1, y1 in out]
+
+def rect_closing(rects, distance):
+    """Rectangles covering the union of rects with every notch and gap
+    narrower than twice distance filled: grow by distance, then shrink
+    by growing the complement."""
+    e = float(distance)
+    grown = [(x0 - e, y0 - e, x1 + e, y1 + e) for x0, y0, x1, y1 in rects]
+    if not grown or e <= 0.0:
+        return grown
+    x0, y0, x1, y1 = zip(*grown)
+    frame = (min(x0) - e, min(y0) - e, max(x1) + e, max(y1) + e)
+    outside = [(x0 - e, y0 - e, x1 + e, y1 + e)
+               for x0, y0, x1, y1 in rect_complement(grown, frame)]
+    return rect_complement(outside, frame)
+
+def _fill_columns(rects):
+    "Rectangles filling each slab of the sweep from its lowest to highest y."
+    out, last_x, last_runs = [], None, []
+    for x, runs in _sweep_runs(rects):
+        if last_runs:
+            out.append((last_x / 1e6, last_runs[0][0] / 1e6,
+                        x / 1e6, last_runs[-1][1] / 1e6))
+        last_x, last_runs = x, runs
+    return out
+
+def rect_hull(rects):
+    """Rectangles covering the orthogonal convex hull of a connected
+    union of rects: every horizontal and vertical line meets it in one
+    run, so notches are filled and staircase corners kept."""
+    swap = lambda rs: [(y0, x0, y1, x1) for x0, y0, x1, y1 in rs]
+    area = lambda rs: sum([(x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rs])
+    rects = rect_union(rects)
+    while True:
+        filled = swap(_fill_columns(swap(_fill_columns(rects))))
+        if area(filled) <= area(rects) + 1e-9:
+            return filled
+        rects = filled
+
+def _outer_loops(rects):
+    """Outlines of the union of rects that no other outline encloses.
+    Holes, and areas inside them, are dropped."""
+    outer = [loop for loop in rect_outline(rects) if polygon_area(loop) > 0.0]
+    return [loop for loop in outer
+            if not [o for o in outer if o is not loop and
+                    point_in_polygon(loop[0], o)]]
+
+def point_in_polygon(pt, loop):
+    "True if pt is inside the polygon given as (x, y) corners, even-odd."
+    x, y = pt
+    inside = False
+    for (x0, y0), (x1, y1) in zip(loop, loop[1:] + loop[:1]):
+        if (y0 > y) != (y1 > y) and \
+           x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+            inside = not inside
+    return inside
+
+def polygon_area(loop):
+    "Signed area of a polygon given as (x, y) corners, positive if CCW."
+    return sum([x0 * y1 - x1 * y0 for (x0, y0), (x1, y1)
+                in zip(loop, loop[1:] + loop[:1])]) / 2.0
+
+#
+# Design rule check
+#
+# Features are Shape(): an axis aligned core box (x, y) +/- (ax, ay)
+# grown by radius r, in float mm.  Circles, obrounds and rectangles are
+# all exact Shape()s.  Candidate pairs come from a uniform grid over
+# the extents (x0, y0, x1, y1), so each feature is only compared with
+# its neighbors, then the candidates are measured exactly in one batch.
+DRCViolation = namedtuple('DRCViolation', 'rule required actual where')
+Shape = namedtuple('Shape', 'x y ax ay r')
+_DRC_TOLERANCE = 1e-6 # mm, absorbs rounding in computed edges.
+
+def shape_extent(s):
+    "Bounding box (x0, y0, x1, y1) of Shape() s."
+    hx, hy = s.ax + s.r, s.ay + s.r
+    return (s.x - hx, s.y - hy, s.x + hx, s.y + hy)
+
+def _span_extent(s, x0, y0, x1, y1):
+    """Extent of Shape() s, flashed at the origin, when flashed at every
+    location in the box (x0, y0, x1, y1)."""
+    hx, hy = s.ax + s.r, s.ay + s.r
+    return (x0 + s.x - hx, y0 + s.y - hy, x1 + s.x + hx, y1 + s.y + hy)
+
+def shape_distances(a, b):
+    """List of distances between Shape() a[i] and b[i], 0.0 where they
+    touch or overlap."""
+    hypot = m.hypot
+    t = []
+    for (x0, y0, ax0, ay0, r0), (x1, y1, ax1, ay1, r1) in zip(a, b):
+        # Cores are boxes, so their gap is exact; radii just subtract.
+        dx = abs(x0 - x1) - ax0 - ax1
+        dy = abs(y0 - y1) - ay0 - ay1
+        d = hypot(dx if dx > 0.0 else 0.0, dy if dy > 0.0 else 0.0) - r0 - r1
+        t.append(d if d > 0.0 else 0.0)
+    return t
+
+def clearances(a, b, required):
+    """(distances, flags) for Shape() pairs a[i], b[i]; flags[i] is True
+    if the pair is closer than required."""
+    t = shape_distances(a, b)
+    limit = float(required) - _DRC_TOLERANCE
+    return t, [d < limit for d in t]
+
+def box_gap(a, b):
+    "Distance between two extents, 0.0 if they touch or overlap."
+    dx = max(a[0] - b[2], b[0] - a[2], 0.0)
+    dy = max(a[1] - b[3], b[1] - a[3], 0.0)
+    return m.hypot(dx, dy)
+
+class GridIndex(object):
+    "Uniform grid of square cells listing the keys of extents that touch them."
+    def __init__(self, cell):
+        self.cell = float(cell)
+        self._cells = {}
+    def _cells_of(self, box):
+        c = self.cell
+        i0, i1 = int(m.floor(box[0] / c)), int(m.floor(box[2] / c))
+        j0, j1 = int(m.floor(box[1] / c)), int(m.floor(box[3] / c))
+        return [(i, j) for i in xrange(i0, i1 + 1) for j in xrange(j0, j1 + 1)]
+    def insert(self, key, box):
+        for ij in self._cells_of(box):
+            self._cells.setdefault(ij, []).append(key)
+    def query(self, box):
+        "Set of keys sharing a cell with box."
+        found = set()
+        cells = self._cells
+        for ij in self._cells_of(box):
+            try:
+                found.update(cells[ij])
+            except KeyError:
+                pass
+        return found
+
+def _grid_cell(boxes, distance):
+    "Cell size for a GridIndex() of boxes probed at distance."
+    sizes = sorted([max(b[2] - b[0], b[3] - b[1]) for b in boxes])
+    return max(2.0 * (sizes[len(sizes) / 2] + distance), 0.001)
+
+def near_pairs(boxes, distance, others=None):
+    """List of (i, j, gap) for extents closer than distance.  Without
+    others, pairs are within boxes with j < i; with others, boxes[i] is
+    paired with others[j]."""
+    indexed = boxes if others is None else others
+    if not boxes or not indexed:
+        return []
+    d = float(distance)
+    grid = GridIndex(_grid_cell(indexed, d))
+    if others is not None:
+        for j, b in enumerate(others):
+            grid.insert(j, b)
+    pairs = []
+    for i, b in enumerate(boxes):
+        probe = (b[0] - d, b[1] - d, b[2] + d, b[3] + d)
+        for j in grid.query(probe):
+            gap = box_gap(indexed[j], b)
+            if gap < d - _DRC_TOLERANCE:
+                pairs.append((i, j, gap))
+        if others is None:
+            grid.insert(i, b)
+    return pairs
+
+def _silk_shapes(art):
+    """Shape() list covering the ink of SilkLine() and SilkArc() elements.
+    Slanted lines are cut into pieces, each taken as the box around it,
+    which errs toward a violation by at most an eighth of the pen."""
+    if isinstance(art, SilkArc):
+        lines = art.segments(art.pen_width / 4.0)
+    elif isinstance(art, SilkLine):
+        lines = [art]
+    else:
+        return []
+    t = []
+    for ln in lines:
+        h = float(ln.pen_width) / 2.0
+        x0, y0 = float(ln.loc.x), float(ln.loc.y)
+        dx, dy = float(ln.p2.x) - x0, float(ln.p2.y) - y0
+        n = 1
+        if dx and dy:
+            n = max(1, int(m.ceil(m.hypot(dx, dy) / (h / 2.0))))
+        dx, dy = dx / n, dy / n
+        for k in xrange(n):
+            t.append(Shape(x0 + dx * (k + 0.5), y0 + dy * (k + 0.5),
+                           abs(dx) / 2.0, abs(dy) / 2.0, h))
+    return t
+
+def _silk_extent(art):
+    "Extent of the ink of a SilkLine() or SilkArc(), or None."
+    if isinstance(art, SilkArc):
+        r = float(art.radius)
+        # The ends, and the axes the arc sweeps across.
+        end = art.start + art.arc
+        angles = [art.start, end] + [a for a in xrange(0, 720, 90)
+                                     if art.start < a < end]
+        cs = [_cos_sin(a) for a in angles]
+        xs = [float(art.loc.x) + r * c for c, sn in cs]
+        ys = [float(art.loc.y) + r * sn for c, sn in cs]
+    elif isinstance(art, SilkLine):
+        xs = [float(art.loc.x), float(art.p2.x)]
+        ys = [float(art.loc.y), float(art.p2.y)]
+    else:
+        return None
+    h = float(art.pen_width) / 2.0
+    return (min(xs) - h, min(ys) - h, max(xs) + h, max(ys) + h)
+
+#
+# Silk clipping
+#
+# A silk line is cut where its center line comes closer than clearance
+# plus half the pen to a Shape().  A grown Shape() is convex, so it cuts
+# one span of the line: the hull of the spans through its two cross
+# boxes and its corner circles.  Spans are in the line parameter t,
+# 0.0 at loc and 1.0 at p2.
+def _box_span(px, py, dx, dy, x0, y0, x1, y1):
+    "Liang-Barsky: span of p + t*d strictly inside the box, or None."
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, px - x0), (dx, x1 - px), (-dy, py - y0), (dy, y1 - py)):
+        if p == 0.0:
+            if q <= 0.0:
+                return None
+        elif p < 0.0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    return (t0, t1) if t0 < t1 else None
+
+def _circle_span(px, py, dx, dy, cx, cy, r):
+    "Span of p + t*d strictly inside the circle, or None."
+    fx, fy = px - cx, py - cy
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    c = fx * fx + fy * fy - r * r
+    if a == 0.0:
+        return (0.0, 1.0) if c < 0.0 else None
+    disc = b * b - a * c
+    if disc <= 0.0:
+        return None
+    root = m.sqrt(disc)
+    t0, t1 = max((-b - root) / a, 0.0), min((-b + root) / a, 1.0)
+    return (t0, t1) if t0 < t1 else None
+
+def _shape_span(px, py, dx, dy, shape, grow):
+    "Span of p + t*d within grow of shape, or None."
+    x, y, ax, ay, r = shape
+    r += grow
+    # Most candidates from the grid miss even the extent.
+    if not _box_span(px, py, dx, dy, x - ax - r, y - ay - r,
+                     x + ax + r, y + ay + r):
+        return None
+    spans = [_box_span(px, py, dx, dy, x - ax - r, y - ay, x + ax + r, y + ay),
+             _box_span(px, py, dx, dy, x - ax, y - ay - r, x + ax, y + ay + r)]
+    for cx, cy in set([(x - ax, y - ay), (x + ax, y - ay),
+                       (x - ax, y + ay), (x + ax, y + ay)]):
+        spans.append(_circle_span(px, py, dx, dy, cx, cy, r))
+    spans = [t for t in spans if t]
+    if not spans:
+        return None
+    return min([t[0] for t in spans]), max([t[1] for t in spans])
+
+def _clip_line(ln, shapes, clearance):
+    "Surviving pieces of SilkLine() ln as a list, or None if it is not cut."
+    # Half the tolerance leaves silk along the edge uncut, and cut ends
+    # inside what drc() accepts.
+    grow = float(clearance) + float(ln.pen_width) / 2.0 - _DRC_TOLERANCE / 2.0
+    px, py = float(ln.loc.x), float(ln.loc.y)
+    dx, dy = float(ln.p2.x) - px, float(ln.p2.y) - py
+    spans = [t for t in [_shape_span(px, py, dx, dy, sh, grow)
+                         for sh in shapes] if t]
+    if not spans:
+        return None
+    kept, t = [], 0.0
+    for t0, t1 in _merge_runs(sorted(spans)):
+        if t0 > t:
+            kept.append((t, t0))
+        t = max(t, t1)
+    if t < 1.0:
+        kept.append((t, 1.0))
+    length = m.hypot(dx, dy)
+    ts = [t for span in kept if (span[1] - span[0]) * length > _DRC_TOLERANCE
+            for t in span]
+    ends = Pt.array([px + dx * t for t in ts], [py + dy * t for t in ts],
+                    ln.loc.x.du)
+    return [fpbase.silkLine(p1, p2, ln.pen_width)
+            for p1, p2 in zip(ends[0::2], ends[1::2])]
+
+def clip_silk(silk, shapes, clearance):
+    """List of silk with SilkLine() and SilkArc() elements cut back to
+    clearance from the Shape()s.  Elements that are not cut are kept as
+    they are; a cut arc is replaced by what is left of its chords."""
+    if not shapes:
+        return list(silk)
+    c = float(clearance)
+    boxes = [shape_extent(sh) for sh in shapes]
+    grid = GridIndex(_grid_cell(boxes, c))
+    for k, box in enumerate(boxes):
+        grid.insert(k, box)
+    t = []
+    for art in silk:
+        if isinstance(art, SilkArc):
+            lines = art.segments(art.pen_width / 4.0)
+        elif isinstance(art, SilkLine):
+            lines = [art]
+        else:
+            t.append(art)
+            continue
+        pieces, cut = [], False
+        for ln in lines:
+            d = c + float(ln.pen_width) / 2.0
+            x0, x1 = sorted([float(ln.loc.x), float(ln.p2.x)])
+            y0, y1 = sorted([float(ln.loc.y), float(ln.p2.y)])
+            near = grid.query((x0 - d, y0 - d, x1 + d, y1 + d))
+            kept = _clip_line(ln, [shapes[k] for k in sorted(near)], c)
+            if kept is None:
+                pieces.append(ln)
+            else:
+                pieces.extend(kept)
+                cut = True
+        t.extend(pieces if cut else [art])
+    return t
 
 class KeepOut(Primitive):
     "Specification of keep-out areas."
@@ -1262,6 +2544,7 @@ class Footprint(FPCoreObj):
     drawnMask = DrawnMask
     derivedMask = DerivedMask
     noMask = NoMask
+    gangMask = GangMask
     # Plated holes
     platedDrill = PlatedDrill
     platedSlot = PlatedSlot
@@ -1291,6 +2574,7 @@ class Footprint(FPCoreObj):
         self.silk = silk # FIXME: Add type-checking: must be silk primitives
         self.comments = [str(x) for x in comments]
         self.keepOuts = keepOuts # FIXME: add type-checking
+        self.courtyard = [] # Outlines, see make_courtyard().
     @property
     def pins(self):
         return self._pins
@@ -1307,14 +2591,286 @@ class Footprint(FPCoreObj):
         if l and not min([isinstance(x, Silk) for x in l]):
             raise ValueError('Must be a silk layer art element.')
         self._silk = l
+    bbox_layers = ['copper', 'mask', 'silk', 'keepout']
+    def bbox(self, layer=None):
+        """Bounding box (x0, y0, x1, y1) in mm of one of bbox_layers, or
+        of all of them if layer is None.  None if there is nothing there."""
+        if layer is not None and layer not in self.bbox_layers:
+            raise ValueError(str(layer).join(["No layer '", "'."]))
+        found = []
+        for name, boxes in self._extents(each=False):
+            if boxes and layer in (None, name):
+                found.extend(boxes)
+        if not found:
+            return None
+        x0, y0, x1, y1 = zip(*found)
+        return (min(x0), min(y0), max(x1), max(y1))
+    def _extents(self, each=True):
+        """(layer, list of extents) for each of bbox_layers.  Unless each,
+        the pins sharing a geometry give one extent per feature, spanning
+        them all, which is enough for bounding boxes."""
+        shapes = self._geo_features()
+        copper, mask, shared = [], [], set()
+        if each:
+            groups = [(pin.geo, [pin]) for pin in self.pins]
+        else:
+            byGeo = {}
+            for pin in self.pins:
+                byGeo.setdefault(id(pin.geo), (pin.geo, []))[1].append(pin)
+            groups = byGeo.values()
+        for geo, pins in groups:
+            # Hot for large arrays, so read the mm floats directly.
+            xs = [pin._loc._x._v for pin in pins]
+            ys = [pin._loc._y._v for pin in pins]
+            x0, y0, x1, y1 = min(xs), min(ys), max(xs), max(ys)
+            gc, go = shapes[id(geo)]
+            for side, t in gc:
+                copper.append(_span_extent(t, x0, y0, x1, y1))
+            for side, t, owner in go:
+                if not isinstance(owner, GangMask):
+                    mask.append(_span_extent(t, x0, y0, x1, y1))
+                elif (owner.serial, t) not in shared:
+                    # Gang openings are placed already, keep one.
+                    shared.add((owner.serial, t))
+                    mask.append(shape_extent(t))
+        return [('copper', copper), ('mask', mask),
+                ('silk', [b for b in map(_silk_extent, self.silk) if b]),
+                ('keepout', [(float(k.ll.x), float(k.ll.y),
+                              float(k.ur.x), float(k.ur.y))
+                             for k in self.keepOuts
+                             if isinstance(k, KeepOutRect)])]
+    def _geo_features(self):
+        """{id(geo): (copper, openings)} of each distinct pin geometry
+        flashed at the origin.  Pins share a few geometries, and their
+        features only move with the pin."""
+        origin = Pt.MM(0, 0)
+        t = {}
+        for pin in self.pins:
+            if id(pin.geo) not in t:
+                t[id(pin.geo)] = (pin.geo.copper(origin),
+                                  pin.geo.openings(origin))
+        return t
+    def make_courtyard(self, bloat, grid=Dim.MM(0.05)):
+        """Set courtyard to one outline, a list of Pt(), around the
+        union of copper, silk and keep-out extents bloated by bloat.
+        Extents are rounded out to grid and gaps narrower than twice
+        bloat are closed.  Parts that are still apart are joined by the
+        smallest wider closing, on grid, that does it.  Holes and
+        notches are then filled, leaving an orthogonally convex outline."""
+        b, g = float(bloat), float(grid)
+        lo = lambda v: m.floor((v - b) / g + 1e-9) * g
+        hi = lambda v: m.ceil((v + b) / g - 1e-9) * g
+        rects = []
+        for layer, boxes in self._extents():
+            if layer != 'mask':
+                rects.extend([(lo(x0), lo(y0), hi(x1), hi(y1))
+                              for x0, y0, x1, y1 in boxes])
+        if not rects:
+            self.courtyard = []
+            return
+        # Closing distances in grid steps: double until one part is
+        # left, then bisect for the least.
+        step = max(1, int(round(b / g)))
+        closed = rect_closing(rects, step * g)
+        if len(_outer_loops(closed)) > 1:
+            low, high = step, 2 * step
+            while True:
+                closed = rect_closing(rects, high * g)
+                if len(_outer_loops(closed)) == 1:
+                    break
+                low, high = high, 2 * high
+            while high - low > 1:
+                mid = (low + high) // 2
+                t = rect_closing(rects, mid * g)
+                if len(_outer_loops(t)) == 1:
+                    high, closed = mid, t
+                else:
+                    low = mid
+        outer = _outer_loops(rect_hull(closed))
+        self.courtyard = [Pt.array([x for x, y in loop],
+                                   [y for x, y in loop], bloat.du)
+                          for loop in outer]
+    def place_refdes(self):
+        """Put the refdes at x = 0, one text size beyond the top of the
+        footprint.  Plug-ins draw about the origin, so x = 0 is the
+        middle of symmetric footprints but not of the bounding box."""
+        box = self.bbox()
+        top = box[3] if box else 0.0
+        du = self.refdes.size.du
+        self.refdes.loc = Pt(Dim(0.0, du),
+                             Dim(top, du) + self.refdes.size)
     def reprvals(self):
         return [self.refdes, self.pins, self.silk, self.comments]
+    def _features(self, pins=None):
+        """(copper, openings): lists of (side, Shape(), owner) for the
+        lands and mask openings of pins, all pins if None.  A gang mask
+        owns its own openings, listed once."""
+        shapes = self._geo_features()
+        copper, openings, shared = [], [], set()
+        for pin in (self.pins if pins is None else pins):
+            gc, go = shapes[id(pin.geo)]
+            x, y = float(pin.loc.x), float(pin.loc.y)
+            for side, t in gc:
+                copper.append((side, Shape(x + t.x, y + t.y, t.ax, t.ay, t.r),
+                               pin))
+            for side, t, mask in go:
+                if isinstance(mask, GangMask):
+                    # Placed already, and listed by every pad in the gang.
+                    if (mask.serial, t) in shared:
+                        continue
+                    shared.add((mask.serial, t))
+                    openings.append((side, t, mask))
+                else:
+                    openings.append((side, Shape(x + t.x, y + t.y, t.ax,
+                                                 t.ay, t.r), pin))
+        return copper, openings
+    def clip_silk(self, clearance):
+        """Cut silk back to clearance from top side lands and mask openings.
+        Only the pins whose geometry extent, placed at the pin, comes
+        within clearance of the silk are turned into shapes."""
+        ink = [b for b in map(_silk_extent, self.silk) if b]
+        if not ink:
+            return
+        # Top side extent of each geometry at the origin, and the gang
+        # openings, which are placed already.
+        reach, shapes, shared = {}, [], set()
+        for key, (gc, go) in self._geo_features().items():
+            t = [shape_extent(sh) for side, sh in gc if side == 'top']
+            for side, sh, owner in go:
+                if side != 'top':
+                    continue
+                if not isinstance(owner, GangMask):
+                    t.append(shape_extent(sh))
+                elif (owner.serial, sh) not in shared:
+                    shared.add((owner.serial, sh))
+                    shapes.append(sh)
+            if t:
+                x0, y0, x1, y1 = zip(*t)
+                reach[key] = (min(x0), min(y0), max(x1), max(y1))
+        pins, boxes = [], []
+        for pin in self.pins:
+            if id(pin.geo) in reach:
+                x0, y0, x1, y1 = reach[id(pin.geo)]
+                x, y = pin._loc._x._v, pin._loc._y._v
+                pins.append(pin)
+                boxes.append((x + x0, y + y0, x + x1, y + y1))
+        # Index the pins, which are small and many, and probe with silk.
+        near = set([j for i, j, g in near_pairs(ink, clearance, boxes)])
+        copper, openings = self._features([pins[i] for i in sorted(near)])
+        shapes.extend([t[1] for t in copper + openings
+                       if t[0] == 'top' and not isinstance(t[2], GangMask)])
+        self.silk = clip_silk(self.silk, shapes, clearance)
+    def drill_requests(self, rules):
+        """(drill, oversize) for each round plated hole, where oversize
+        is how much larger in mm a drill may be under the rules drilltol
+        and minannulus.  Missing rules allow no oversize and any annulus."""
+        try:
+            tol = float(rules['drilltol'])
+        except RuleNotFound:
+            tol = 0.0
+        try:
+            ring = float(rules['minannulus'])
+        except RuleNotFound:
+            ring = None
+        requests = []
+        for pin in self.pins:
+            for drill, annulus in pin.geo.drills():
+                if annulus is None or ring is None:
+                    requests.append((drill, tol))
+                else:
+                    requests.append((drill,
+                        max(0.0, min(tol, 2.0 * (annulus - ring)))))
+        return requests
+    def drc(self, rules):
+        """Check against the rules minspace (copper to copper), minmask
+        (mask web between openings), minannulus, and minsilk (silk width
+        and silk to pad).  Rules missing from rules are not checked.
+        Returns a list of DRCViolation()."""
+        copper, openings = self._features()
+        violations = []
+        def check(rule, left, right, where):
+            # right is None to check left against itself.
+            try:
+                limit = rules[rule]
+            except RuleNotFound:
+                return
+            d = float(limit)
+            boxes = [shape_extent(t[1]) for t in left]
+            if right is None:
+                right, pairs = left, near_pairs(boxes, d)
+            else:
+                pairs = near_pairs(boxes, d,
+                                   [shape_extent(t[1]) for t in right])
+            gaps, flags = clearances([left[i][1] for i, j, g in pairs],
+                                     [right[j][1] for i, j, g in pairs], d)
+            # Report each pair of owners once, at its closest.
+            closest, order = {}, []
+            for (i, j, g), gap, flag in zip(pairs, gaps, flags):
+                w = flag and where(left[i], right[j], gap)
+                if not w:
+                    continue
+                key = (id(left[i][2]), id(right[j][2]), w)
+                if key not in closest:
+                    order.append(key)
+                elif gap >= closest[key]:
+                    continue
+                closest[key] = gap
+            for key in order:
+                violations.append(DRCViolation(rule, limit,
+                                  Dim(closest[key], limit.du), key[2]))
+        def pin_names(*owners):
+            return ', '.join([o.name if isinstance(o, PinInfo) else 'gang'
+                              for o in owners])
+        for side in ['top', 'bottom']:
+            check('minspace', [c for c in copper if c[0] == side], None,
+                  lambda a, b, gap: a[2].num != b[2].num and
+                      ''.join(['pins ', pin_names(b[2], a[2]), ' ', side]))
+            # Merged openings form a gang, only slivers are mask webs.
+            check('minmask', [o for o in openings if o[0] == side], None,
+                  lambda a, b, gap:
+                      a[2] is not b[2] and gap > _DRC_TOLERANCE and
+                      ''.join(['pins ', pin_names(b[2], a[2]), ' ', side]))
+        try:
+            minannulus = rules['minannulus']
+        except RuleNotFound:
+            pass
+        else:
+            seen = set()
+            for pin in self.pins:
+                if pin.geo in seen:
+                    continue
+                seen.add(pin.geo)
+                ring = pin.geo.annulus()
+                if ring is not None and \
+                   ring < float(minannulus) - _DRC_TOLERANCE:
+                    violations.append(DRCViolation('minannulus', minannulus,
+                        Dim(ring, minannulus.du), 'pin ' + pin.name))
+        try:
+            minsilk = rules['minsilk']
+        except RuleNotFound:
+            pass
+        else:
+            ink = []
+            for art in self.silk:
+                if art.pen_width < minsilk:
+                    violations.append(DRCViolation('minsilk', minsilk,
+                        art.pen_width, 'silk width'))
+                ink.extend([('top', shape, art) for shape in _silk_shapes(art)])
+            pads = [c for c in copper if c[0] == 'top'] + \
+                   [o for o in openings if o[0] == 'top']
+            check('minsilk', ink, pads,
+                  lambda a, b, gap: 'silk to pin ' + pin_names(b[2]))
+        return violations
     @classmethod
     def parse(cls, footprintname, params, rules, rack, warning_callback):
         raise NotImplementedError('Abstract')
     @classmethod
     def parse_kwargs(cls, params, kwspec = {}):
         "Standarized parser for plug-in parameters."
+        with hooks.span('params'):
+            return cls._parse_kwargs(params, kwspec)
+    @classmethod
+    def _parse_kwargs(cls, params, kwspec):
         par = LinesOf(params)
         plist = []
         tokens = tt.TokenizeAhead(KWParamLexer(par))
@@ -1455,6 +3011,56 @@ class Footprint(FPCoreObj):
         pin_num = cls.pin_num_generator(start_num, pin_num_step)
         return [(next(pin_num),p1+pitch*i) for i in range(num_pins)]
     @classmethod
+    def grid_coords(cls, count, pitch):
+        "List of count coordinates (float mm) at pitch, centered on zero."
+        p = float(pitch)
+        c = (count - 1) / 2.0
+        return [(i - c) * p for i in xrange(count)]
+    @classmethod
+    def via_field(cls, ll, ur, drill, counts=None, pitch=None, stagger=False,
+                  space=None):
+        """List of Pt() for a field of vias in the pad rectangle ll, ur,
+        column by column.  Give counts=(nx, ny) to center vias in equal
+        cells, or pitch=(px, py) to fit as many as the pad holds.  A
+        staggered field shifts every other column by half a pitch, which
+        drops its last via.  With space, holes closer than space to each
+        other or to the pad edge raise ParamValueError."""
+        x0, y0, x1, y1 = float(ll.x), float(ll.y), float(ur.x), float(ur.y)
+        d = float(drill)
+        edge = 0.0 if space is None else float(space)
+        if counts is not None:
+            nx, ny = [int(n) for n in counts]
+            px, py = (x1 - x0) / max(nx, 1), (y1 - y0) / max(ny, 1)
+        elif pitch is not None:
+            px, py = [float(p) for p in pitch]
+            nx = int(m.floor((x1 - x0 - d - 2.0*edge) / px + 1e-9)) + 1
+            ny = int(m.floor((y1 - y0 - d - 2.0*edge) / py + 1e-9)) + 1
+        else:
+            raise ValueError('Via field needs counts or pitch.')
+        if nx < 1 or ny < 1:
+            raise ParamValueError('No room for vias in the pad.')
+        cx, cy = (x0 + x1) / 2.0, (y0 + y1) / 2.0
+        ys = [y + cy for y in cls.grid_coords(ny, py)]
+        shifted = [y + py / 2.0 for y in ys[:-1]]
+        xs, fy = [], []
+        for i, x in enumerate(cls.grid_coords(nx, px)):
+            column = shifted if stagger and i % 2 else ys
+            xs.extend([x + cx] * len(column))
+            fy.extend(column)
+        if space is not None:
+            r = d / 2.0
+            holes = [Shape(x, y, 0.0, 0.0, r) for x, y in zip(xs, fy)]
+            near = near_pairs([shape_extent(h) for h in holes], edge)
+            gaps, flags = clearances([holes[i] for i, j, g in near],
+                                     [holes[j] for i, j, g in near], edge)
+            inset = min([min(x - x0, x1 - x, y - y0, y1 - y)
+                         for x, y in zip(xs, fy)]) - r
+            if True in flags or inset < edge - _DRC_TOLERANCE:
+                raise ParamValueError(
+                    'Vias closer than {0:s} to each other or the pad edge.'
+                    .format(str(space)))
+        return Pt.array(xs, fy, ll.x.du)
+    @classmethod
     def dil_geometry(cls, num_pins, width_oc, pitch_oc, left_geo,
                      right_geo=None, pad1_geo=None):
         x_left, x_right, y_top = cls._dil_alt_setup(num_pins, width_oc, pitch_oc)
@@ -1465,6 +3071,29 @@ class Footprint(FPCoreObj):
         return cls._dil_alt_final(left_geo, right_geo, pad1_geo,
                                   left_pin_locs, right_pin_locs)
     @classmethod
+    def quad_geometry(cls, side_counts, side_offsets, pitch, side_geos,
+                      pad1_geo=None):
+        """Pins on four sides, numbered counter-clockwise from the top of
+        the left side.  side_counts, side_offsets (distance from center
+        to pin row) and side_geos are per side: (left, bottom, right, top).
+        Every side is the left row rotated by a multiple of 90 degrees."""
+        # Exact cos/sin of k*90 degrees, so rotation adds no rounding.
+        rotations = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+        p = float(pitch)
+        xs, ys, geos = [], [], []
+        for (c, s), n, offset, geo in zip(rotations, side_counts,
+                                          side_offsets, side_geos):
+            lx = -float(offset)
+            lys = [((n - 1) / 2.0 - i) * p for i in xrange(n)]
+            xs.extend([lx*c - ly*s for ly in lys])
+            ys.extend([lx*s + ly*c for ly in lys])
+            geos.extend([geo.mustbe(PinGeometry)] * n)
+        if pad1_geo and geos:
+            geos[0] = pad1_geo.mustbe(PinGeometry)
+        locs = Pt.array(xs, ys, pitch.du)
+        return [cls.pinSpec(loc, n, geo)
+                for n, (loc, geo) in enumerate(zip(locs, geos), 1)]
+    @classmethod
     def alternating_geometry(cls, num_pins, width_oc, pitch_oc, left_geo,
                      right_geo=None, pad1_geo=None):
         x_left, x_right, y_top = cls._dil_alt_setup(num_pins, width_oc, pitch_oc)
@@ -1508,6 +3137,8 @@ _defaultRules = RulesDictionary([
     ('maskrelief', Dim.MIL(4)),
     ('minsilk',    Dim.MIL(10)),
     ('refdessize', Dim.MIL(40)),
+    ('courtyard',  Dim.MM(0.25)),
+    ('drilltol',   Dim.MM(0.1)),
 ])
 
 _defaultRack = DrillRack(
@@ -1606,10 +3237,16 @@ def importPlugins(plugins, callerGlobals, callerLocals):
         pluginModule = __import__(moduleName, callerGlobals, callerLocals, [puClass], -1)
         plugins[puName].append(pluginModule)
         
-def deriveRenderingClasses(plugins, prefix, renderBase, callerGlobals):
-    "Create a rendering class that inherits from the classes: (renderBase, pluginClass)"
+def activateRenderer(renderBase):
+    "Bind primitive construction to the class variables of renderBase."
+    # Only one renderer is active at a time.  Primitives that construct
+    # other primitives find the specialized classes through fpbase.
     global fpbase
     fpbase = renderBase
+
+def deriveRenderingClasses(plugins, prefix, renderBase, callerGlobals):
+    "Create a rendering class that inherits from the classes: (renderBase, pluginClass)"
+    activateRenderer(renderBase)
     for verb in plugins:
         moduleName, puClass, module = plugins[verb]
         renderClassName = '_'.join([prefix, puClass])
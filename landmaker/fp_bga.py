@@ -0,0 +1,159 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Footprints for:
+# Ball grid arrays, and other full or depopulated grid arrays of SMT lands.
+
+import footprintcore as fc
+
+# JEDEC row letters: no I, O, Q, S, X, Z.
+jedec_letters = 'ABCDEFGHJKLMNPRTUVWY'
+
+def jedec_row_names(count):
+    "Row names A..Y, then AA..AY, BA..BY, ... for count rows."
+    names = list(jedec_letters)
+    for first in jedec_letters:
+        if len(names) >= count:
+            break
+        names.extend([first + second for second in jedec_letters])
+    if count > len(names):
+        raise fc.ParamValueError('Too many rows for JEDEC ball names.')
+    return names[:count]
+
+class FP_bga(fc.Footprint):
+    kwspecs = {
+        'rows'      : fc.KWSpec(None, True, False),
+        'cols'      : fc.KWSpec(None, True, False),
+        'pitch'     : fc.KWSpec('mm', True, False),
+        'ball'      : fc.KWSpec('mm', True, False),
+        'void'      : fc.KWSpec(None, False, True),
+        'perimeter' : fc.KWSpec(None, False, False),
+        'depop'     : fc.KWSpec(None, False, True),
+        'body'      : fc.KWSpec('mm', False, True),
+        'clearance' : fc.KWSpec('mm', False, False),
+        'mask'      : fc.KWSpec('mm', False, False),
+    }
+    @classmethod
+    def helptext(cls):
+        yield "Ball grid arrays."
+        yield "  Default dimensions are mm."
+        yield "  rows=<n> -- number of ball rows, named A, B, ... Y, AA, ..."
+        yield "  cols=<n> -- number of ball columns, numbered from 1."
+        yield "  pitch=<dim> -- ball pitch."
+        yield "  ball=<dim> -- land diameter."
+        yield "  void=<rows>,<cols> -- depopulate a centered block of balls."
+        yield "  perimeter=<n> -- keep only the outer <n> rings of balls."
+        yield "  depop=<name>,... -- depopulate listed balls, e.g.: depop=A1,B2"
+        yield "  body=<width>,<length> -- package body outline (for silk)."
+        yield "  clearance=<dim> -- optional pad clearance."
+        yield "  mask=<dim> -- optional mask relief."
+        yield "  Ball A1 is top left.  Pin numbers count row by row over the"
+        yield "  full grid, so depopulation does not renumber balls."
+    @classmethod
+    def parse(cls, footprintname, params, rules, rack, warning_callback):
+        kw = cls.parse_kwargs(params, cls.kwspecs)
+        return cls.from_kwargs(footprintname, rules, rack, warning_callback, **kw)
+    @classmethod
+    def from_kwargs(cls, footprintname, rules, rack, warning_callback, **kw):
+        rows, cols = int(kw['rows']), int(kw['cols'])
+        if rows < 1 or cols < 1:
+            raise fc.ParamValueError('rows and cols must be at least 1.')
+        pitch = kw['pitch']
+        try:
+            mask = kw['mask']
+        except KeyError:
+            mask = rules['maskrelief']
+        try:
+            clear = kw['clearance']
+        except KeyError:
+            clear = rules['minspace']
+        # One geometry shared by every ball.
+        ballgeo = cls.smtPad(cls.land.circle(clear, kw['ball']), mask=mask)
+        # Locations and names of all balls, in one pass over the grid.
+        xs = cls.grid_coords(cols, pitch)
+        ys = [-y for y in cls.grid_coords(rows, pitch)]
+        row_names = jedec_row_names(rows)
+        col_names = [str(c + 1) for c in xrange(cols)]
+        removed = cls._depopulated(rows, cols, row_names, col_names, kw)
+        cells = [(r, c) for r in xrange(rows) for c in xrange(cols)
+                 if (r, c) not in removed]
+        locs = fc.Pt.array([xs[c] for r, c in cells],
+                           [ys[r] for r, c in cells], pitch.du)
+        pins = cls.pinSpec.array(locs, [r*cols + c + 1 for r, c in cells],
+                                 ballgeo, [row_names[r] + col_names[c]
+                                           for r, c in cells])
+        # Silk: body outline with a chamfer at A1, or an A1 dot.
+        silkwidth = rules['minsilk']
+        silk = []
+        try:
+            body_w, body_l = kw['body']
+        except KeyError:
+            body_w, body_l = None, None
+        if body_w:
+            ur = fc.Pt(body_w/2.0, body_l/2.0)
+            ul, ll, lr = fc.Pt(-ur.x, ur.y), -ur, fc.Pt(ur.x, -ur.y)
+            chamfer = min([pitch, body_w/2.0, body_l/2.0])
+            silk.append(cls.silkLine(ul + fc.Pt.xy0(chamfer), ur, silkwidth))
+            silk.append(cls.silkLine(ur, lr, silkwidth))
+            silk.append(cls.silkLine(lr, ll, silkwidth))
+            silk.append(cls.silkLine(ll, ul - fc.Pt.x0y(chamfer), silkwidth))
+            silk.append(cls.silkLine(ul - fc.Pt.x0y(chamfer),
+                                     ul + fc.Pt.xy0(chamfer), silkwidth))
+        else:
+            a1 = fc.Pt(fc.Dim(xs[0], pitch.du) - pitch,
+                       fc.Dim(ys[0], pitch.du) + pitch)
+            silk.append(cls.silkArc(a1, silkwidth, 0, 360, silkwidth))
+        # Comments
+        cmt = cls.standard_comments(cls.plugin_name(), kw, rules,
+            ['maskrelief','minspace','minsilk','refdessize'])
+        # refdes, placed once the extents are known.
+        rd = cls.refDes(fc.Pt.MM(0,0), 0, rules['minsilk'], '',
+                        rules['refdessize'])
+        desc = '{0:d}x{1:d} ball grid array.'.format(rows, cols)
+        fp = cls(footprintname, desc, rd, pins, silk, cmt)
+        fp.place_refdes()
+        return fp
+    @classmethod
+    def _depopulated(cls, rows, cols, row_names, col_names, kw):
+        "Set of (row, col) indices removed by void, perimeter and depop."
+        removed = set()
+        if kw.get('void'):
+            try:
+                vr, vc = [int(v) for v in kw['void']]
+            except ValueError:
+                raise fc.ParamSyntax('Expected void=<rows>,<cols>.')
+            if vr > rows or vc > cols or (rows - vr) % 2 or (cols - vc) % 2:
+                raise fc.ParamValueError('void must be centered in the grid.')
+            r0, c0 = (rows - vr) / 2, (cols - vc) / 2
+            removed.update([(r, c) for r in xrange(r0, r0 + vr)
+                                   for c in xrange(c0, c0 + vc)])
+        if kw.get('perimeter'):
+            ring = int(kw['perimeter'])
+            removed.update([(r, c) for r in xrange(ring, rows - ring)
+                                   for c in xrange(ring, cols - ring)])
+        if kw.get('depop'):
+            index = dict([(rn + cn, (r, c))
+                          for r, rn in enumerate(row_names)
+                          for c, cn in enumerate(col_names)])
+            for name in kw['depop']:
+                try:
+                    removed.add(index[str(name).upper()])
+                except KeyError:
+                    raise fc.ParamValueError(
+                        str(name).join(["No ball '", "' to depopulate."]))
+        return removed
@@ -88,6 +88,8 @@ class FP_enc(fc.Footprint):
             ['maskrelief','minspace','annulus_hs','refdessize'])
         cmt.append('Pins 6 & 7 are case.')
         # Create the refdes, description, and footprint instance.
-        rd = cls.refDes(fc.Pt.MM(0,2),0, rules['minsilk'], '', rules['refdessize'])
+        rd = cls.refDes(fc.Pt.MM(0,0),0, rules['minsilk'], '', rules['refdessize'])
         desc = 'Alpha ' + kw['type'] + ' encoder.'
-        return cls(footprintname, desc, rd, pinSpecs, silk, cmt, keepOuts) 
+        fp = cls(footprintname, desc, rd, pinSpecs, silk, cmt, keepOuts)
+        fp.place_refdes()
+        return fp
@@ -0,0 +1,108 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Footprints for:
+# Pin headers, shrouded headers, and other through-hole connector arrays.
+
+import footprintcore as fc
+
+class FP_header(fc.Footprint):
+    kwspecs = {
+        'rows'      : fc.KWSpec(None, True, False),
+        'cols'      : fc.KWSpec(None, True, False),
+        'pitch'     : fc.KWSpec('mil', False, False),
+        'rowpitch'  : fc.KWSpec('mil', False, False),
+        'drill'     : fc.KWSpec('inch', True, False),
+        'dia'       : fc.KWSpec('mil', True, False),
+        'numbering' : fc.KWSpec(None, False, False),
+        'shroud'    : fc.KWSpec('mil', False, True),
+    }
+    @classmethod
+    def helptext(cls):
+        yield "Pin headers and through-hole connector arrays."
+        yield "  rows=<n> -- number of rows."
+        yield "  cols=<n> -- number of pins in each row."
+        yield "  pitch=<dim> -- pin pitch along a row, default 100 mil."
+        yield "  rowpitch=<dim> -- distance between rows, default is pitch."
+        yield "  drill=<size, inches> -- drill size, fitted to the drill rack."
+        yield "  dia=<dim> -- pad diameter in mils.  Pin 1 is square."
+        yield "  numbering=zigzag|straight -- zigzag (the default) numbers"
+        yield "    across the rows first: 1 2 / 3 4 / ... as on IDC headers."
+        yield "    straight numbers all of row 1, then all of row 2, ..."
+        yield "  shroud=<x>,<y> -- shroud outline drawn on silk."
+        yield "  Pin 1 is top left.  Rules referenced: maskrelief, minspace,"
+        yield "  minsilk, refdessize."
+    @classmethod
+    def parse(cls, footprintname, params, rules, rack, warning_callback):
+        kw = cls.parse_kwargs(params, cls.kwspecs)
+        return cls.from_kwargs(footprintname, rules, rack, warning_callback, **kw)
+    @classmethod
+    def from_kwargs(cls, footprintname, rules, rack, warning_callback, **kw):
+        rows, cols = int(kw['rows']), int(kw['cols'])
+        if rows < 1 or cols < 1:
+            raise fc.ParamValueError('rows and cols must be at least 1.')
+        pitch = kw.get('pitch') or fc.Dim.MIL(100)
+        rowpitch = kw.get('rowpitch') or pitch
+        numbering = str(kw.get('numbering') or 'zigzag').lower()
+        if numbering not in ['zigzag', 'straight']:
+            raise fc.ParamValueError('numbering must be zigzag or straight.')
+        maskrelief = rules['maskrelief']
+        clearance = rules['minspace']
+        drill = rack[kw['drill']]
+        dia = kw['dia']
+        # Two geometries: square pin 1, round for all the others.
+        pad1geo = cls.thruPin.square(drill, clearance, dia, maskrelief)
+        pingeo = cls.thruPin.circle(drill, clearance, dia, maskrelief)
+        # All locations in one pass, listed in pin number order.
+        xs = cls.grid_coords(cols, pitch)
+        ys = [-y for y in cls.grid_coords(rows, rowpitch)]
+        if numbering == 'zigzag':
+            cells = [(r, c) for c in xrange(cols) for r in xrange(rows)]
+        else:
+            cells = [(r, c) for r in xrange(rows) for c in xrange(cols)]
+        locs = fc.Pt.array([xs[c] for r, c in cells],
+                           [ys[r] for r, c in cells], pitch.du)
+        pins = [cls.pinSpec(loc, n, pingeo) for n, loc in enumerate(locs, 1)]
+        pins[0] = cls.pinSpec(locs[0], 1, pad1geo)
+        # Silk: shroud outline with pin 1 corner chamfered.
+        silkw = rules['minsilk']
+        silk = []
+        if kw.get('shroud'):
+            try:
+                sx, sy = kw['shroud']
+            except ValueError:
+                raise fc.ParamSyntax('Expected shroud=<x>,<y>.')
+            ur = fc.Pt(sx/2.0, sy/2.0)
+            ul, ll, lr = fc.Pt(-ur.x, ur.y), -ur, fc.Pt(ur.x, -ur.y)
+            chamfer = min([pitch/2.0, ur.x, ur.y])
+            silk.append(cls.silkLine(ul + fc.Pt.xy0(chamfer), ur, silkw))
+            silk.append(cls.silkLine(ur, lr, silkw))
+            silk.append(cls.silkLine(lr, ll, silkw))
+            silk.append(cls.silkLine(ll, ul - fc.Pt.x0y(chamfer), silkw))
+            silk.append(cls.silkLine(ul - fc.Pt.x0y(chamfer),
+                                     ul + fc.Pt.xy0(chamfer), silkw))
+        # Make refdes, placed once the extents are known.
+        rd = cls.refDes(fc.Pt.MM(0,0), 0, rules['minsilk'], '',
+                        rules['refdessize'])
+        # Make comments
+        cmt = cls.standard_comments(cls.plugin_name(), kw, rules,
+            ['maskrelief','minspace','minsilk','refdessize'])
+        desc = '{0:d}x{1:d} pin header.'.format(rows, cols)
+        fp = cls(footprintname, desc, rd, pins, silk, cmt)
+        fp.place_refdes()
+        return fp
@@ -76,8 +76,9 @@ class FP_hole(fc.Footprint):
         # Pick up general rules
         maskrelief = rules['maskrelief']
         clearance = rules['minspace']
-        if 't' in fc.debug:
-            fc.trace('maskrelief',globals(),locals())
+        if fc.hooks.on:
+            fc.hooks.event('hole.rules', maskrelief=maskrelief,
+                           clearance=clearance)
         # Select drill
         rackDrill = rack[args.drill]
         # Construct pin geometry and pin spec
@@ -91,9 +92,11 @@ class FP_hole(fc.Footprint):
         cmt = cls.standard_comments(cls.plugin_name(), kw, rules,
             ['maskrelief','minspace','refdessize'])
         # Create the refdes, description, and footprint instance.
-        rd = cls.refDes(fc.Pt.MM(0,2),0, rules['minsilk'], '', rules['refdessize'])
+        rd = cls.refDes(fc.Pt.MM(0,0),0, rules['minsilk'], '', rules['refdessize'])
         desc = 'Screw hole.'
-        return cls(footprintname, desc, rd, pinSpecs, silk, cmt, keepOuts)
+        fp = cls(footprintname, desc, rd, pinSpecs, silk, cmt, keepOuts)
+        fp.place_refdes()
+        return fp
     @classmethod
     def _norm_args(cls, kwargs):
         normed_args = {}
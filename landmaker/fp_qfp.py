@@ -0,0 +1,192 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Footprints for:
+# QFP, LQFP, TQFP, QFN and other quad packages, with optional
+# exposed thermal pad and via field.
+
+import footprintcore as fc
+
+class FP_qfp(fc.Footprint):
+    kwspecs = {
+        'pins'       : fc.KWSpec(None, True, False),
+        'xpins'      : fc.KWSpec(None, False, False),
+        'padlen'     : fc.KWSpec('mm', True, False),
+        'padwidth'   : fc.KWSpec('mm', True, False),
+        'pitch'      : fc.KWSpec('mm', True, False),
+        'span'       : fc.KWSpec('mm', True, True),
+        'body'       : fc.KWSpec('mm', False, True),
+        'shape'      : fc.KWSpec(None, False, False),
+        'thermal'    : fc.KWSpec('mm', False, True),
+        'thermalexp' : fc.KWSpec('mm', False, True),
+        'vias'       : fc.KWSpec(None, False, True),
+        'viadrill'   : fc.KWSpec('mm', False, False),
+        'clearance'  : fc.KWSpec('mm', False, False),
+        'mask'       : fc.KWSpec('mm', False, False),
+        'gang'       : fc.KWSpec('mm', False, False),
+    }
+    @classmethod
+    def helptext(cls):
+        yield "QFP, LQFP, TQFP, QFN family."
+        yield "  Default dimensions are mm."
+        yield "  pins=<n> -- total number of pins."
+        yield "  xpins=<n> -- pins on top and bottom sides, if not pins/4."
+        yield "  padlen=<dim> -- length of pin pads."
+        yield "  padwidth=<dim> -- width of pin pads."
+        yield "  pitch=<dim> -- distance between pin centerlines."
+        yield "  span=<x>[,<y>] -- pad tip-to-tip span across the package."
+        yield "  body=<x>,<y> -- package body (for silk corners)."
+        yield "  shape=rect|obround -- pad shape, default obround."
+        yield "  thermal=<x>,<y> -- exposed pad, assigned number <pins>+1."
+        yield "  thermalexp=<x>,<y> -- exposed pad mask opening."
+        yield "  vias=<nx>,<ny>[,s] -- number of vias in the exposed pad, s to"
+        yield "    stagger them."
+        yield "  viadrill=<dim>  -- drill size for vias."
+        yield "  clearance=<dim> -- optional pad clearance."
+        yield "  mask=<dim> -- optional mask relief."
+        yield "  gang[=<dim>] -- gang mask each pin row, bloating pads by <dim>,"
+        yield "    by default just enough to close the mask web."
+        yield "  Pin 1 is the top of the left side, numbered counter-clockwise."
+    @classmethod
+    def parse(cls, footprintname, params, rules, rack, warning_callback):
+        kw = cls.parse_kwargs(params, cls.kwspecs)
+        return cls.from_kwargs(footprintname, rules, rack, warning_callback, **kw)
+    @classmethod
+    def from_kwargs(cls, footprintname, rules, rack, warning_callback, **kw):
+        numpins = int(kw['pins'])
+        try:
+            xpins = int(kw['xpins'])
+        except (KeyError, TypeError):
+            if numpins % 4:
+                raise fc.ParamValueError('pins must be a multiple of 4.')
+            xpins = numpins / 4
+        ypins, odd = divmod(numpins - 2*xpins, 2)
+        if odd or ypins < 1 or xpins < 1:
+            raise fc.ParamValueError('pins and xpins do not fit four sides.')
+        try:
+            span_x, span_y = (kw['span'] * 2)[0:2]
+        except ValueError:
+            raise fc.ParamSyntax('Expected span=<x>[,<y>].')
+        try:
+            mask = kw['mask']
+        except KeyError:
+            mask = rules['maskrelief']
+        try:
+            clear = kw['clearance']
+        except KeyError:
+            clear = rules['minspace']
+        padlen = kw['padlen']
+        padwidth = kw['padwidth']
+        pitch = kw['pitch']
+        # One geometry for the left and right rows, one for top and bottom.
+        shape = str(kw.get('shape') or 'obround').lower()
+        if shape == 'obround':
+            lr_geo = cls.smtPad.obround(clear, padlen, padwidth, mask)
+            tb_geo = cls.smtPad.obround(clear, padwidth, padlen, mask)
+        elif shape == 'rect':
+            lr_geo = cls.smtPad(cls.land.rectangle(clear, padlen, padwidth),
+                                mask=mask)
+            tb_geo = cls.smtPad(cls.land.rectangle(clear, padwidth, padlen),
+                                mask=mask)
+        else:
+            raise fc.ParamValueError('shape must be rect or obround.')
+        row_x = (span_x - padlen)/2.0
+        row_y = (span_y - padlen)/2.0
+        pins = cls.quad_geometry([ypins, xpins, ypins, xpins],
+                                 [row_x, row_y, row_x, row_y],
+                                 pitch, [lr_geo, tb_geo, lr_geo, tb_geo])
+        relief = mask
+        if 'gang' in kw:
+            gang_bloat = kw['gang'] or max([mask, (pitch - padwidth)/2.0])
+            cls.smtPad.gang(pins, gang_bloat)
+            relief = max([mask, gang_bloat])
+        # Make exposed pad.
+        if kw.get('thermal'):
+            pins.append(cls.pinSpec(fc.Pt.MM(0,0), numpins+1,
+                cls._exposed_pad(clear, rules['minspace'], kw,
+                                 warning_callback), 0, 'THRM'))
+        # Make silk: body corners, stopped short of the pad rows, and a
+        # pin 1 dot beyond the tip of pin 1.  Ink stays minsilk clear
+        # of the mask openings, and is clipped off the exposed pad.
+        silkwidth = rules['minsilk']
+        gap = relief + silkwidth*1.5
+        silk = []
+        if kw.get('body'):
+            try:
+                body_x, body_y = kw['body']
+            except ValueError:
+                raise fc.ParamSyntax('Expected body=<x>,<y>.')
+            cx, cy = body_x/2.0, body_y/2.0
+            # Silk may not run past the pad rows along each edge.
+            stop_x = pitch*((xpins-1)/2.0) + padwidth/2.0 + gap
+            stop_y = pitch*((ypins-1)/2.0) + padwidth/2.0 + gap
+            for sx, sy in [(1,1), (-1,1), (-1,-1), (1,-1)]:
+                corner = fc.Pt(cx*sx, cy*sy)
+                if cx > stop_x:
+                    silk.append(cls.silkLine(corner,
+                        fc.Pt(stop_x*sx, corner.y), silkwidth))
+                if cy > stop_y:
+                    silk.append(cls.silkLine(corner,
+                        fc.Pt(corner.x, stop_y*sy), silkwidth))
+        pin1 = pins[0].loc
+        dot = fc.Pt(pin1.x - padlen/2.0 - gap - silkwidth/2.0, pin1.y)
+        silk.append(cls.silkArc(dot, silkwidth/2.0, 0, 360, silkwidth))
+        # Comments
+        cmt = cls.standard_comments(cls.plugin_name(), kw, rules,
+            ['maskrelief','minspace','minsilk','refdessize'])
+        # refdes, placed once the extents are known.
+        rd = cls.refDes(fc.Pt.MM(0,0), 0, rules['minsilk'], '',
+                        rules['refdessize'])
+        desc = '{0:d}-pin quad package.'.format(numpins)
+        fp = cls(footprintname, desc, rd, pins, silk, cmt)
+        fp.clip_silk(silkwidth)
+        fp.place_refdes()
+        return fp
+    @classmethod
+    def _exposed_pad(cls, clear, space, kw, warning_callback):
+        "Exposed pad with its mask opening and via field."
+        try:
+            cu_x, cu_y = kw['thermal']
+        except ValueError:
+            raise fc.ParamSyntax('Expected thermal=<x>,<y>.')
+        cu_ur = fc.Pt(cu_x/2.0, cu_y/2.0)
+        if kw.get('thermalexp'):
+            mask_x, mask_y = kw['thermalexp']
+            mask_ur = fc.Pt(mask_x/2.0, mask_y/2.0)
+            mask_ll = -mask_ur
+        else:
+            mask_ll, mask_ur = None, None
+            warning_callback('No thermal anti-mask specified.')
+        drill_points = []
+        drill_size = None
+        if kw.get('vias'):
+            vias = kw['vias']
+            try:
+                nx, ny = [int(v) for v in vias[0:2]]
+            except ValueError:
+                raise fc.ParamSyntax('Expected vias=<nx>,<ny>[,s].')
+            try:
+                drill_size = kw['viadrill']
+            except KeyError:
+                raise fc.ParamSyntax('No via drill specified.')
+            # Vias centered in equal cells of the exposed pad.
+            drill_points = cls.via_field(-cu_ur, cu_ur, drill_size,
+                counts=(nx, ny), stagger=str(vias[2:] and vias[2]) == 's',
+                space=space)
+        return cls.thermalPolygon.rectangle(clear, -cu_ur, cu_ur,
+            mask_ll, mask_ur, drill_size, drill_points)
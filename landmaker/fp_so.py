@@ -16,8 +16,6 @@
 #   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
 #   
 
-# FIXME: Check minmask rule between pads.
-# FIXME: Add option to generate gang masks.
 
 import footprintcore as fc
 
@@ -35,6 +33,7 @@ class FP_so(fc.Footprint):
         'viadrill'   : fc.KWSpec('mm', False, False),
         'clearance'  : fc.KWSpec('mm', False, False),
         'mask'       : fc.KWSpec('mm', False, False),
+        'gang'       : fc.KWSpec('mm', False, False),
     }
     @classmethod
     def helptext(cls):
@@ -52,6 +51,8 @@ class FP_so(fc.Footprint):
         yield "  viadrill=<dim>  -- drill size for vias."
         yield "  clearance=<dim> -- optional pad clearance."
         yield "  mask=<dim> -- optional mask relief."
+        yield "  gang[=<dim>] -- gang mask each pin row, bloating pads by <dim>,"
+        yield "    by default just enough to close the mask web."
     @classmethod
     def parse(cls, footprintname, params, rules, rack, warning_callback):
         kw = cls.parse_kwargs(params, cls.kwspecs)
@@ -79,13 +80,16 @@ class FP_so(fc.Footprint):
         pitch = kw['pitch']
         numpins = int(kw['pins'])
         pins = cls.dil_geometry(numpins, kw['span']-padwidth, pitch, pingeo)
+        gang_bloat = None
+        if 'gang' in kw:
+            gang_bloat = kw['gang'] or max([mask, (pitch - padwidth)/2.0])
+            cls.smtPad.gang(pins, gang_bloat)
         # Make thermal pad.
         try:
             thermal_cu = kw['thermal']
         except:
             thermal_cu = None
         if thermal_cu:
-            print thermal_cu
             cu_x, cu_y = thermal_cu
             cu_ur = fc.Pt(cu_x/2.0, cu_y/2.0)
             cu_ll = -cu_ur
@@ -97,25 +101,30 @@ class FP_so(fc.Footprint):
             else:
                 mask_ll, mask_ur = None,None
                 warning_callback('No thermal anti-mask specified.')
-            #thermal_drills = cls._drill_field(thermal_cu[0],**kw)
             thermal_drills = kw['vias']
+            drill_size = kw['viadrill']
             if thermal_drills:
-                x_drills, y_drills = (int(x) for x in thermal_drills)
-                p0 = cu_ll + fc.Pt(cu_x/(2.0 * x_drills), cu_y/(2.0 * y_drills))
-                p1 = p0 + fc.Pt(cu_x/x_drills, cu_y/y_drills)
-                drill_points = fc.Pt.point_array(p0,p1,(x_drills, y_drills)) # FIXME: Lame error checking.
+                try:
+                    x_drills, y_drills = [int(x) for x in thermal_drills[0:2]]
+                except ValueError:
+                    raise fc.ParamSyntax('Expected vias=<nw>,<nl>[,s].')
+                stagger = str(thermal_drills[2:] and thermal_drills[2]) == 's'
+                drill_points = cls.via_field(cu_ll, cu_ur, drill_size,
+                    counts=(x_drills, y_drills), stagger=stagger,
+                    space=rules['minspace'])
             else:
                 drill_points = []
-            print 'drill points',drill_points
-            drill_size = kw['viadrill']
             t = cls.thermalPolygon.rectangle(
                 clear, cu_ll, cu_ur, mask_ll, mask_ur,
                 drill_size, drill_points)
             pins.append(cls.pinSpec(fc.Pt.MM(0,0), numpins+1, t, 0, 'THRM' ))
-        # Make silk -- be sure it doesn't run into thermal anti-mask.
+        # Make silk -- clipped below so it doesn't run into thermal anti-mask.
         pkglen = kw['pkglen']
         silkwidth = rules['minsilk']
         silkx = (kw['span']/2.0-padlen)-silkwidth
+        if gang_bloat and gang_bloat > mask:
+            # Gang openings reach further toward the package.
+            silkx -= gang_bloat - mask
         silk = []
         silky = pkglen/2.0
         ur = fc.Pt(silkx,silky)
@@ -126,50 +135,18 @@ class FP_so(fc.Footprint):
         silk.append(cls.silkLine(lr,ll,silkwidth))
         silk.append(cls.silkLine(ll,ul,silkwidth))
         silk.append(cls.silkLine(ul,ur,silkwidth))
-        silk.append(cls.silkArc(fc.Pt.x0y(silky),silkx/5.0,0,180,silkwidth))
+        # Pin 1 notch dips into the package outline.
+        silk.append(cls.silkArc(fc.Pt.x0y(silky),silkx/5.0,180,180,silkwidth))
         # Comments
         cmt = cls.standard_comments(cls.__name__.split('_')[2],
             kw, rules,
             ['maskrelief','minspace','minsilk','refdessize'])
-        # refdes
-        # FIXME: move off below part
+        # refdes, moved off the part once the extents are known.
         rd = cls.refDes(fc.Pt.MM(0,0),0,rules['minsilk'],'',rules['refdessize'])
-        return cls(footprintname, '', rd, pins, silk, cmt)
-    @classmethod
-    def _drill_field(cls, lower_left, **kw):
-        try:
-            v = kw['vias']
-        except KeyError:
-            return []
-        try:
-            sz = kw['viadrill']
-        except KeyError:
-            raise fc.ParamSyntax('No via drill specified.')
-        try:
-            v.append(False)
-            #print 'v:',repr(v)
-            nw, nl, stagger = v[0:3]
-        except ValueError:
-            raise fc.ParamSyntax('Expected width,length count for drill field.')
-        nw,nl,stagger = int(nw),int(nl),bool(stagger)
-        nw,nl = (nw,nl) if nw < nl else (nl,nw)
-        thermw,therml = kw['thermal']
-        lenstep = fc.Pt.x0y(therml/nl)
-        widthstep = fc.Pt.xy0(thermw/nw)
-        #print 'tw,ws,tl,ls:',thermw,widthstep,therml,lenstep
-        xoffset = widthstep/2.0
-        yoffset = lenstep/2.0
-        #print 'xo,yo:',xoffset,yoffset
-        drill_locs = []
-        colstart = lower_left + xoffset + yoffset
-        #print 'll,colstart:',lower_left, colstart
-        for i in xrange(0,nw):
-            loc = colstart + yoffset if stagger and i%2 else colstart
-            for j in xrange(0,(nl-1) if stagger and i%2 else nl):
-                drill_locs.append(loc)
-                loc += lenstep
-            colstart += widthstep
-        return [(loc, sz) for loc in drill_locs]
+        fp = cls(footprintname, '', rd, pins, silk, cmt)
+        fp.clip_silk(rules['minsilk'])
+        fp.place_refdes()
+        return fp
         
         
         
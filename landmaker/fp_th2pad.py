@@ -88,13 +88,14 @@ class FP_th2pad(fc.Footprint):
             box.append(cls.silkLine(fc.Pt(-alhalf,  awhalf), fc.Pt(-alhalf, -awhalf), silkw))
         except KeyError:
             # No silk at all.
-            awhalf = fc.Dim.MIL(0) # For placing refdes
-        # Make refdes
-        silky = awhalf+20
-        rd = cls.refDes(fc.Pt(silky.u0,silky),0, rules['minsilk'], '', rules['refdessize'])
+            pass
+        # Make refdes, placed once the extents are known.
+        rd = cls.refDes(fc.Pt.MM(0,0),0, rules['minsilk'], '', rules['refdessize'])
         # Make comments
         cmt = cls.standard_comments('th2pad', kw, rules, 
             ['maskrelief','minspace','minsilk','refdessize'])
         # Create the footprint instance.
         desc = str(kw['desc'])
-        return cls(footprintname, desc, rd, [pin1, pin2], box, cmt)
+        fp = cls(footprintname, desc, rd, [pin1, pin2], box, cmt)
+        fp.place_refdes()
+        return fp
@@ -91,6 +91,8 @@ class FP_usbconnmolex(fc.Footprint):
             ['maskrelief','minspace','minannulus','refdessize','minsilk'])
         cmt.append('Pins 6 & 7 are case.')
         # Create the refdes, description, and footprint instance.
-        rd = cls.refDes(fc.Pt.MM(0,2),0, rules['minsilk'], '', rules['refdessize'])
+        rd = cls.refDes(fc.Pt.MM(0,0),0, rules['minsilk'], '', rules['refdessize'])
         desc = 'Molex ' + kw['type'] + ' USB connector.'
-        return cls(footprintname, desc, rd, pinSpecs, [], cmt, keepOuts) 
+        fp = cls(footprintname, desc, rd, pinSpecs, [], cmt, keepOuts)
+        fp.place_refdes()
+        return fp
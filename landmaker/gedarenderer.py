@@ -17,6 +17,7 @@
 #   
 
 import os
+import multiprocessing as mp
 from collections import namedtuple
 # Import the plug-in core.
 import footprintcore as fc
@@ -33,6 +34,87 @@ pin_format_str = ('Pin[{x:d} {y:d} {dia:d} {clear:d} {mask:d} {drill:d} ' +
 pad_format_str = ('Pad[{x1:d} {y1:d} {x2:d} {y2:d} {width:d} ' +
     '{clear:d} {mask:d} "{name:s}" "{num:d}" "{tflags:s}"]')
 
+def _gu(mm):
+    "Millimeters to gEDA units, truncated exactly as Dim.gu does."
+    return int((mm / fc.Dim.mm_per_mil) * 100.0)
+
+# Renderings of a shared PinGeometry differ from pin to pin only by
+# location, pin name and pin number.  The templates below hold the
+# formatted, location independent remainder of a Pin[] or Pad[] line.
+#
+# A geometry keeps its templates in _render_cache as (pass, key,
+# templates), where key is the value of the geometry with its lands,
+# apertures, masks and hole.  Those may be shared and changed in place
+# after a rendering, so the key is compared once per geometry in each
+# footprint rendering (pass); within a pass the templates are reused.
+
+_renderPass = 0
+
+def _value_key(obj):
+    "Class and attribute values of obj, recursively, for comparison."
+    if isinstance(obj, fc.FPCoreObj):
+        return (obj.__class__,) + tuple([(name, _value_key(v))
+            for name, v in sorted(obj.__dict__.items())
+            if name != '_render_cache'])
+    if isinstance(obj, (list, tuple)):
+        return tuple([_value_key(v) for v in obj])
+    return obj
+
+def _templates(geo, make):
+    "geo's templates, from make() unless its value is unchanged."
+    try:
+        renderPass, key, templates = geo._render_cache
+    except AttributeError:
+        renderPass, key, templates = None, None, None
+    if renderPass == _renderPass:
+        return templates
+    value = _value_key(geo)
+    if value != key:
+        templates = make()
+    geo._render_cache = (_renderPass, value, templates)
+    return templates
+
+class GedaPinTemplate(object):
+    "Location independent part of a Pin[] line."
+    def __init__(self, dia, clear, mask, drill, tflags):
+        self.fmt = ''.join(['Pin[{0:d} {1:d} ',
+            '{0:d} {1:d} {2:d} {3:d}'.format(dia.gu, clear.gu, mask.gu, drill.gu),
+            ' "{2:s}" "{3:d}" "', tflags, '"]'])
+    def line(self, pin_spec):
+        loc = pin_spec.loc
+        return self.fmt.format(loc.x.gu, -loc.y.gu, pin_spec.name, pin_spec.num)
+
+class GedaPadTemplate(object):
+    "Location independent part of a Pad[] line."
+    def __init__(self, aperture, land, mask, onsolder=False):
+        self.lx, self.ly = land.loc.x.mm, land.loc.y.mm
+        if aperture.xsize > aperture.ysize:
+            self.dx = ((aperture.xsize - aperture.ysize)/2.0).mm
+            self.dy = 0.0
+            width = aperture.ysize
+        else:
+            self.dx = 0.0
+            self.dy = ((aperture.ysize - aperture.xsize)/2.0).mm
+            width = aperture.xsize
+        flags = ''.join([aperture.tflags, 'onsolder' if onsolder else ''])
+        self.fmt = ''.join(['Pad[{0:d} {1:d} {2:d} {3:d} ',
+            '{0:d} {1:d} {2:d}'.format(width.gu, (land.clearance*2.0).gu,
+                                       mask.width.gu),
+            ' "{4:s}" "{5:d}" "', flags, '"]'])
+    def line(self, pin_spec):
+        x = pin_spec.loc.x.mm + self.lx
+        y = pin_spec.loc.y.mm + self.ly
+        return self.fmt.format(_gu(x - self.dx), -_gu(y - self.dy),
+                               _gu(x + self.dx), -_gu(y + self.dy),
+                               pin_spec.name, pin_spec.num)
+
+class GedaLiteral(object):
+    "Constant line in a cached PinGeometry rendering."
+    def __init__(self, text):
+        self.text = text
+    def line(self, pin_spec):
+        return self.text
+
 class GedaSimpleAperture(object):
     @property
     def is_simple_pin(self):
@@ -46,11 +128,23 @@ class Geda_SACircle(fc.SACircle, GedaSimpleAperture):
     def is_simple_pin(self):
         return True
     @property
+    def is_simple_pad(self):
+        # A zero length Pad[] without 'square' is round.
+        return True
+    @property
     def thickness(self):
         return self.diameter
     @property
+    def xsize(self):
+        return self.diameter
+    @property
+    def ysize(self):
+        return self.diameter
+    @property
     def tflags(self):
         return ''
+    def format_pad(self, pin_spec, land, mask, onsolder=False):
+        return GedaPadTemplate(self, land, mask, onsolder).line(pin_spec)
 
 class GedaSARectangular(GedaSimpleAperture):
     @property
@@ -60,25 +154,7 @@ class GedaSARectangular(GedaSimpleAperture):
     def is_simple_pad(self):
         return True
     def format_pad(self, pin_spec, land, mask, onsolder=False):
-        loc = pin_spec.loc + land.loc
-        if self.xsize > self.ysize:
-            lenby2 = (self.xsize - self.ysize)/2.0
-            x1,x2 = loc.x.minus_plus(lenby2)
-            width = self.ysize
-            y1,y2 = loc.y, loc.y
-        else:
-            lenby2 = (self.ysize - self.xsize)/2.0
-            y1,y2 = loc.y.minus_plus(lenby2)
-            width = self.xsize
-            x1,x2 = loc.x, loc.x
-        flags = ''.join([self.tflags, 'onsolder' if onsolder else ''])
-        return pad_format_str.format(
-            x1=x1.gu, y1=-y1.gu, x2=x2.gu, y2=-y2.gu, width=width.gu,
-            clear=(land.clearance*2.0).gu,
-            mask=mask.width.gu,
-            name=pin_spec.name,
-            num=pin_spec.num,
-            tflags=flags)
+        return GedaPadTemplate(self, land, mask, onsolder).line(pin_spec)
     
 class Geda_SARectangle(fc.SARectangle, GedaSARectangular):
     @property
@@ -162,6 +238,11 @@ class Geda_NoMask(fc.NoMask):
     def width(self):
         return fc.Dim.MM(0)
 
+class Geda_GangMask(fc.GangMask):
+    @property
+    def is_derived(self):
+        return False
+
 class Geda_DrawnPaste(fc.DrawnPaste):
     pass
 
@@ -178,59 +259,54 @@ class Geda_NoPaste(fc.NoPaste):
 
 class Geda_ThruPin(fc.ThruPin):
     def rendering(self, pin_spec, warning_callback):
+        for t in _templates(self, self._templates):
+            yield t.line(pin_spec)
+    def _templates(self):
         # FIXME: Handle plated slots. Make Geda_PlatedSlot behave like drill? Issue warning.
         if not self.solder_mask.is_derived:
             raise fc.CanNotRenderError('Can only render derived masks for ThruPin.')
         if self.symmetric and self.solder_land.is_simple_pin:
-            yield pin_format_str.format(
-                x=pin_spec.loc.x.gu, y=-pin_spec.loc.y.gu,
-                dia=self.solder_land.aperture.diameter.gu,
-                clear=(self.solder_land.clearance*2.0).gu,
-                mask=self.solder_mask.width.gu,
-                drill=self.hole.diameter.gu,
-                pname=pin_spec.name,
-                pnum=pin_spec.num,
-                tflags=self.solder_land.aperture.tflags)
-        else:
-            pin_dia = min([self.solder_land.aperture.thickness,
-                           self.comp_land.aperture.thickness])
-            pin_mask = min([self.solder_mask.width, self.comp_mask.width])
-            clearance = min([self.solder_land.clearance,
-                             self.comp_land.clearance])
-            yield pin_format_str.format(
-                x=pin_spec.loc.x.gu, y=-pin_spec.loc.y.gu,
-                dia=pin_dia.gu,
-                clear=(clearance*2.0).gu,
-                mask=pin_mask.gu,
-                drill=self.hole.diameter.gu,
-                pname=pin_spec.name,
-                pnum=pin_spec.num,
-                tflags='')
-            if self.comp_land.aperture.thickness != pin_dia \
-              or not self.comp_land.aperture.is_simple_pin:
-                if 'c' in fc.debug:
-                    yield '# Draw top pad.'
-                yield '# <top pad>'
-            if self.solder_land.aperture.thickness != pin_dia \
-              or not self.solder_land.aperture.is_simple_pin:
-                if 'c' in fc.debug:
-                    yield '# Draw bottom pad.'
-                yield self.solder_land.aperture.format_pad(
-                    pin_spec, self.solder_land, self.solder_mask, True)
+            return [GedaPinTemplate(
+                self.solder_land.aperture.thickness,
+                self.solder_land.clearance*2.0,
+                self.solder_mask.width,
+                self.hole.diameter,
+                self.solder_land.aperture.tflags)]
+        pin_dia = min([self.solder_land.aperture.thickness,
+                       self.comp_land.aperture.thickness])
+        pin_mask = min([self.solder_mask.width, self.comp_mask.width])
+        clearance = min([self.solder_land.clearance,
+                         self.comp_land.clearance])
+        t = [GedaPinTemplate(pin_dia, clearance*2.0, pin_mask,
+                             self.hole.diameter, '')]
+        if self.comp_land.aperture.thickness != pin_dia \
+          or not self.comp_land.aperture.is_simple_pin:
+            if fc.hooks.on:
+                fc.hooks.event('geda.pad', side='top')
+            t.append(GedaLiteral('# <top pad>'))
+        if self.solder_land.aperture.thickness != pin_dia \
+          or not self.solder_land.aperture.is_simple_pin:
+            if fc.hooks.on:
+                fc.hooks.event('geda.pad', side='bottom')
+            t.append(GedaPadTemplate(self.solder_land.aperture,
+                self.solder_land, self.solder_mask, True))
+        return t
  
 class Geda_SMTPad(fc.SMTPad):
     def rendering(self, pin_spec, warning_callback):
-        if not self.mask.is_derived:
-            # FIXME: Need to handle ganged mask.
-            # 1. Collect pads in the gang.
-            # 2. Analyze geometry of pads in the gang
-            # 3. Create mask control pads define the gang aperture
-            # 4. Render the regular pads also.
-            raise fc.CanNotRenderError('Can only render derived masks for SMTPad.')
+        yield _templates(self, self._template).line(pin_spec)
+    def _template(self):
+        mask = self.mask
+        if isinstance(mask, fc.GangMask):
+            # PCB has no free-standing mask, so each pad opens its share
+            # of the gang: the pad bloated by the gang bloat.  The union
+            # of those openings is the gang.
+            mask = Geda_DerivedMask(self.land, mask.bloat)
+        elif not mask.is_derived:
+            raise fc.CanNotRenderError('Can only render derived or gang masks for SMTPad.')
         if not self.land.is_simple_pad:
             raise fc.CanNotRenderError('Can only render simple SMTPad.')
-        yield self.land.aperture.format_pad(
-            pin_spec, self.land, self.mask)
+        return GedaPadTemplate(self.land.aperture, self.land, mask)
 
 class Geda_ThermalPolygon(fc.ThermalPolygon):
     def rendering(self, pin_spec, warning_callback):
@@ -286,7 +362,12 @@ class Geda_SilkArc(fc.SilkArc):
         # RS-274X does not support an eliptical arc pcb's gerber back-end
         # renders eliptical arcs as a line segment approximation.
         # So... let's simply not do eliptical arcs at all.
-        yield '# <silk arc>' # FIXME
+        # pcb measures angles from the -X axis, and flips Y, so the
+        # landmaker angle convention maps by a half turn.
+        start = (self.start + 180.0) % 360.0
+        yield 'ElementArc[{0:d} {1:d} {2:d} {2:d} {3:g} {4:g} {5:d}]'.format(
+            self.loc.x.gu, -self.loc.y.gu, self.radius.gu,
+            start, self.arc, self.pen_width.gu)
 
 
 class Geda_KeepOutRect(fc.KeepOutRect):
@@ -313,6 +394,50 @@ class Geda_KeepOutRect(fc.KeepOutRect):
             for ln in silk.rendering(warning_callback):
                 yield ln
 
+# Opt-in parallel rendering.
+# With render_jobs > 1, footprints of at least parallel_threshold pins
+# and silk elements are rendered in chunks by a pool of worker processes.
+# Workers are forked after the primitive list is published in
+# _chunk_source, so only (start,end) spans and the resulting lines
+# cross process boundaries.  See benchmarks/bench_parallel.py for how
+# parallel_threshold was chosen.
+render_jobs = 1
+parallel_threshold = 20000
+chunk_size = 2000
+
+_chunk_source = None
+
+def _render_chunk(span):
+    "Worker: render _chunk_source[start:end], return (lines, warnings)."
+    start, end, indent = span
+    lines = []
+    warnings = []
+    for prim in _chunk_source[start:end]:
+        for ln in prim.rendering(warnings.append):
+            lines.append(indent + ln)
+    return lines, warnings
+
+def chunked_rendering(prims, warning_callback, jobs, indent=''):
+    "Render prims in a pool of jobs worker processes, keeping their order."
+    global _chunk_source
+    spans = [(i, min(i + chunk_size, len(prims)), indent)
+             for i in xrange(0, len(prims), chunk_size)]
+    _chunk_source = prims
+    try:
+        pool = mp.Pool(jobs)
+        try:
+            results = pool.map(_render_chunk, spans)
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        _chunk_source = None
+    for lines, warnings in results:
+        for msg in warnings:
+            warning_callback(msg)
+        for ln in lines:
+            yield ln
+
 # Define footprint-level gEDA renderer.
 class Geda_Footprint(object):
     # Standard Apertures, gEDA/PCB supports mostly.
@@ -335,6 +460,7 @@ class Geda_Footprint(object):
     drawnMask = Geda_DrawnMask
     derivedMask = Geda_DerivedMask
     noMask = Geda_NoMask
+    gangMask = Geda_GangMask
     # Plated holes
     platedDrill = Geda_PlatedDrill
     platedSlot = Geda_PlatedSlot
@@ -354,13 +480,20 @@ class Geda_Footprint(object):
     keepOutRect = Geda_KeepOutRect
     _indent = '    '
     def rendering(self, warning_callback):
+        # Geometries check their cached templates once per rendering.
+        global _renderPass
+        _renderPass += 1
         # Construct the Element[...] line.
         sflags = ''
-        # Initial placement location -- 10 mils from corner for now.
-        # FIXME: Compute based on extents.
-        markX = 1000
-        markY = 1000
-        # Construct refdes parameters.
+        # Initial placement location -- everything 10 mils from the corner.
+        box = self.bbox()
+        if box:
+            markX = 1000 - _gu(box[0])
+            markY = 1000 + _gu(box[3])
+        else:
+            markX = 1000
+            markY = 1000
+        # Construct refdes parameters.  pcb's y grows down, as for pins.
         # refdes scaling in gEDA is % of default size, which is 40 mils.
         # FIXME: Throw warnings on questionable values.
         textScale = int((self.refdes.size / fc.Dim.MIL(40)) * 100.0)
@@ -368,7 +501,7 @@ class Geda_Footprint(object):
         textRot = int((self.refdes.rot %360.0) / 90.0)
         yield 'Element["{sflags:s}" "" "" "" {markx:d} {marky:d} {refdesx:d} {refdesy:d} {trot:d} {tscale:d} "{tflags:s}"]'.format( \
             sflags=sflags, markx=markX, marky=markY,
-            refdesx=self.refdes.loc.x.gu, refdesy=self.refdes.loc.y.gu, \
+            refdesx=self.refdes.loc.x.gu, refdesy=-self.refdes.loc.y.gu, \
             trot=textRot, tscale=textScale, tflags=textFlags)
         yield '('
         # Render comments.
@@ -376,16 +509,24 @@ class Geda_Footprint(object):
             yield '# '.join([self._indent, self.desc])
         for ln in self.comments:
             yield '# '.join([self._indent, ln])
-        for pin in self.pins:
-            for ln in pin.rendering(warning_callback):
-                yield self._indent + ln
-        for art in self.silk:
-            for ln in art.rendering(warning_callback):
-                yield self._indent + ln
+        prims = self.pins + self.silk
+        if render_jobs > 1 and len(prims) >= parallel_threshold \
+          and hasattr(os, 'fork'):
+            for ln in chunked_rendering(prims, warning_callback,
+                                        render_jobs, self._indent):
+                yield ln
+        else:
+            for prim in prims:
+                for ln in prim.rendering(warning_callback):
+                    yield self._indent + ln
         # Render keep-outs
         for ko in self.keepOuts:
             for ln in ko.rendering(warning_callback):
                 yield self._indent + ln
+        # pcb has no courtyard layer, so list the outlines for tools.
+        for outline in self.courtyard:
+            yield self._indent + '# Courtyard ' + ' '.join(
+                ['{0:d},{1:d}'.format(p.x.gu, -p.y.gu) for p in outline])
         # All done!
         yield ')'
 
@@ -0,0 +1,319 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# RS-274X (extended Gerber) rendering back-end.
+#
+# Each footprint is plotted onto a set of layer images, one per
+# fabrication layer.  Every layer keeps an aperture table that interns
+# aperture definitions, so N pads of one shape produce one %ADD and N
+# flashes no matter how many PinGeometry instances describe that shape.
+
+import os
+import math as m
+# Import the plug-in core.
+import footprintcore as fc
+
+# (layer name, file extension) in output order.
+layer_files = [
+    ('topcopper',    'gtl'),
+    ('topmask',      'gts'),
+    ('toppaste',     'gtp'),
+    ('topsilk',      'gto'),
+    ('bottomcopper', 'gbl'),
+    ('bottommask',   'gbs'),
+    ('bottompaste',  'gbp'),
+    ('courtyard',    'gm1'),
+]
+courtyard_pen = 0.05 # mm
+
+def _mm(v):
+    "Format a millimeter value for an aperture definition."
+    return '{0:.6f}'.format(v)
+
+def coord(d):
+    "Dim() to RS-274X coordinate in format 4.6 mm, i.e.: nanometers."
+    return int(round(float(d) * 1000000.0))
+
+def xy(p):
+    return 'X{0:d}Y{1:d}'.format(coord(p.x), coord(p.y))
+
+class ApertureTable(object):
+    "Intern aperture definitions, assigning D codes from D10 upward."
+    first_dcode = 10
+    def __init__(self):
+        self._codes = {}
+        self._defs = []
+    def __len__(self):
+        return len(self._defs)
+    def dcode(self, definition):
+        "Return the D code for definition, adding it if not yet seen."
+        try:
+            return self._codes[definition]
+        except KeyError:
+            code = self.first_dcode + len(self._defs)
+            self._codes[definition] = code
+            self._defs.append(definition)
+            return code
+    def rendering(self):
+        for code, definition in enumerate(self._defs, self.first_dcode):
+            yield '%ADD{0:d}{1:s}*%'.format(code, definition)
+
+class GerberLayer(object):
+    "Image of one fabrication layer: an aperture table and a list of operations."
+    def __init__(self, name):
+        self.name = name
+        self.apertures = ApertureTable()
+        self._ops = [] # (dcode, [lines])
+        self._drawn = set() # serials of shared masks already plotted
+    def __len__(self):
+        return len(self._ops)
+    def first_time(self, serial):
+        "True the first time a shared primitive's serial is seen."
+        if serial in self._drawn:
+            return False
+        self._drawn.add(serial)
+        return True
+    def flash(self, definition, loc):
+        self._ops.append((self.apertures.dcode(definition),
+                          [xy(loc) + 'D03*']))
+    def stroke(self, definition, p1, p2):
+        self._ops.append((self.apertures.dcode(definition),
+                          [xy(p1) + 'D02*', xy(p2) + 'D01*']))
+    def arc(self, definition, center, radius, start_angle, arc_angle):
+        "Counter-clockwise arc, angles in degrees."
+        r = float(radius)
+        a0 = m.radians(start_angle)
+        a1 = m.radians(start_angle + arc_angle)
+        cx, cy = float(center.x), float(center.y)
+        sx, sy = cx + r*m.cos(a0), cy + r*m.sin(a0)
+        ex, ey = cx + r*m.cos(a1), cy + r*m.sin(a1)
+        self._ops.append((self.apertures.dcode(definition), [
+            'X{0:d}Y{1:d}D02*'.format(coord(sx), coord(sy)),
+            'G03X{0:d}Y{1:d}I{2:d}J{3:d}D01*'.format(
+                coord(ex), coord(ey), coord(cx-sx), coord(cy-sy)),
+            'G01*']))
+    def rendering(self):
+        yield 'G04 landmaker {0:s} layer*'.format(self.name)
+        yield '%FSLAX46Y46*%'
+        yield '%MOMM*%'
+        for ln in self.apertures.rendering():
+            yield ln
+        yield '%LPD*%'
+        yield 'G75*'
+        yield 'G01*'
+        current = None
+        for code, lines in self._ops:
+            if code != current:
+                yield 'D{0:d}*'.format(code)
+                current = code
+            for ln in lines:
+                yield ln
+        yield 'M02*'
+
+# Define primitive rendering for RS-274X.
+# Apertures know their own %ADD definition, optionally bloated
+# by a mask or paste relief given in millimeters.
+
+class Gerber_SACircle(fc.SACircle):
+    def gerber_definition(self, bloat=0.0):
+        return 'C,' + _mm(self.diameter.mm + 2.0*float(bloat))
+
+class GerberSARectangular(object):
+    def gerber_definition(self, bloat=0.0):
+        b = 2.0*float(bloat)
+        return ''.join([self.gerber_template, ',',
+            _mm(self.xsize.mm + b), 'X', _mm(self.ysize.mm + b)])
+
+class Gerber_SARectangle(fc.SARectangle, GerberSARectangular):
+    gerber_template = 'R'
+
+class Gerber_SAObround(fc.SAObround, GerberSARectangular):
+    gerber_template = 'O'
+
+class Gerber_SAPolygon(fc.SAPolygon):
+    def gerber_definition(self, bloat=0.0):
+        t = ['P,', _mm(self.diameter.mm + 2.0*float(bloat)),
+             'X', str(int(self.num_vertices))]
+        if self.rot:
+            t.extend(['X', '{0:g}'.format(self.rot)])
+        return ''.join(t)
+
+# Anything that can be flashed implements flash(layer, loc, bloat),
+# where loc is the pin location the primitive is relative to.
+
+class Gerber_Land(fc.Land):
+    def flash(self, layer, loc, bloat=0.0):
+        layer.flash(self.aperture.gerber_definition(bloat), loc + self.loc)
+
+class Gerber_DrawnMask(fc.DrawnMask):
+    def flash(self, layer, loc, bloat=0.0):
+        layer.flash(self.aperture.gerber_definition(bloat), loc + self.loc)
+
+class Gerber_DerivedMask(fc.DerivedMask):
+    def flash(self, layer, loc, bloat=0.0):
+        self.base.flash(layer, loc, float(self.bloat) + float(bloat))
+
+class Gerber_NoMask(fc.NoMask):
+    def flash(self, layer, loc, bloat=0.0):
+        pass
+
+class Gerber_GangMask(fc.GangMask):
+    def flash(self, layer, loc, bloat=0.0):
+        # Masks are in footprint coordinates and shared by every pad
+        # in the gang, so plot them once.
+        if layer.first_time(self.serial):
+            origin = fc.Pt.MM(0, 0)
+            for mk in self.masks:
+                mk.flash(layer, origin, bloat)
+
+class Gerber_DerivedPaste(fc.DerivedPaste):
+    def flash(self, layer, loc, bloat=0.0):
+        self.base.flash(layer, loc, float(self.bloat) + float(bloat))
+
+class Gerber_NoPaste(fc.NoPaste):
+    def flash(self, layer, loc, bloat=0.0):
+        pass
+
+class Gerber_ThruPin(fc.ThruPin):
+    def plot(self, layers, pin_spec, warning_callback):
+        loc = pin_spec.loc
+        self.comp_land.flash(layers['topcopper'], loc)
+        self.solder_land.flash(layers['bottomcopper'], loc)
+        self.comp_mask.flash(layers['topmask'], loc)
+        self.solder_mask.flash(layers['bottommask'], loc)
+
+class Gerber_SMTPad(fc.SMTPad):
+    def plot(self, layers, pin_spec, warning_callback):
+        side = 'bottom' if self.onback else 'top'
+        loc = pin_spec.loc
+        self.land.flash(layers[side + 'copper'], loc)
+        self.mask.flash(layers[side + 'mask'], loc)
+        self.paste.flash(layers[side + 'paste'], loc)
+
+class Gerber_ThermalPolygon(fc.ThermalPolygon):
+    def plot(self, layers, pin_spec, warning_callback):
+        loc = pin_spec.loc
+        self.land.flash(layers['topcopper'], loc)
+        if self.back_land is not None:
+            self.back_land.flash(layers['bottomcopper'], loc)
+        for mk in self.masks:
+            mk.flash(layers['topmask'], loc)
+        for p in self.pastes:
+            p.flash(layers['toppaste'], loc)
+        # Same via land as the gEDA back-end.
+        for h in self.holes:
+            paddia = (h.diameter + fc.Dim.MIL(20)).mm
+            layers['bottomcopper'].flash('C,' + _mm(paddia), loc + h.offset)
+
+class Gerber_PinSpec(fc.PinSpec):
+    def plot(self, layers, warning_callback):
+        self.geo.plot(layers, self, warning_callback)
+
+class Gerber_SilkText(fc.SilkText):
+    def plot(self, layers, warning_callback):
+        warning_callback('SilkText not rendered to RS-274X: ' + self.text)
+
+class Gerber_SilkLine(fc.SilkLine):
+    def plot(self, layers, warning_callback):
+        layers['topsilk'].stroke('C,' + _mm(self.pen_width.mm),
+                                 self.loc, self.p2)
+
+class Gerber_SilkArc(fc.SilkArc):
+    def plot(self, layers, warning_callback):
+        layers['topsilk'].arc('C,' + _mm(self.pen_width.mm),
+                              self.loc, self.radius, self.start, self.arc)
+
+# Define footprint-level RS-274X renderer.
+class Gerber_Footprint(object):
+    # Standard Apertures
+    saCircle = Gerber_SACircle
+    saRectangle = Gerber_SARectangle
+    saObround = Gerber_SAObround
+    saPolygon = Gerber_SAPolygon
+    # Aperture Macros, not yet plotted.
+    mpComment = fc.MPComment
+    mpCircle = fc.MPCircle
+    mpVectorLine = fc.MPVectorLine
+    mpCenterLine = fc.MPCenterLine
+    mpLowerLeftLine = fc.MPLowerLeftLine
+    mpOutline = fc.MPOutline
+    mpPolygon = fc.MPPolygon
+    mpMoire = fc.MPMoire
+    mpThermal = fc.MPThermal
+    apertureMacro = fc.ApertureMacro
+    # Masks
+    drawnMask = Gerber_DrawnMask
+    derivedMask = Gerber_DerivedMask
+    noMask = Gerber_NoMask
+    gangMask = Gerber_GangMask
+    # Plated holes
+    platedDrill = fc.PlatedDrill
+    platedSlot = fc.PlatedSlot
+    # Paste
+    drawnPaste = fc.DrawnPaste
+    derivedPaste = Gerber_DerivedPaste
+    noPaste = Gerber_NoPaste
+    # Landmaker primitives
+    land = Gerber_Land
+    thruPin = Gerber_ThruPin
+    smtPad = Gerber_SMTPad
+    thermalPolygon = Gerber_ThermalPolygon
+    pinSpec = Gerber_PinSpec
+    silkText = Gerber_SilkText
+    silkLine = Gerber_SilkLine
+    silkArc = Gerber_SilkArc
+    keepOutRect = fc.KeepOutRect
+    def plot(self, warning_callback):
+        "Return dictionary of GerberLayer() instances keyed by layer name."
+        # Keep-outs and refdes are not fabrication artwork, so they are
+        # not plotted.  Drill files are not produced here.
+        layers = dict([(name, GerberLayer(name)) for name, ext in layer_files])
+        for pin in self.pins:
+            pin.plot(layers, warning_callback)
+        for art in self.silk:
+            art.plot(layers, warning_callback)
+        pen = 'C,' + _mm(courtyard_pen)
+        for outline in self.courtyard:
+            for p1, p2 in zip(outline, outline[1:] + outline[:1]):
+                layers['courtyard'].stroke(pen, p1, p2)
+        return layers
+    def rendering(self, warning_callback):
+        # All layers in one stream, for a quick view.
+        layers = self.plot(warning_callback)
+        for name, ext in layer_files:
+            if len(layers[name]):
+                for ln in layers[name].rendering():
+                    yield ln
+    def layer_files(self, filename, warning_callback):
+        "Return list of (filename, line generator), one per non-empty layer."
+        base = os.path.splitext(filename)[0]
+        layers = self.plot(warning_callback)
+        return [('.'.join([base, ext]), layers[name].rendering())
+                for name, ext in layer_files if len(layers[name])]
+
+# Define the rendering plug-ins for RS-274X.
+# example: Gerber_FP_so
+
+foundPlugins = fc.reconnoiterPlugins()
+fc.importPlugins(foundPlugins, globals(), locals())
+
+fc.deriveRenderingClasses(foundPlugins, 'Gerber', Gerber_Footprint, globals())
+fp_plugins = fc.collectPlugins(globals())
+
+if __name__ == '__main__':
+    pass
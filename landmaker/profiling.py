@@ -0,0 +1,105 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Wall and CPU time per phase of each fp command, for --profile and
+# the profile command.  A Profiler() is a footprintcore.hooks sink: an
+# 'fp' event starts a footprint, and spans named for phases time it.
+# Time in a phase nested in another is charged to the inner phase only.
+
+import time
+
+# Phases of an fp command, in pipeline order.
+phases = ['params', 'geometry', 'courtyard', 'render', 'write']
+
+def _now():
+    # time.clock() is process CPU time on Unix.
+    return time.time(), time.clock()
+
+class Profiler(object):
+    "Time per phase of each footprint."
+    def __init__(self):
+        self.footprints = [] # (name, plugin, {phase: [wall, cpu]})
+        self._current = None
+        self._stack = []
+        self._mark = _now()
+    def emit(self, record):
+        kind, name = record['kind'], record['name']
+        if kind == 'event' and name == 'fp':
+            self.footprint(record['footprint'], record['plugin'])
+        elif name in phases:
+            if kind == 'begin':
+                self.begin(name)
+            elif kind == 'end':
+                self.end()
+    def footprint(self, name, plugin):
+        self._current = (name, plugin, {})
+        self.footprints.append(self._current)
+    def begin(self, name):
+        self._charge()
+        self._stack.append(name)
+    def end(self):
+        self._charge()
+        if self._stack: # Else begun before this profiler was added.
+            self._stack.pop()
+    def _charge(self):
+        # Charge the time since the last mark to the innermost phase.
+        now = _now()
+        if self._stack and self._current is not None:
+            t = self._current[2].setdefault(self._stack[-1], [0.0, 0.0])
+            t[0] += now[0] - self._mark[0]
+            t[1] += now[1] - self._mark[1]
+        self._mark = now
+    def report(self, slowest=10):
+        "Lines of a report by plugin, and of the slowest footprints."
+        if not self.footprints:
+            yield 'No footprints profiled.'
+            return
+        cols = ' '.join(['{0:>9s}'.format(p) for p in phases])
+        yield 'Wall seconds by plugin:'
+        yield '{0:<14s} {1:>5s} {2:s} {3:>9s} {4:>9s}'.format(
+            'plugin', 'count', cols, 'total', 'cpu')
+        byPlugin = {}
+        for name, plugin, times in self.footprints:
+            byPlugin.setdefault(plugin, []).append(times)
+        for plugin in sorted(byPlugin):
+            yield self._row('{0:<14s} {1:5d}'.format(
+                plugin, len(byPlugin[plugin])), self._sum(byPlugin[plugin]))
+        yield self._row('{0:<14s} {1:5d}'.format('all', len(self.footprints)),
+            self._sum([times for name, plugin, times in self.footprints]))
+        yield 'Slowest footprints:'
+        yield '{0:<20s} {1:<14s} {2:s} {3:>9s} {4:>9s}'.format(
+            'footprint', 'plugin', cols, 'total', 'cpu')
+        ranked = sorted(self.footprints, key=lambda t: -self._total(t[2])[0])
+        for name, plugin, times in ranked[:slowest]:
+            yield self._row('{0:<20s} {1:<14s}'.format(name, plugin), times)
+    def _total(self, times):
+        return (sum([t[0] for t in times.values()]),
+                sum([t[1] for t in times.values()]))
+    def _sum(self, timesList):
+        out = {}
+        for times in timesList:
+            for p, (wall, cpu) in times.items():
+                t = out.setdefault(p, [0.0, 0.0])
+                t[0] += wall
+                t[1] += cpu
+        return out
+    def _row(self, head, times):
+        wall, cpu = self._total(times)
+        return ' '.join([head] + ['{0:9.4f}'.format(times.get(p, [0.0])[0])
+            for p in phases] + ['{0:9.4f}'.format(wall),
+                                '{0:9.4f}'.format(cpu)])
@@ -0,0 +1,284 @@
+#   Copyright 2014 David B. Curtis
+
+#   This file is part of landmaker.
+#
+#   landmaker is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   landmaker is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with landmaker.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Rule sets and drill racks from data files.
+#
+# JSON:
+#   {"rulesets": {"reflow": {"from": "default", "minspace": "6 mil"}},
+#    "drillracks": {"fab": {"from": "default", "drills": ["0.8 mm", "#60"],
+#                           "machscrew4": "0.116 inch"}}}
+# INI:
+#   [ruleset reflow]
+#   from = default
+#   minspace = 6 mil
+#   [drillrack fab]
+#   drills = 0.8 mm, #60
+#   machscrew4 = 0.116 inch
+#
+# A rule set takes rules it does not set from its 'from' set.  A drill
+# rack starts as a copy of its 'from' rack; keys other than 'from' and
+# 'drills' are symbolic drills.  Drills without units are inches, as
+# for the drill command.  A rule value using operators over rules only,
+# such as "mindrill + 2*annulus_hs", is a rule expression; other text,
+# such as "GPL-3", stays text.  One that also names an unknown rule,
+# such as "mindril + 2*annulus_hs", raises RuleFileError.
+#
+# Parsed files are pickled in cache_dir and reused until the file
+# changes.  Other state, such as that left by the rc file, can be
+# cached the same way with save_state() and load_state().
+
+import os
+import re
+import json
+import hashlib
+import cPickle as pickle
+import ConfigParser
+import footprintcore as fc
+
+class RuleFileError(Exception):
+    # Error message will be in args[0].
+    pass
+
+# None: ~/.landmaker/cache, if ~/.landmaker exists.  '': no cache.
+cache_dir = None
+_CACHE_FORMAT = 5
+
+def cache_file(key):
+    "Path of the cache file for key, or None when not caching."
+    d = cache_dir
+    if d is None:
+        home = os.path.expanduser('~/.landmaker')
+        if not os.path.isdir(home):
+            return None
+        d = os.path.join(home, 'cache')
+    if not d:
+        return None
+    if not os.path.isdir(d):
+        os.makedirs(d)
+    return os.path.join(d, hashlib.sha1(key).hexdigest() + '.pickle')
+
+def _digest(filename):
+    with open(filename, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def stamp(filename):
+    """(path, mtime, size, SHA-1) of a file, to tell later if it changed.
+    A missing file is stamped (path, None, None, None): it must stay
+    missing."""
+    if not os.path.exists(filename):
+        return (os.path.abspath(filename), None, None, None)
+    st = os.stat(filename)
+    return (os.path.abspath(filename), st.st_mtime, st.st_size,
+            _digest(filename))
+
+def unchanged(stamps):
+    """True if no stamped file changed.  Files with the same mtime and
+    size are taken as unchanged; others are hashed."""
+    for path, mtime, size, digest in stamps:
+        if digest is None:
+            if os.path.exists(path):
+                return False
+            continue
+        try:
+            st = os.stat(path)
+            if (st.st_mtime, st.st_size) == (mtime, size):
+                continue
+            if st.st_size == size and _digest(path) == digest:
+                continue # Touched, not changed.
+        except (IOError, OSError):
+            pass
+        return False
+    return True
+
+def save_state(key, state, sources):
+    "Cache state under key, valid while none of the files sources change."
+    fn = cache_file(key)
+    if not fn:
+        return
+    try:
+        blob = {'format': _CACHE_FORMAT, 'state': state,
+                'sources': [stamp(src) for src in sources]}
+        with open(fn + '.tmp', 'wb') as f:
+            pickle.dump(blob, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(fn + '.tmp', fn)
+    except (IOError, OSError):
+        pass # Caching is only an optimization.
+
+def load_state(key):
+    "State cached under key, or None if there is none or a source changed."
+    fn = cache_file(key)
+    if not fn or not os.path.isfile(fn):
+        return None
+    try:
+        with open(fn, 'rb') as f:
+            blob = pickle.load(f)
+    except Exception:
+        return None # Unreadable cache, so start over.
+    if blob.get('format') != _CACHE_FORMAT or not unchanged(blob['sources']):
+        return None
+    return blob['state']
+
+def _text(v):
+    return v.encode('utf-8') if isinstance(v, unicode) else str(v)
+
+def _rule_value(name, v):
+    # Text that may be an expression stays text until install() knows
+    # which rules there are.
+    v = _text(v).strip()
+    if re.match(r'[0-9.]', v):
+        try:
+            return fc.Dim.from_str(v)
+        except ValueError:
+            try:
+                expr = fc.RuleExpr(v)
+            except ValueError:
+                expr = None
+            if not (expr and (expr.operators or expr.names)):
+                raise RuleFileError(name +
+                                    ': expected a dimension with units.')
+    return v
+
+def _drill(v):
+    try:
+        return fc.Dim.from_str(_text(v), 'inch')
+    except ValueError:
+        raise RuleFileError(_text(v) + ' is not a drill size.')
+
+def _sections(filename, text):
+    "(kind, name, {key: value}) for each section of a rule file."
+    if filename.endswith('.json'):
+        try:
+            doc = json.loads(text)
+        except ValueError as e:
+            raise RuleFileError(filename + ': ' + str(e))
+        for kind, key in [('ruleset', 'rulesets'), ('drillrack', 'drillracks')]:
+            for name, body in sorted(doc.get(key, {}).items()):
+                yield kind, _text(name), dict(body)
+    else:
+        cp = ConfigParser.RawConfigParser()
+        cp.optionxform = str # Rule names are case sensitive.
+        try:
+            cp.readfp(_Lines(text), filename)
+        except ConfigParser.Error as e:
+            raise RuleFileError(str(e))
+        for section in cp.sections():
+            t = section.split()
+            if len(t) != 2 or t[0] not in ('ruleset', 'drillrack'):
+                raise RuleFileError(section.join(["Unknown section '", "'."]))
+            yield t[0], t[1], dict(cp.items(section))
+
+class _Lines(object):
+    # ConfigParser reads a file object by readline().
+    def __init__(self, text):
+        self._lines = iter(text.splitlines(True))
+    def readline(self):
+        return next(self._lines, '')
+
+def parse(filename, text):
+    """Compile the text of a rule file to a list of entries:
+    ('ruleset', name, parent, rules) or
+    ('drillrack', name, from, drills, symbolic)."""
+    entries = []
+    for kind, name, body in _sections(filename, text):
+        base = body.pop('from', None)
+        base = None if base is None else _text(base)
+        if kind == 'ruleset':
+            rules = dict([(_text(k), _rule_value(_text(k), v))
+                          for k, v in body.items()])
+            entries.append((kind, name, base, rules))
+        else:
+            drills = body.pop('drills', [])
+            if isinstance(drills, basestring):
+                drills = [d for d in re.split(r'\s*,\s*', drills.strip()) if d]
+            symbolic = dict([(_text(k), _drill(v)) for k, v in body.items()])
+            entries.append((kind, name, base, [_drill(d) for d in drills],
+                            symbolic))
+    return entries
+
+def load(filename):
+    "Entries of a rule file, from the cache when the file is unchanged."
+    key = 'rules:' + os.path.abspath(filename)
+    entries = load_state(key)
+    if entries is None:
+        try:
+            with open(filename) as f:
+                text = f.read()
+        except (IOError, OSError) as e:
+            raise RuleFileError(str(e))
+        entries = parse(filename, text)
+        save_state(key, entries, [filename])
+    return entries
+
+def install(entries, ruleSets, drillRacks,
+            rulesClass=fc.RulesDictionary, rackClass=fc.DrillRack):
+    """Define the rule sets and drill racks of entries in ruleSets and
+    drillRacks.  Existing sets and racks are updated in place."""
+    for entry in entries:
+        if entry[0] != 'ruleset':
+            continue
+        kind, name, base, rules = entry
+        try:
+            rs = ruleSets[name]
+        except KeyError:
+            rs = ruleSets[name] = rulesClass()
+        if base is not None:
+            try:
+                parent = ruleSets[base]
+            except KeyError:
+                raise RuleFileError(base.join(["Rule set '", "' not found."]))
+            p = parent
+            while p is not None:
+                if p is rs:
+                    raise RuleFileError(name + ' would inherit from itself.')
+                p = p.parent
+            rs.parent = parent
+        # Text naming only rules, with an operator, is an expression.
+        known = set(rs.snapshot().keys()).union(rules)
+        # Text that reads as one but names an unknown rule is an error.
+        values = []
+        for rule, value in sorted(rules.items()):
+            if isinstance(value, str):
+                expr = fc.RuleExpr.maybe(value, known)
+                if expr is not None:
+                    value = expr
+                else:
+                    msg = fc.RuleExpr.unknown(value, known)
+                    if msg:
+                        raise RuleFileError(rule + ': ' + msg)
+            values.append((rule, value))
+        rs.update(values)
+    for entry in entries:
+        if entry[0] != 'drillrack':
+            continue
+        kind, name, base, drills, symbolic = entry
+        if base is not None:
+            try:
+                src = drillRacks[base]
+            except KeyError:
+                raise RuleFileError(base.join(["Drill rack '", "' not found."]))
+        try:
+            rk = drillRacks[name]
+        except KeyError:
+            rk = drillRacks[name] = rackClass()
+        if base is not None:
+            rk.add_drills(src.drills())
+            for sym, size in src.symbolics().items():
+                rk.add_symbolic(sym, size)
+        rk.add_drills(drills)
+        for sym, size in symbolic.items():
+            rk.add_symbolic(sym, size)
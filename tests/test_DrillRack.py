@@ -0,0 +1,80 @@
+from landmaker.footprintcore import Dim, DrillRack, NoRack
+import unittest as ut
+
+class TestDrillRack(ut.TestCase):
+    def setUp(self):
+        self.rack = DrillRack([Dim.MIL(35), Dim.MIL(20), Dim.MIL(25)],
+                              {'screw':Dim.MIL(30)})
+
+    def test_00sorted(self):
+        self.assertEqual(self.rack.drills(),
+                         [Dim.MIL(20), Dim.MIL(25), Dim.MIL(35)])
+
+    def test_01lookup(self):
+        self.assertEqual(self.rack[Dim.MIL(20)], Dim.MIL(20))
+        self.assertEqual(self.rack[Dim.MIL(21)], Dim.MIL(25))
+        self.assertEqual(self.rack[Dim.MIL(1)], Dim.MIL(20))
+        # Too large for the rack: the requested size comes back.
+        self.assertEqual(self.rack[Dim.MIL(40)], Dim.MIL(40))
+        self.assertEqual(self.rack['screw'], Dim.MIL(35))
+        self.assertEqual(self.rack['#71'], Dim.MIL(35))
+        self.assertRaises(ValueError, self.rack.__getitem__, 'bolt')
+        self.assertRaises(ValueError, self.rack.__getitem__, '#99')
+
+    def test_02add(self):
+        self.rack.add_drill(Dim.MIL(25))
+        self.rack.add_drill(Dim.MM(0.762))
+        self.assertEqual(len(self.rack.drills()), 4)
+        self.assertEqual(self.rack[Dim.MIL(26)], Dim.MIL(30))
+        self.rack.add_drills([Dim.MIL(50), Dim.MIL(10), Dim.MIL(50),
+                              Dim.MIL(20)])
+        self.assertEqual([float(d) for d in self.rack.drills()],
+            sorted([float(Dim.MIL(v)) for v in [10, 20, 25, 30, 35, 50]]))
+
+    def test_03fit_many(self):
+        sizes = [Dim.MIL(v) for v in [21, 40, 20, 21]] + ['screw']
+        self.assertEqual(self.rack.fit_many(sizes),
+                         [self.rack[v] for v in sizes])
+        self.assertEqual(self.rack.fit_many([]), [])
+
+    def test_04norack(self):
+        rack = NoRack()
+        self.assertEqual(rack.fit_many([Dim.MIL(21)]), [Dim.MIL(21)])
+
+    def test_05optimal(self):
+        reqs = [(Dim.MM(v), tol) for v, tol in
+                [(0.5, 0.1), (0.58, 0.1), (0.55, 0.1), (0.8, 0.0),
+                 (0.9, 0.1), (0.55, 0.1)]]
+        mm = lambda rack: [round(d.mm, 6) for d in rack.drills()]
+        self.assertEqual(mm(DrillRack.optimal(reqs)), [0.58, 0.8, 0.9])
+        # A spare drill goes where it saves the most oversize: two
+        # holes at 0.55 outweigh one at 0.5.
+        self.assertEqual(mm(DrillRack.optimal(reqs, 4)),
+                         [0.55, 0.58, 0.8, 0.9])
+        self.assertEqual(mm(DrillRack.optimal(reqs, 9)),
+                         [0.5, 0.55, 0.58, 0.8, 0.9])
+        self.assertRaises(ValueError, DrillRack.optimal, reqs, 2)
+        # Every request fits its next larger drill.
+        rack = DrillRack.optimal(reqs)
+        for drill, tol in reqs:
+            self.assertTrue(0 <= rack[drill].mm - drill.mm <= tol + 1e-9)
+        self.assertEqual(DrillRack.optimal([]).drills(), [])
+
+    def test_06numbers(self):
+        self.assertEqual(DrillRack.nearest_number(Dim.INCH(0.04)), '#60')
+        self.assertEqual(DrillRack.number_above(Dim.INCH(0.04)), '#60')
+        self.assertEqual(DrillRack.nearest_number(Dim.MM(0.8)), '#68')
+        self.assertEqual(DrillRack.number_above(Dim.MM(0.8)), '#67')
+        self.assertEqual(DrillRack.nearest_number(Dim.MM(1)), '#61')
+        self.assertEqual(DrillRack.nearest_number(Dim.MM(0.1)), '#80')
+        self.assertEqual(DrillRack.nearest_number(Dim.INCH(0.5)), '#Z')
+        self.assertEqual(DrillRack.number_above(Dim.INCH(0.5)), None)
+        # Agrees with a scan of the whole table.
+        for mm in [0.3 + 0.05*i for i in xrange(200)]:
+            near = min(DrillRack.number.items(),
+                       key=lambda t: (abs(t[1].mm - mm), t[1].mm))
+            self.assertEqual(DrillRack.number[
+                DrillRack.nearest_number(Dim.MM(mm))].mm, near[1].mm)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,68 @@
+import random
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestRectUnion(ut.TestCase):
+    def test_00disjoint(self):
+        rects = [(0, 0, 1, 1), (2, 0, 3, 1)]
+        self.assertEqual(sorted(fc.rect_union(rects)), rects)
+
+    def test_01abutting_row(self):
+        # Pads at pitch 1.27, bloated to touch, merge to one rectangle.
+        rects = [(0, i*1.27 - 0.635, 1, i*1.27 + 0.635) for i in range(100)]
+        self.assertEqual(fc.rect_union(rects), [(0, -0.635, 1, 126.365)])
+
+    def test_02overlap(self):
+        u = fc.rect_union([(0, 0, 2, 2), (1, 1, 3, 3)])
+        self.assertAlmostEqual(sum([(x1-x0)*(y1-y0) for x0, y0, x1, y1 in u]), 7)
+
+    def test_03empty(self):
+        self.assertEqual(fc.rect_union([]), [])
+        self.assertEqual(fc.rect_union([(0, 0, 0, 1)]), [])
+
+    def test_04random_repeats(self):
+        # Repeated rectangles are counted in and out of the sweep.
+        rnd = random.Random(3)
+        rects = []
+        for i in range(60):
+            x, y = rnd.randint(0, 20), rnd.randint(0, 20)
+            rects.append((x, y, x + rnd.randint(1, 5), y + rnd.randint(1, 5)))
+        rects.extend(rects[:20])
+        u = fc.rect_union(rects)
+        inside = lambda rs, x, y: len([r for r in rs
+            if r[0] < x < r[2] and r[1] < y < r[3]])
+        for x in range(26):
+            for y in range(26):
+                self.assertEqual(inside(u, x + 0.5, y + 0.5),
+                                 min(1, inside(rects, x + 0.5, y + 0.5)))
+
+class TestGang(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def test_00so_rows(self):
+        fp = r.Geda_FP_so.from_kwargs('so', self.rules, self.rack,
+            warning_sink, pins=20, padlen=fc.Dim.MM(1.3),
+            padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27),
+            span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13), gang=None)
+        gang = fp.pins[0].geo.mask
+        self.assertTrue(isinstance(gang, fc.GangMask))
+        # One opening per pin row.
+        self.assertEqual(len(gang.masks), 2)
+        ap = gang.masks[0].aperture
+        self.assertAlmostEqual(ap.ysize.mm, 10 * 1.27)
+        self.assertAlmostEqual(ap.xsize.mm, 1.3 + 2 * 0.335)
+        # gEDA opens each pad by the gang bloat, so openings abut.
+        lines = list(fp.rendering(warning_sink))
+        self.assertTrue(
+            '    Pad[-21161 -22500 -18405 -22500 2362 1600 5000 "1" "1" ""]'
+            in lines)
+
+if __name__ == '__main__':
+    ut.main()
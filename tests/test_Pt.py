@@ -93,6 +93,11 @@ class TestPt(ut.TestCase):
     def test_19repr(self):
         self.assertTrue(repr(self.p1)=="Pt(Dim(1.0,'mm'),Dim(1.0,'mm'))")
 
+    def test_20array(self):
+        pts = fc.Pt.array([1.0, 2.0], [3.0, 4.0], 'mil')
+        self.assertTrue(pts[1] == fc.Pt.MM(2, 4))
+        self.assertEqual(pts[0].x.du, 'mil')
+
 
 if __name__ == '__main__':
     ut.main()
@@ -0,0 +1,97 @@
+import pickle
+import landmaker.footprintcore as fc
+import unittest as ut
+
+class TestRuleExpr(ut.TestCase):
+    def setUp(self):
+        self.rules = fc.RulesDictionary(parent=fc._defaultRules)
+        self.rules['annulus_hs'] = fc.Dim.MIL(20)
+        self.rules['pad_hs'] = fc.RuleExpr('mindrill + 2*annulus_hs')
+
+    def test_00compile(self):
+        e = fc.RuleExpr('max(minspace, 0.3mm) / 2  -  -1 mil')
+        self.assertEqual(e.names, set(['minspace']))
+        self.assertEqual(e.text, 'max(minspace, 0.3mm) / 2 - -1 mil')
+        v = e.evaluate({'minspace': fc.Dim.MIL(8)}.__getitem__)
+        self.assertAlmostEqual(v.mm, 0.15 + 0.0254)
+        for bad in ['', '2 +', 'foo(1)', '1 2', '(a', '3 $']:
+            self.assertRaises(ValueError, fc.RuleExpr, bad)
+        e = pickle.loads(pickle.dumps(e, pickle.HIGHEST_PROTOCOL))
+        self.assertEqual(e.evaluate({'minspace': fc.Dim.MM(1)}.__getitem__),
+                         fc.Dim.MM(0.5) + fc.Dim.MIL(1))
+
+    def test_01maybe(self):
+        snap = self.rules.snapshot()
+        self.assertEqual(fc.RuleExpr.maybe('8 mil', snap), None)
+        self.assertEqual(fc.RuleExpr.maybe('GPL', snap), None)
+        self.assertEqual(fc.RuleExpr.maybe('minspace', snap).names,
+                         set(['minspace']))
+        self.assertTrue(fc.RuleExpr.maybe('2*minspace', snap) is not None)
+        self.assertTrue(fc.RuleExpr.maybe('2 * 3 mm', snap) is not None)
+        # Text naming anything but rules stays text.
+        for text in ['GPL-3', 'CC-BY', 'a/b', '2*x']:
+            self.assertEqual(fc.RuleExpr.maybe(text, snap), None)
+
+    def test_01cunknown(self):
+        snap = self.rules.snapshot()
+        msg = fc.RuleExpr.unknown('mindril + 2*annulus_hs', snap)
+        self.assertEqual(msg, "Unknown rule 'mindril' (mindrill?) in "
+                              "'mindril + 2*annulus_hs'.")
+        self.assertTrue("'minspcae' (minspace?)" in
+                        fc.RuleExpr.unknown('2*minspcae', snap))
+        # Text, expressions and names alone are not suspect.
+        for text in ['GPL-3', 'CC-BY', 'a/b', '2*x', 'mindril', '2*minspace']:
+            self.assertEqual(fc.RuleExpr.unknown(text, snap), None)
+
+    def test_01btext(self):
+        self.rules['license'] = 'GPL-3'
+        self.rules['art'] = 'CC-BY'
+        self.assertEqual(self.rules.snapshot()['license'], 'GPL-3')
+        self.assertEqual(self.rules['art'], 'CC-BY')
+
+    def test_02evaluate(self):
+        self.assertEqual(self.rules['pad_hs'], fc.Dim.INCH(0.06))
+        self.rules['annulus_hs'] = fc.Dim.MIL(10)
+        self.assertEqual(self.rules['pad_hs'], fc.Dim.INCH(0.04))
+        # Inherited expressions read the inputs of the inheriting set.
+        child = fc.RulesDictionary(parent=self.rules)
+        child['mindrill'] = fc.Dim.INCH(0.03)
+        self.assertEqual(child['pad_hs'], fc.Dim.INCH(0.05))
+        over = child.snapshot().override({'annulus_hs': fc.Dim.MIL(5)})
+        self.assertEqual(over['pad_hs'], fc.Dim.INCH(0.04))
+
+    def test_03memo(self):
+        # Values carry over to later snapshots while their inputs hold.
+        snap = self.rules.snapshot()
+        v = snap['pad_hs']
+        self.rules['minsilk'] = fc.Dim.MIL(6)
+        self.assertTrue(self.rules.snapshot()['pad_hs'] is v)
+        self.rules['annulus_hs'] = fc.Dim.MIL(10)
+        self.assertEqual(self.rules.snapshot()['pad_hs'], fc.Dim.INCH(0.04))
+        self.assertEqual(snap['pad_hs'], fc.Dim.INCH(0.06))
+
+    def test_04errors(self):
+        self.rules['a'] = fc.RuleExpr('b + 1 mm')
+        self.rules['b'] = fc.RuleExpr('2*a')
+        try:
+            self.rules['a']
+            self.fail('No cycle found.')
+        except fc.RuleExprError as e:
+            self.assertTrue('a -> b -> a' in e.msg)
+        self.rules['c'] = fc.RuleExpr('minspace * minspace')
+        self.assertRaises(fc.RuleExprError, self.rules.__getitem__, 'c')
+        self.rules['d'] = fc.RuleExpr('nosuch + 1 mm')
+        self.assertRaises(fc.RuleNotFound, self.rules.__getitem__, 'd')
+
+    def test_05hash(self):
+        # Snapshots compare by the expressions, not their values.
+        other = fc.RulesDictionary(parent=fc._defaultRules)
+        other['annulus_hs'] = fc.Dim.MIL(20)
+        other['pad_hs'] = fc.Dim.INCH(0.06)
+        self.assertNotEqual(other.snapshot(), self.rules.snapshot())
+        other['pad_hs'] = fc.RuleExpr('mindrill  +  2*annulus_hs')
+        self.assertEqual(other.snapshot(), self.rules.snapshot())
+        self.assertEqual(hash(other.snapshot()), hash(self.rules.snapshot()))
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,82 @@
+import pickle
+import landmaker.footprintcore as fc
+import unittest as ut
+
+class TestRulesSnapshot(ut.TestCase):
+    def setUp(self):
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+
+    def test_00cached(self):
+        snap = self.rules.snapshot()
+        self.assertTrue(self.rules.snapshot() is snap)
+        self.assertEqual(snap.version, self.rules.version)
+        self.assertEqual(snap['minspace'], fc.Dim.MIL(8))
+        self.assertTrue('minsilk' in snap)
+        self.assertEqual(len(snap), len(self.rules))
+        self.assertRaises(fc.RuleNotFound, snap.__getitem__, 'nosuch')
+        self.assertEqual(snap.symb(fc.Dim.MM(1)), fc.Dim.MM(1))
+
+    def test_01versions(self):
+        snap = self.rules.snapshot()
+        version = self.rules.version
+        self.rules['minspace'] = fc.Dim.MIL(6)
+        self.assertTrue(self.rules.version > version)
+        changed = self.rules.snapshot()
+        self.assertTrue(changed is not snap)
+        self.assertNotEqual(changed, snap)
+        self.assertEqual(snap['minspace'], fc.Dim.MIL(8))
+        # Same rules again: new version, same content.
+        self.rules['minspace'] = fc.Dim.MIL(8)
+        again = self.rules.snapshot()
+        self.assertNotEqual(again.version, snap.version)
+        self.assertEqual(again, snap)
+        self.assertEqual(hash(again), hash(snap))
+        self.assertEqual(len(set([snap, changed, again])), 2)
+
+    def test_02readonly(self):
+        snap = self.rules.snapshot()
+        def assign():
+            snap['minspace'] = fc.Dim.MIL(6)
+        self.assertRaises(TypeError, assign)
+        self.assertRaises(TypeError, setattr, snap, 'version', 0)
+
+    def test_03pickle(self):
+        self.rules['copyright'] = 'Copyright 2014 David B. Curtis'
+        snap = self.rules.snapshot()
+        copy = pickle.loads(pickle.dumps(snap, 2))
+        self.assertEqual(copy, snap)
+        self.assertEqual(hash(copy), hash(snap))
+        self.assertEqual(copy.version, snap.version)
+
+    def test_04inherit(self):
+        reflow = fc.RulesDictionary(parent=self.rules)
+        reflow['minspace'] = fc.Dim.MIL(6)
+        self.assertEqual(reflow['minspace'], fc.Dim.MIL(6))
+        self.assertEqual(reflow['minsilk'], fc.Dim.MIL(10))
+        self.assertTrue('minsilk' in reflow)
+        self.assertFalse(reflow.own('minsilk'))
+        self.assertRaises(fc.RuleNotFound, reflow.__getitem__, 'nosuch')
+        snap = reflow.snapshot()
+        self.assertEqual(sorted(snap.keys()), sorted(self.rules.keys()))
+        # Changing the parent makes a new child snapshot.
+        self.rules['minsilk'] = fc.Dim.MIL(8)
+        self.assertTrue(reflow.snapshot() is not snap)
+        self.assertEqual(reflow.snapshot()['minsilk'], fc.Dim.MIL(8))
+
+    def test_05override(self):
+        base = self.rules.snapshot()
+        snap = base.override({'minspace': fc.Dim.MIL(6)})
+        self.assertEqual(snap['minspace'], fc.Dim.MIL(6))
+        self.assertEqual(snap['minsilk'], fc.Dim.MIL(10))
+        self.assertEqual(len(snap), len(base))
+        # Hashes follow content, however the rules are layered.
+        flat = fc.RulesDictionary(fc._defaultRules)
+        flat['minspace'] = fc.Dim.MIL(6)
+        self.assertEqual(hash(snap), hash(flat.snapshot()))
+        self.assertEqual(snap, flat.snapshot())
+        same = base.override({'minspace': fc.Dim.MIL(8)})
+        self.assertEqual(same, base)
+        self.assertEqual(hash(same), hash(base))
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,36 @@
+import landmaker.footprintcore as fc
+import math as m
+import unittest as ut
+
+class TestSilkArc(ut.TestCase):
+    def setUp(self):
+        self.arc = fc.SilkArc(fc.Pt.MM(1,2), fc.Dim.MM(2), 0, 90,
+                              fc.Dim.MIL(10))
+
+    def test_00offsets_endpoints(self):
+        pts = fc.arc_offsets(fc.Dim.MM(2), 0, 90, fc.Dim.MM(0.01))
+        self.assertAlmostEqual(pts[0][0], 2.0)
+        self.assertAlmostEqual(pts[0][1], 0.0)
+        self.assertAlmostEqual(pts[-1][0], 0.0)
+        self.assertAlmostEqual(pts[-1][1], 2.0)
+
+    def test_01tolerance(self):
+        tol = 0.01
+        pts = fc.arc_offsets(2.0, 30, 300, tol)
+        for (x1, y1), (x2, y2) in zip(pts[:-1], pts[1:]):
+            # Distance from center to chord midpoint.
+            mid = m.hypot((x1+x2)/2.0, (y1+y2)/2.0)
+            self.assertTrue(2.0 - mid <= tol)
+
+    def test_02cached(self):
+        a = fc.arc_offsets(fc.Dim.MM(2), 0, 90, fc.Dim.MM(0.01))
+        b = fc.arc_offsets(fc.Dim.MM(2), 0, 90, fc.Dim.MM(0.01))
+        self.assertTrue(a is b)
+
+    def test_03polyline(self):
+        p = self.arc.polyline(fc.Dim.MM(0.05))
+        self.assertTrue(p[0] == fc.Pt.MM(3,2))
+        self.assertTrue(p[-1].dist(fc.Pt.MM(1,4)) < 1e-9)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,80 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestBBox(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def bga(self, **kw):
+        return r.Geda_FP_bga.from_kwargs('bga', self.rules, self.rack,
+            warning_sink, rows=2, cols=3, pitch=fc.Dim.MM(1),
+            ball=fc.Dim.MM(0.5), **kw)
+
+    def assertBoxEqual(self, got, want):
+        for a, b in zip(got, want):
+            self.assertAlmostEqual(a, b)
+
+    def test_00layers(self):
+        fp = self.bga(body=[fc.Dim.MM(4), fc.Dim.MM(3)])
+        pen = self.rules['minsilk'].mm
+        mask = self.rules['maskrelief'].mm
+        self.assertBoxEqual(fp.bbox('copper'), (-1.25, -0.75, 1.25, 0.75))
+        self.assertBoxEqual(fp.bbox('mask'), (-1.25 - mask, -0.75 - mask,
+                                              1.25 + mask, 0.75 + mask))
+        self.assertBoxEqual(fp.bbox('silk'), (-2 - pen/2, -1.5 - pen/2,
+                                              2 + pen/2, 1.5 + pen/2))
+        self.assertEqual(fp.bbox('keepout'), None)
+        self.assertEqual(fp.bbox(), fp.bbox('silk'))
+        self.assertRaises(ValueError, fp.bbox, 'paste')
+
+    def test_01invalidate(self):
+        fp = self.bga(body=[fc.Dim.MM(4), fc.Dim.MM(3)])
+        self.assertTrue(fp.bbox('silk'))
+        fp.silk = []
+        self.assertEqual(fp.bbox('silk'), None)
+        self.assertEqual(fp.bbox(), fp.bbox('mask'))
+        fp.keepOuts = [fp.keepOutRect(fc.Pt.MM(-5, -5), fc.Pt.MM(5, 6))]
+        self.assertBoxEqual(fp.bbox(), (-5, -5, 5, 6))
+
+    def test_01bmutate(self):
+        # Lists and lands changed in place show in the next bbox.
+        fp = self.bga()
+        fp.pins.append(fp.pinSpec(fc.Pt.MM(0, 4), 7, fp.pins[0].geo))
+        self.assertBoxEqual(fp.bbox('copper'), (-1.25, -0.75, 1.25, 4.25))
+        fp.pins[0].geo.land.aperture.diameter = fc.Dim.MM(1)
+        self.assertBoxEqual(fp.bbox('copper'), (-1.5, -1, 1.5, 4.5))
+        fp.silk.append(fp.silkLine(fc.Pt.MM(-3, 0), fc.Pt.MM(-2, 0),
+                                   fc.Dim.MM(0.2)))
+        self.assertAlmostEqual(fp.bbox()[0], -3.1)
+
+    def test_02placement(self):
+        fp = self.bga(body=[fc.Dim.MM(4), fc.Dim.MM(3)])
+        top = fp.bbox()[3]
+        self.assertAlmostEqual(fp.refdes.loc.x.mm, 0.0)
+        self.assertAlmostEqual(fp.refdes.loc.y.mm,
+                               top + self.rules['refdessize'].mm)
+        # gEDA mark puts the upper left corner 10 mils in.
+        head = fp.rendering(warning_sink).next().split()
+        self.assertEqual(int(head[4]), 1000 - r._gu(fp.bbox()[0]))
+        self.assertEqual(int(head[5]), 1000 + r._gu(top))
+
+    def test_03refdes_above(self):
+        # An asymmetric part: pcb shows the refdes above the highest pin.
+        fp = self.bga()
+        for pin in fp.pins:
+            pin.loc = pin.loc + fc.Pt.MM(0, 5)
+        fp.place_refdes()
+        lines = list(fp.rendering(warning_sink))
+        refdesy = int(lines[0].split()[7])
+        pins = [int(ln.split()[1]) for ln in lines if 'Pad[' in ln]
+        self.assertTrue(refdesy < min(pins))
+        self.assertEqual(refdesy, -r._gu(fp.bbox()[3]) - 4000)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import tempfile
+import StringIO
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import landmaker.commandcore as cmd
+import landmaker.profiling as prof
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestCommands(ut.TestCase):
+    def setUp(self):
+        # Wired as bin/landmaker does.
+        fc.activateRenderer(r.Geda_Footprint)
+        cmd.hooks = fc.hooks
+        cmd.verbs['fp'].plugins = r.fp_plugins
+        cmd.verbs['ruleset'].rulesDictClass = fc.RulesDictionary
+        cmd.verbs['ruleset'].ruleSets = {'default':
+            fc.RulesDictionary({'annulus_hs': fc.Dim.MIL(20)},
+                               parent=fc._defaultRules)}
+        cmd.verbs['ruleset'].execute('default', warning_sink)
+        cmd.verbs['drillrack'].rackClass = fc.DrillRack
+        cmd.verbs['drillrack'].drillRacks = fc.drillRacks
+        cmd.verbs['drillrack'].execute('default', warning_sink)
+        cmd.dimClass = fc.Dim
+        cmd.ruleExprClass = fc.RuleExpr
+        cmd.FootprintException = fc.FootprintException
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def run_command(self, line):
+        out, sys.stdout = sys.stdout, StringIO.StringIO()
+        try:
+            cmd.dispatchCommand(line, warning_sink)
+            return sys.stdout.getvalue().splitlines()
+        finally:
+            sys.stdout = out
+
+    def test_00chart(self):
+        # Rows are labelled with the output file, not the name '.'.
+        batch = os.path.join(self.dir, 'batch.lm')
+        with open(batch, 'w') as f:
+            f.write('fp . header rows=2 cols=5 drill=0.04 dia=70 > hdr.fp\n')
+            f.write('fp . header rows=1 cols=3 drill=0.04 dia=70\n')
+        lines = self.run_command('drillrack chart ' + batch)
+        self.assertEqual(lines[1].split()[0:2], ['hdr.fp', '10'])
+        # Without a file, the plug-in and parameters.
+        self.assertTrue(lines[2].startswith('header rows=1 cols=3 '))
+        self.assertEqual(len(lines), 3)
+
+    def test_01profile(self):
+        # Rendering as bin/landmaker --fp does is timed in both phases.
+        p = prof.Profiler()
+        fc.hooks.add_sink(p)
+        try:
+            fc.hooks.event('fp', footprint='hdr', plugin='header')
+            fp = cmd.verbs['fp'].dispatchPlugin(
+                'hdr', 'header rows=1 cols=3 drill=0.04 dia=70', warning_sink)
+            out, sys.stdout = sys.stdout, StringIO.StringIO()
+            try:
+                cmd.verbs['fp'].render(fp, '', warning_sink)
+            finally:
+                sys.stdout = out
+        finally:
+            fc.hooks.remove_sink(p)
+        self.assertEqual(p.footprints[0][0:2], ('hdr', 'header'))
+        self.assertTrue(set(['geometry', 'render', 'write'])
+                        <= set(p.footprints[0][2]))
+
+    def test_02rule_typo(self):
+        # An expression naming an unknown rule is warned about.
+        warnings = []
+        cmd.dispatchCommand('rule pad = mindril + 2*annulus_hs',
+                            warnings.append)
+        self.assertEqual(warnings, ["pad: Unknown rule 'mindril' (mindrill?)"
+                                    " in 'mindril + 2*annulus_hs'."])
+        del warnings[:]
+        cmd.dispatchCommand('rule license = GPL-3', warnings.append)
+        cmd.dispatchCommand('rule pad = mindrill + 2*annulus_hs',
+                            warnings.append)
+        self.assertEqual(warnings, [])
+        self.assertTrue(isinstance(cmd.rules['pad'], fc.Dim))
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,105 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestRectOutline(ut.TestCase):
+    def test_00touching(self):
+        # Two rects sharing an edge make a single rectangle.
+        loops = fc.rect_outline([(0, 0, 1, 1), (1, 0, 3, 1)])
+        self.assertEqual(len(loops), 1)
+        self.assertEqual(sorted(loops[0]),
+                         [(0, 0), (0, 1), (3, 0), (3, 1)])
+        self.assertAlmostEqual(fc.polygon_area(loops[0]), 3.0)
+
+    def test_01ell(self):
+        loops = fc.rect_outline([(0, 0, 2, 1), (0, 0.5, 1, 2)])
+        self.assertEqual(len(loops), 1)
+        self.assertEqual(len(loops[0]), 6)
+        self.assertAlmostEqual(fc.polygon_area(loops[0]), 3.0)
+
+    def test_02hole(self):
+        ring = [(0, 0, 3, 1), (0, 2, 3, 3), (0, 0, 1, 3), (2, 0, 3, 3)]
+        areas = sorted([fc.polygon_area(l) for l in fc.rect_outline(ring)])
+        self.assertEqual(len(areas), 2)
+        self.assertAlmostEqual(areas[0], -1.0)
+        self.assertAlmostEqual(areas[1], 9.0)
+
+    def test_03closing(self):
+        # A 0.4 gap is bridged by a 0.25 closing, a 0.6 gap is not.
+        loops = fc.rect_outline(fc.rect_closing([(0, 0, 1, 1),
+                                                 (1.4, 0, 2.4, 1)], 0.25))
+        self.assertEqual(len(loops), 1)
+        self.assertAlmostEqual(fc.polygon_area(loops[0]), 2.4)
+        loops = fc.rect_outline(fc.rect_closing([(0, 0, 1, 1),
+                                                 (1.6, 0, 2.6, 1)], 0.25))
+        self.assertEqual(len(loops), 2)
+
+    def test_04hull(self):
+        # The notch of a U is filled, the steps of a staircase kept.
+        u = [(0, 0, 3, 1), (0, 0, 1, 3), (2, 0, 3, 3)]
+        loops = fc.rect_outline(fc.rect_hull(u))
+        self.assertEqual(len(loops), 1)
+        self.assertAlmostEqual(fc.polygon_area(loops[0]), 9.0)
+        stairs = [(0, 0, 3, 1), (0, 0, 2, 2), (0, 0, 1, 3)]
+        loops = fc.rect_outline(fc.rect_hull(stairs))
+        self.assertEqual(len(loops[0]), 8)
+        self.assertAlmostEqual(fc.polygon_area(loops[0]), 6.0)
+
+class TestCourtyard(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def test_00bga(self):
+        fp = r.Geda_FP_bga.from_kwargs('bga', self.rules, self.rack,
+            warning_sink, rows=4, cols=4, pitch=fc.Dim.MM(0.8),
+            ball=fc.Dim.MM(0.4))
+        fp.make_courtyard(self.rules['courtyard'])
+        # Balls merge into one outline, on grid, notched out to the A1 dot.
+        self.assertEqual(len(fp.courtyard), 1)
+        xs = [round(p.x.mm, 6) for p in fp.courtyard[0]]
+        ys = [round(p.y.mm, 6) for p in fp.courtyard[0]]
+        self.assertEqual(len(xs), 8)
+        self.assertEqual((min(xs), min(ys), max(xs), max(ys)),
+                         (-2.65, -1.65, 1.65, 2.65))
+        self.assertTrue((1.65, 1.65) in zip(xs, ys))
+
+    def test_01enclosed(self):
+        # Pads inside a silk frame do not get outlines of their own.
+        fp = r.Geda_FP_bga.from_kwargs('bga', self.rules, self.rack,
+            warning_sink, rows=2, cols=2, pitch=fc.Dim.MM(2),
+            ball=fc.Dim.MM(0.5), body=[fc.Dim.MM(6), fc.Dim.MM(6)])
+        fp.make_courtyard(self.rules['courtyard'])
+        self.assertEqual(len(fp.courtyard), 1)
+        self.assertEqual(len(fp.courtyard[0]), 4)
+        lines = list(fp.rendering(warning_sink))
+        self.assertEqual(len([ln for ln in lines if '# Courtyard' in ln]), 1)
+
+    def test_02one_outline(self):
+        # Pads apart from the body are joined, and the pocket between
+        # pins 1 and 2 under the body is filled.
+        rules = fc.RulesDictionary({'annulus_hs': fc.Dim.MIL(20)},
+                                   parent=self.rules)
+        for name, params in [('enc', "type='RE130F'"),
+                             ('usbconnmolex', "type='54819-0519'")]:
+            fp = r.fp_plugins[name].parse(name, params, rules.snapshot(),
+                                          self.rack, warning_sink)
+            fp.make_courtyard(self.rules['courtyard'])
+            self.assertEqual(len(fp.courtyard), 1)
+            loop = [(p.x.mm, p.y.mm) for p in fp.courtyard[0]]
+            for pin in fp.pins:
+                self.assertTrue(fc.point_in_polygon(
+                    (pin.loc.x.mm, pin.loc.y.mm), loop))
+            # Orthogonally convex: a vertical line crosses two edges.
+            xs = sorted(set([x for x, y in loop]))
+            edges = zip(loop, loop[1:] + loop[:1])
+            for xm in [(a + b) / 2.0 for a, b in zip(xs, xs[1:])]:
+                self.assertEqual(len([1 for (x0, y0), (x1, y1) in edges
+                                      if min(x0, x1) < xm < max(x0, x1)]), 2)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,191 @@
+import math as m
+import random
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestNearPairs(ut.TestCase):
+    def test_00box_gap(self):
+        self.assertEqual(fc.box_gap((0, 0, 1, 1), (0.5, 0.5, 2, 2)), 0.0)
+        self.assertAlmostEqual(fc.box_gap((0, 0, 1, 1), (4, 5, 6, 6)), 5.0)
+
+    def test_01matches_all_pairs(self):
+        rnd = random.Random(5)
+        boxes = []
+        for i in range(300):
+            x, y = rnd.uniform(0, 20), rnd.uniform(0, 20)
+            boxes.append((x, y, x + rnd.uniform(0.1, 2), y + rnd.uniform(0.1, 2)))
+        brute = set([(i, j) for i in range(len(boxes)) for j in range(i)
+                     if fc.box_gap(boxes[i], boxes[j]) < 0.3 - 1e-6])
+        self.assertEqual(set([(i, j) for i, j, gap in
+                              fc.near_pairs(boxes, 0.3)]), brute)
+        others = boxes[:50]
+        brute = set([(i, j) for i in range(len(boxes)) for j in range(50)
+                     if fc.box_gap(boxes[i], others[j]) < 0.3 - 1e-6])
+        self.assertEqual(set([(i, j) for i, j, gap in
+                              fc.near_pairs(boxes, 0.3, others)]), brute)
+
+class TestShapes(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+
+    def test_00land_shapes(self):
+        origin = fc.Pt.MM(1, 2)
+        clear = fc.Dim.MM(0.2)
+        land = fc.fpbase.land.circle(clear, fc.Dim.MM(1))
+        self.assertEqual(land.shape(origin), fc.Shape(1, 2, 0, 0, 0.5))
+        land = fc.fpbase.land.rectangle(clear, fc.Dim.MM(2), fc.Dim.MM(1))
+        self.assertEqual(land.shape(origin, 0.1), fc.Shape(1, 2, 1.1, 0.6, 0))
+        # Stretched solder side land of an obround pin is offset.
+        geo = fc.fpbase.thruPin.obround_solder(fc.Dim.MM(0.5), clear,
+            fc.Dim.MM(1), fc.Dim.MM(0.1), xstretch=fc.Dim.MM(0.6))
+        x, y, ax, ay, rad = geo.solder_land.shape(origin)
+        self.assertAlmostEqual(x, 1.3)
+        self.assertAlmostEqual(ax, 0.3)
+        self.assertEqual((y, ay, rad), (2, 0, 0.5))
+
+    def test_01distances(self):
+        circle = fc.Shape(0, 0, 0, 0, 1)
+        pairs = [
+            (circle, fc.Shape(3, 4, 0, 0, 1)),      # circles, 5 apart
+            (circle, fc.Shape(4, 4, 1, 1, 0)),      # box corner
+            (fc.Shape(0, 0, 1, 0, 0.5),             # capsules end to end
+             fc.Shape(3.5, 0, 1, 0, 0.5)),
+            (fc.Shape(0, 0, 1, 0, 0.5),             # crossed capsules
+             fc.Shape(0, 0, 0, 1, 0.5)),
+        ]
+        gaps, flags = fc.clearances([a for a, b in pairs],
+                                    [b for a, b in pairs], 1.0)
+        for gap, want in zip(gaps, [3.0, m.hypot(3, 3) - 1, 0.5, 0.0]):
+            self.assertAlmostEqual(gap, want)
+        self.assertEqual(flags, [False, False, True, True])
+
+class TestClipSilk(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.pen = fc.Dim.MM(0.2)
+
+    def line(self, x0, y0, x1, y1):
+        return fc.fpbase.silkLine(fc.Pt.MM(x0, y0), fc.Pt.MM(x1, y1), self.pen)
+
+    def ends(self, silk):
+        return [(ln.loc.x.mm, ln.loc.y.mm, ln.p2.x.mm, ln.p2.y.mm)
+                for ln in silk]
+
+    def test_00split_line(self):
+        box = fc.Shape(0, 0, 1, 1, 0)
+        silk = fc.clip_silk([self.line(-5, 0, 5, 0)], [box], 0.2)
+        for got, want in zip(self.ends(silk), [(-5, 0, -1.3, 0),
+                                               (1.3, 0, 5, 0)]):
+            for a, b in zip(got, want):
+                self.assertAlmostEqual(a, b, 5)
+        self.assertEqual(len(silk), 2)
+
+    def test_01untouched(self):
+        # Running along the clearance boundary is not a cut.
+        ln = self.line(-5, 1.3, 5, 1.3)
+        arc = fc.fpbase.silkArc(fc.Pt.MM(0, 3), fc.Dim.MM(1), 0, 360, self.pen)
+        box = fc.Shape(0, 0, 1, 1, 0)
+        silk = fc.clip_silk([ln, arc], [box], 0.2)
+        self.assertTrue(silk[0] is ln and silk[1] is arc)
+
+    def test_02slanted_and_arc(self):
+        circle = fc.Shape(0, 0, 0, 0, 0.5)
+        silk = fc.clip_silk([self.line(-3, -3, 3, 3)], [circle], 0.2)
+        self.assertEqual(len(silk), 2)
+        self.assertAlmostEqual(m.hypot(silk[0].p2.x.mm, silk[0].p2.y.mm), 0.8, 5)
+        # A cut arc leaves pieces of its chords.
+        arc = fc.fpbase.silkArc(fc.Pt.MM(0, 0), fc.Dim.MM(2), 0, 360, self.pen)
+        silk = fc.clip_silk([arc], [fc.Shape(2, 0, 0, 0, 0.5)], 0.2)
+        self.assertTrue(silk)
+        self.assertTrue(min([isinstance(ln, fc.SilkLine) for ln in silk]))
+        gaps = fc.shape_distances(fc._silk_shapes(silk[0]) +
+                                  fc._silk_shapes(silk[-1]),
+                                  [fc.Shape(2, 0, 0, 0, 0.5)] * 2)
+        self.assertTrue(min(gaps) > 0.2 - 1e-6)
+
+    def test_03footprint_near_pins(self):
+        # Only pins near the silk are looked at; the cuts are the same.
+        rules = fc.RulesDictionary(fc._defaultRules)
+        for gang in [{}, {'gang': None}]:
+            fp = r.Geda_FP_so.parse('so', 'pins=20 padlen=1.3mm '
+                'padwidth=.6mm pitch=1.27mm span=10.65mm pkglen=13mm '
+                'thermal=6,14 vias=2,4 viadrill=.015in thermalexp=4,10',
+                rules, fc.DrillRack(), warning_sink)
+            if gang:
+                fc.SMTPad.gang([p for p in fp.pins
+                                if isinstance(p.geo, fc.SMTPad)],
+                               fc.Dim.MM(0.1))
+            fp.silk = [self.line(-8, -6, 8, -6), self.line(-5.3, -8, -5.3, 8),
+                       self.line(0, -8, 0, 8)]
+            copper, openings = fp._features()
+            want = fc.clip_silk(fp.silk, [t[1] for t in copper + openings
+                                          if t[0] == 'top'], 0.2)
+            fp.clip_silk(fc.Dim.MM(0.2))
+            self.assertEqual(self.ends(fp.silk), self.ends(want))
+            self.assertTrue(len(want) > 3)
+
+class TestDrc(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def so(self, **kw):
+        return r.Geda_FP_so.from_kwargs('so', self.rules, self.rack,
+            warning_sink, pins=20, padlen=fc.Dim.MM(1.3),
+            span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13), **kw)
+
+    def test_00clean(self):
+        fp = self.so(padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27))
+        self.assertEqual(fp.drc(self.rules), [])
+
+    def test_01minspace(self):
+        fp = self.so(padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(0.75))
+        v = fp.drc(self.rules)
+        self.assertEqual(len(v), 18)
+        self.assertEqual(v[0].rule, 'minspace')
+        self.assertAlmostEqual(v[0].actual.mm, 0.15)
+
+    def test_02minmask(self):
+        self.rules['minmask'] = fc.Dim.MIL(4)
+        fp = self.so(padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(0.85))
+        self.assertEqual(set([v.rule for v in fp.drc(self.rules)]),
+                         set(['minmask']))
+        # A gang mask has no webs to check.
+        fp = self.so(padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(0.85),
+                     gang=None)
+        self.assertEqual(fp.drc(self.rules), [])
+
+    def test_03minannulus(self):
+        fp = r.Geda_FP_hole.from_kwargs('hole', self.rules, self.rack,
+            warning_sink, drill=fc.Dim.MM(1.0), pad=fc.Dim.MM(1.2))
+        v = fp.drc(self.rules)
+        self.assertEqual([x.rule for x in v], ['minannulus'])
+        self.assertAlmostEqual(v[0].actual.mm, 0.1)
+
+    def test_04exact_shapes(self):
+        # The A1 dot sits diagonally off the corner ball.
+        fp = r.Geda_FP_bga.from_kwargs('bga', self.rules, self.rack,
+            warning_sink, rows=4, cols=5, pitch=fc.Dim.MM(0.8),
+            ball=fc.Dim.MM(0.4))
+        self.assertEqual(fp.drc(self.rules), [])
+        # Staggered round lands are further apart than their extents.
+        fp = r.Geda_FP_usbconnmolex.parse('usb', "type='54819-0519'",
+            self.rules, self.rack, warning_sink)
+        self.assertEqual([v for v in fp.drc(self.rules)
+                          if v.rule == 'minspace'], [])
+
+    def test_05thermal_silk(self):
+        # Package outline crosses the exposed pad and gets clipped.
+        fp = r.Geda_FP_so.parse('so', 'pins=20 padlen=1.3mm padwidth=.6mm '
+            'pitch=1.27mm span=10.65mm pkglen=13mm thermal=6,14 vias=2,4 '
+            'viadrill=.015in thermalexp=4,10', self.rules, self.rack,
+            warning_sink)
+        self.assertEqual(fp.drc(self.rules), [])
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,43 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import landmaker.fp_bga as bga
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestBga(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def make(self, **kw):
+        return r.Geda_FP_bga.from_kwargs('bga', self.rules, self.rack,
+            warning_sink, pitch=fc.Dim.MM(0.8), ball=fc.Dim.MM(0.4), **kw)
+
+    def test_00jedec_names(self):
+        names = bga.jedec_row_names(22)
+        self.assertEqual(names[:9], list('ABCDEFGHJ'))
+        self.assertEqual(names[19:], ['Y', 'AA', 'AB'])
+        self.assertRaises(fc.ParamValueError, bga.jedec_row_names, 500)
+
+    def test_01full_grid(self):
+        fp = self.make(rows=10, cols=12)
+        self.assertEqual(len(fp.pins), 120)
+        self.assertEqual(fp.pins[0].name, 'A1')
+        self.assertTrue(fp.pins[0].loc == fc.Pt.MM(-4.4, 3.6))
+        self.assertEqual(fp.pins[-1].name, 'K12')
+        self.assertEqual(fp.pins[-1].num, 120)
+        self.assertTrue(all([p.geo is fp.pins[0].geo for p in fp.pins]))
+
+    def test_02depopulate(self):
+        fp = self.make(rows=10, cols=10, void=[4, 4], depop=['A1', 'k10'])
+        self.assertEqual(len(fp.pins), 100 - 16 - 2)
+        fp = self.make(rows=10, cols=10, perimeter=2)
+        self.assertEqual(len(fp.pins), 100 - 36)
+        self.assertRaises(fc.ParamValueError, self.make, rows=10, cols=10,
+                          void=[3, 4])
+
+if __name__ == '__main__':
+    ut.main()
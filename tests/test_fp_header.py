@@ -0,0 +1,62 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestHeader(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def make(self, **kw):
+        return r.Geda_FP_header.from_kwargs('header', self.rules, self.rack,
+            warning_sink, drill=fc.Dim.INCH(0.04), dia=fc.Dim.MIL(70), **kw)
+
+    def test_00zigzag(self):
+        fp = self.make(rows=2, cols=5)
+        self.assertEqual(len(fp.pins), 10)
+        self.assertTrue(fp.pins[0].loc == fc.Pt.MIL(-200, 50))
+        self.assertTrue(fp.pins[1].loc == fc.Pt.MIL(-200, -50))
+        self.assertTrue(fp.pins[2].loc == fc.Pt.MIL(-100, 50))
+        # Square pin 1, one shared round geometry for the rest.
+        self.assertTrue(fp.pins[0].geo is not fp.pins[1].geo)
+        self.assertTrue(all([p.geo is fp.pins[1].geo for p in fp.pins[1:]]))
+
+    def test_01straight(self):
+        fp = self.make(rows=2, cols=5, numbering='straight',
+                       rowpitch=fc.Dim.MIL(200))
+        self.assertTrue(fp.pins[1].loc == fc.Pt.MIL(-100, 100))
+        self.assertTrue(fp.pins[5].loc == fc.Pt.MIL(-200, -100))
+        self.assertRaises(fc.ParamValueError, self.make, rows=2, cols=5,
+                          numbering='spiral')
+
+    def test_02rendering(self):
+        fp = self.make(rows=1, cols=2)
+        pins = [ln for ln in fp.rendering(warning_sink) if 'Pin[' in ln]
+        self.assertEqual(pins, [
+            '    Pin[-5000 0 7000 1600 7800 4000 "1" "1" "square"]',
+            '    Pin[5000 0 7000 1600 7800 4000 "2" "2" ""]'])
+
+    def test_03drill_requests(self):
+        fp = self.make(rows=1, cols=2)
+        # 70 mil pads on 40 mil drills keep 10 mil rings up to 50 mils.
+        self.rules['drilltol'] = fc.Dim.MM(1)
+        reqs = fp.drill_requests(self.rules)
+        self.assertEqual(len(reqs), 2)
+        self.assertEqual(reqs[0][0], fc.Dim.INCH(0.04))
+        self.assertAlmostEqual(reqs[0][1], fc.Dim.MIL(10).mm)
+        self.rules['drilltol'] = fc.Dim.MM(0.1)
+        self.assertAlmostEqual(fp.drill_requests(self.rules)[1][1], 0.1)
+
+    def test_04chart(self):
+        fp = self.make(rows=2, cols=3)
+        rack = fc.DrillRack([fc.Dim.MM(1.1)])
+        self.assertEqual(rack.chart([('a.fp', fp), ('b.fp', fp)]), [
+            (name, 6, fc.Dim.INCH(0.04), fc.Dim.MM(1.1), '#60', '#60')
+            for name in ['a.fp', 'b.fp']])
+
+if __name__ == '__main__':
+    ut.main()
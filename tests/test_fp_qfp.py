@@ -0,0 +1,52 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestQfp(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rules = fc.RulesDictionary(fc._defaultRules)
+        self.rack = fc.DrillRack()
+
+    def make(self, **kw):
+        return r.Geda_FP_qfp.from_kwargs('qfp', self.rules, self.rack,
+            warning_sink, padlen=fc.Dim.MM(1.5), padwidth=fc.Dim.MM(0.3),
+            pitch=fc.Dim.MM(0.8), **kw)
+
+    def test_00four_rows(self):
+        fp = self.make(pins=44, span=[fc.Dim.MM(12)])
+        self.assertEqual(len(fp.pins), 44)
+        # Pin 1 tops the left row, numbering runs counter-clockwise.
+        self.assertTrue(fp.pins[0].loc == fc.Pt.MM(-5.25, 4.0))
+        self.assertTrue(fp.pins[11].loc == fc.Pt.MM(-4.0, -5.25))
+        self.assertTrue(fp.pins[22].loc == fc.Pt.MM(5.25, -4.0))
+        self.assertTrue(fp.pins[33].loc == fc.Pt.MM(4.0, 5.25))
+        left, bottom = fp.pins[0].geo, fp.pins[11].geo
+        self.assertTrue(all([p.geo is left for p in fp.pins[22:33]]))
+        self.assertTrue(all([p.geo is bottom for p in fp.pins[33:]]))
+        self.assertTrue(left.land.aperture.xsize == bottom.land.aperture.ysize)
+
+    def test_01rectangular(self):
+        fp = self.make(pins=20, xpins=4, span=[fc.Dim.MM(4), fc.Dim.MM(5)],
+                       shape='rect')
+        self.assertEqual(len(fp.pins), 20)
+        self.assertAlmostEqual(fp.pins[6].loc.x.mm, -1.2)
+        self.assertAlmostEqual(fp.pins[6].loc.y.mm, -1.75)
+        self.assertRaises(fc.ParamValueError, self.make, pins=21,
+                          span=[fc.Dim.MM(12)])
+
+    def test_02exposed_pad(self):
+        fp = self.make(pins=32, span=[fc.Dim.MM(7)],
+                       thermal=[fc.Dim.MM(3), fc.Dim.MM(4)],
+                       thermalexp=[fc.Dim.MM(2.8), fc.Dim.MM(3.8)],
+                       vias=[3, 2], viadrill=fc.Dim.MM(0.3))
+        thrm = fp.pins[-1]
+        self.assertEqual(thrm.num, 33)
+        self.assertEqual(len(thrm.geo.holes), 6)
+        self.assertTrue(thrm.geo.holes[0].offset == fc.Pt.MM(-1.0, -1.0))
+
+if __name__ == '__main__':
+    ut.main()
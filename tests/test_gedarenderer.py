@@ -0,0 +1,86 @@
+import landmaker.footprintcore as fc
+import landmaker.gedarenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestGedaRenderer(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Geda_Footprint)
+        self.rack = fc.DrillRack()
+        self.rules = fc.RulesDictionary()
+        self.rules['maskrelief'] = fc.Dim('4mil')
+        self.rules['minspace'] = fc.Dim('8mil')
+        self.rules['refdessize'] = fc.Dim('40mil')
+        self.rules['minsilk'] = fc.Dim('10mil')
+
+    def so(self, pins):
+        return r.Geda_FP_so.from_kwargs('so', self.rules, self.rack,
+            warning_sink, pins=pins, padlen=fc.Dim.MM(1.3),
+            padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27),
+            span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13))
+
+    def test_00pad_template(self):
+        fp = self.so(20)
+        lines = list(fp.rendering(warning_sink))
+        self.assertTrue(
+            '    Pad[-21161 -22500 -18405 -22500 2362 1600 3162 "1" "1" ""]'
+            in lines)
+        self.assertTrue(
+            '    Pad[18405 22499 21161 22499 2362 1600 3162 "11" "11" ""]'
+            in lines)
+
+    def test_01shared_cache(self):
+        fp = self.so(20)
+        list(fp.rendering(warning_sink))
+        geo = fp.pins[0].geo
+        self.assertTrue(all([p.geo._render_cache is geo._render_cache
+                             for p in fp.pins]))
+
+    def test_02invalidate(self):
+        fp = self.so(20)
+        list(fp.rendering(warning_sink))
+        geo = fp.pins[0].geo
+        geo.onback = True
+        self.assertFalse(hasattr(geo, '_render_cache'))
+
+    def test_02bchanged_land(self):
+        # Lands changed in place after a rendering are rendered anew.
+        fp = self.so(20)
+        before = list(fp.rendering(warning_sink))
+        land = fp.pins[0].geo.land
+        land.clearance = land.clearance * 2.0
+        land.aperture.ysize = land.aperture.ysize * 0.5
+        after = list(fp.rendering(warning_sink))
+        self.assertNotEqual(before, after)
+        self.assertTrue(
+            '    Pad[-21751 -22500 -17814 -22500 1181 3200 1981 "1" "1" ""]'
+            in after)
+
+    def test_03format_pad(self):
+        pin = self.so(20).pins[0]
+        pad = pin.geo
+        self.assertEqual(
+            pad.land.aperture.format_pad(pin, pad.land, pad.mask, True),
+            'Pad[-21161 -22500 -18405 -22500 2362 1600 3162 "1" "1" "onsolder"]')
+
+    def test_04silk_arc(self):
+        arc = r.Geda_SilkArc(fc.Pt.MIL(0,100), fc.Dim.MIL(30), 180, 180,
+                             fc.Dim.MIL(10))
+        self.assertEqual(list(arc.rendering(warning_sink)),
+            ['ElementArc[0 -10000 3000 3000 0 180 1000]'])
+
+    def test_05chunked(self):
+        fp = self.so(40)
+        serial = list(fp.rendering(warning_sink))
+        saved = r.render_jobs, r.parallel_threshold, r.chunk_size
+        try:
+            r.render_jobs, r.parallel_threshold, r.chunk_size = 2, 0, 7
+            parallel = list(fp.rendering(warning_sink))
+        finally:
+            r.render_jobs, r.parallel_threshold, r.chunk_size = saved
+        self.assertEqual(serial, parallel)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,66 @@
+import landmaker.footprintcore as fc
+import landmaker.gerberrenderer as r
+import unittest as ut
+
+def warning_sink(msg):
+    pass
+
+class TestGerber(ut.TestCase):
+    def setUp(self):
+        fc.activateRenderer(r.Gerber_Footprint)
+        self.rack = fc.DrillRack()
+        self.rules = fc.RulesDictionary()
+        self.rules['maskrelief'] = fc.Dim('4mil')
+        self.rules['minspace'] = fc.Dim('8mil')
+        self.rules['refdessize'] = fc.Dim('40mil')
+        self.rules['minsilk'] = fc.Dim('8mil')
+
+    def test_00aperture_table(self):
+        t = r.ApertureTable()
+        self.assertEqual(t.dcode('C,1.000000'), 10)
+        self.assertEqual(t.dcode('R,1.000000X2.000000'), 11)
+        self.assertEqual(t.dcode('C,1.000000'), 10)
+        self.assertEqual(len(t), 2)
+        self.assertEqual(list(t.rendering()),
+            ['%ADD10C,1.000000*%', '%ADD11R,1.000000X2.000000*%'])
+
+    def test_01interned_pads(self):
+        fp = r.Gerber_FP_so.from_kwargs('so200', self.rules, self.rack,
+            warning_sink, pins=200, padlen=fc.Dim.MM(1.3),
+            padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27),
+            span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13))
+        layers = fp.plot(warning_sink)
+        copper = list(layers['topcopper'].rendering())
+        self.assertEqual(len(layers['topcopper'].apertures), 1)
+        self.assertEqual(len([ln for ln in copper if ln.endswith('D03*')]), 200)
+        self.assertEqual(len(layers['topmask'].apertures), 1)
+        self.assertEqual(len(layers['bottomcopper']), 0)
+
+    def test_02thru_pin_layers(self):
+        fp = r.Gerber_FP_hole.from_kwargs('hole01', self.rules, self.rack,
+            warning_sink, drill=fc.Dim('0.02inch'), pad=fc.Dim('35mil'))
+        names = [fn for fn, lines in fp.layer_files('hole01.fp', warning_sink)]
+        self.assertEqual(names,
+            ['hole01.gtl', 'hole01.gts', 'hole01.gbl', 'hole01.gbs'])
+
+    def test_03gang_mask(self):
+        fp = r.Gerber_FP_so.from_kwargs('so20', self.rules, self.rack,
+            warning_sink, pins=20, padlen=fc.Dim.MM(1.3),
+            padwidth=fc.Dim.MM(0.6), pitch=fc.Dim.MM(1.27),
+            span=fc.Dim.MM(10.65), pkglen=fc.Dim.MM(13), gang=None)
+        layers = fp.plot(warning_sink)
+        mask = list(layers['topmask'].rendering())
+        # Two row openings, each flashed once, instead of 20 pad openings.
+        self.assertEqual(len([ln for ln in mask if ln.endswith('D03*')]), 2)
+        self.assertTrue('%ADD10R,1.970000X12.700000*%' in mask)
+
+    def test_04courtyard(self):
+        fp = r.Gerber_FP_hole.from_kwargs('hole01', self.rules, self.rack,
+            warning_sink, drill=fc.Dim('0.02inch'), pad=fc.Dim('35mil'))
+        fp.make_courtyard(fc.Dim.MM(0.25))
+        files = dict(fp.layer_files('hole01.fp', warning_sink))
+        strokes = [ln for ln in files['hole01.gm1'] if ln.endswith('D01*')]
+        self.assertEqual(len(strokes), 4)
+
+if __name__ == '__main__':
+    ut.main()
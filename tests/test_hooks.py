@@ -0,0 +1,58 @@
+import json
+import StringIO
+import landmaker.footprintcore as fc
+import unittest as ut
+
+class TestHooks(ut.TestCase):
+    def setUp(self):
+        self.hooks = fc.Hooks()
+        self.ring = fc.RingSink(3)
+
+    def test_00off(self):
+        self.assertFalse(self.hooks.on)
+        self.assertTrue(self.hooks.span('render') is fc._noSpan)
+        self.hooks.add_sink(self.ring)
+        self.assertTrue(self.hooks.on)
+        self.hooks.remove_sink(self.ring)
+        self.assertFalse(self.hooks.on)
+
+    def test_01records(self):
+        self.hooks.add_sink(self.ring)
+        with self.hooks.span('fp', plugin='so'):
+            self.hooks.event('drill', size=fc.Dim.MM(1))
+        kinds = [(r['kind'], r['name'], r['depth'])
+                 for r in self.ring.records()]
+        self.assertEqual(kinds, [('begin', 'fp', 0), ('event', 'drill', 1),
+                                 ('end', 'fp', 0)])
+        end = self.ring.records()[2]
+        self.assertEqual(end['plugin'], 'so')
+        self.assertTrue(end['wall'] >= 0 and 'error' not in end)
+        # The ring keeps the last records only.
+        self.hooks.event('last')
+        self.assertEqual(self.ring.records()[-1]['name'], 'last')
+        self.assertEqual(len(self.ring.records()), 3)
+
+    def test_02error(self):
+        self.hooks.add_sink(self.ring)
+        def fail():
+            with self.hooks.span('fp'):
+                raise fc.ParamSyntax('bad')
+        self.assertRaises(fc.ParamSyntax, fail)
+        self.assertEqual(self.ring.records()[-1]['error'], 'ParamSyntax')
+        self.assertEqual(self.hooks._depth, 0)
+
+    def test_03sinks(self):
+        f, out = StringIO.StringIO(), StringIO.StringIO()
+        self.hooks.add_sink(fc.JsonLinesSink(f))
+        self.hooks.add_sink(fc.ConsoleSink(['rc.'], out))
+        self.hooks.event('rc.file', path='landmaker.rc')
+        self.hooks.event('include', file='x.lm')
+        records = [json.loads(ln) for ln in f.getvalue().splitlines()]
+        self.assertEqual([r['name'] for r in records], ['rc.file', 'include'])
+        self.assertEqual(out.getvalue(), 'rc.file path=landmaker.rc\n')
+        with self.hooks.span('rc.read'):
+            pass
+        self.assertTrue(out.getvalue().splitlines()[-1].startswith('rc.read ('))
+
+if __name__ == '__main__':
+    ut.main()
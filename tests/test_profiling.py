@@ -0,0 +1,40 @@
+import time
+import landmaker.footprintcore as fc
+import landmaker.profiling as prof
+import unittest as ut
+
+class TestProfiling(ut.TestCase):
+    def setUp(self):
+        self.hooks = fc.Hooks()
+
+    def test_00nested(self):
+        p = prof.Profiler()
+        self.hooks.add_sink(p)
+        self.hooks.event('fp', footprint='big.fp', plugin='bga')
+        with self.hooks.span('geometry'):
+            time.sleep(0.02)
+            with self.hooks.span('params'):
+                time.sleep(0.01)
+        self.hooks.event('fp', footprint='small.fp', plugin='so')
+        with self.hooks.span('render'):
+            pass
+        times = p.footprints[0][2]
+        # Inner time is not charged to the outer phase.
+        self.assertTrue(0.01 <= times['params'][0] < 0.02)
+        self.assertTrue(0.02 <= times['geometry'][0] < 0.03)
+        lines = list(p.report())
+        self.assertEqual([ln.split()[0:2] for ln in lines[2:5]],
+                         [['bga', '1'], ['so', '1'], ['all', '2']])
+        self.assertEqual(lines[7].split()[0], 'big.fp')
+
+    def test_01empty(self):
+        self.assertEqual(list(prof.Profiler().report()),
+                         ['No footprints profiled.'])
+        # Added inside a phase: its end is ignored.
+        p = prof.Profiler()
+        with self.hooks.span('render'):
+            self.hooks.add_sink(p)
+        self.assertEqual(p.footprints, [])
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+import unittest as ut
+
+top = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestRc(ut.TestCase):
+    # Runs bin/landmaker, whose rc snapshot lives in ~/.landmaker/cache.
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.dir, 'home', '.landmaker'))
+        os.mkdir(os.path.join(self.dir, 'a'))
+        os.mkdir(os.path.join(self.dir, 'b'))
+        self.writes = 0
+        self.write('rc', 'rule minsilk = 10mil\ninclude fab.inc\n')
+        self.write('q.lm', 'ruleset ?\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        fn = os.path.join(self.dir, name)
+        with open(fn, 'w') as f:
+            f.write(text)
+        # Same size rewrites within a clock tick must still be seen.
+        self.writes += 1
+        t = os.path.getmtime(fn) + self.writes
+        os.utime(fn, (t, t))
+
+    def run_in(self, cwd):
+        "(restored, minsilk line, errors) of a run in cwd."
+        env = dict(os.environ, HOME=os.path.join(self.dir, 'home'),
+                   PYTHONPATH=top)
+        p = subprocess.Popen([sys.executable,
+            os.path.join(top, 'bin', 'landmaker'),
+            '--rc', os.path.join(self.dir, 'rc'), '--trace', 'rc.restored',
+            os.path.join(self.dir, 'q.lm')], cwd=os.path.join(self.dir, cwd),
+            env=env, stdout=subprocess.PIPE)
+        lines = p.communicate()[0].splitlines()
+        return (any([ln.startswith('rc.restored') for ln in lines]),
+                [ln for ln in lines if ln.startswith('minsilk')][0],
+                len([ln for ln in lines if ln.startswith('Error')]))
+
+    def test_00restore(self):
+        self.write('a/fab.inc', 'rule minsilk = 12mil\n')
+        self.assertEqual(self.run_in('a'), (False, 'minsilk = 12 mil', 0))
+        self.assertEqual(self.run_in('a'), (True, 'minsilk = 12 mil', 0))
+        # A changed include invalidates the snapshot.
+        self.write('a/fab.inc', 'rule minsilk = 14mil\n')
+        self.assertEqual(self.run_in('a'), (False, 'minsilk = 14 mil', 0))
+        self.assertEqual(self.run_in('a'), (True, 'minsilk = 14 mil', 0))
+
+    def test_01missing(self):
+        # Runs with errors are not snapshot, so the error shows again.
+        self.assertEqual(self.run_in('a'), (False, 'minsilk = 10 mil', 1))
+        self.assertEqual(self.run_in('a'), (False, 'minsilk = 10 mil', 1))
+        self.write('a/fab.inc', 'rule minsilk = 12mil\n')
+        self.assertEqual(self.run_in('a'), (False, 'minsilk = 12 mil', 0))
+
+    def test_02cwd(self):
+        # Includes are relative to the cwd, so each has its own snapshot.
+        self.write('a/fab.inc', 'rule minsilk = 12mil\n')
+        self.write('b/fab.inc', 'rule minsilk = 20mil\n')
+        self.run_in('a')
+        self.assertEqual(self.run_in('b'), (False, 'minsilk = 20 mil', 0))
+        self.assertEqual(self.run_in('b'), (True, 'minsilk = 20 mil', 0))
+        self.assertEqual(self.run_in('a'), (True, 'minsilk = 12 mil', 0))
+
+if __name__ == '__main__':
+    ut.main()
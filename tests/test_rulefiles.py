@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import cPickle as pickle
+import landmaker.footprintcore as fc
+import landmaker.rulefiles as rf
+import unittest as ut
+
+JSON = '''{"rulesets": {"reflow": {"from": "default", "minspace": "6 mil",
+                             "license": "GPL"}},
+ "drillracks": {"fab": {"drills": ["0.8 mm", "#60", "0.02"],
+                        "screw": "0.116"}}}'''
+
+INI = '''[ruleset hand]
+from = reflow
+minannulus = 14 mil
+license = GPL-3
+art = CC-BY
+pad = 2*minannulus + mindrill
+[drillrack fab2]
+from = fab
+drills = 0.3 mm, 0.4mm
+'''
+
+class TestRuleFiles(ut.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.saved = rf.cache_dir
+        rf.cache_dir = os.path.join(self.dir, 'cache')
+        self.ruleSets = {'default': fc.RulesDictionary(fc._defaultRules)}
+        self.drillRacks = {}
+
+    def tearDown(self):
+        rf.cache_dir = self.saved
+        shutil.rmtree(self.dir)
+
+    def write(self, name, text):
+        fn = os.path.join(self.dir, name)
+        with open(fn, 'w') as f:
+            f.write(text)
+        return fn
+
+    def install(self, fn):
+        rf.install(rf.load(fn), self.ruleSets, self.drillRacks)
+
+    def test_00json_ini(self):
+        self.install(self.write('fab.json', JSON))
+        self.install(self.write('hand.ini', INI))
+        hand = self.ruleSets['hand']
+        self.assertEqual(hand['minannulus'], fc.Dim.MIL(14))
+        self.assertEqual(hand['minspace'], fc.Dim.MIL(6))
+        self.assertEqual(hand['minsilk'], fc.Dim.MIL(10))
+        self.assertEqual(self.ruleSets['reflow']['license'], 'GPL')
+        self.assertTrue(isinstance(hand['license'], str))
+        self.assertEqual(hand['license'], 'GPL-3')
+        self.assertEqual(hand['art'], 'CC-BY')
+        self.assertEqual(hand['pad'], fc.Dim.MIL(48))
+        fab = self.drillRacks['fab']
+        self.assertEqual(fab.drills(),
+            [fc.Dim.INCH(0.02), fc.Dim.MM(0.8), fc.Dim.INCH(0.04)])
+        self.assertEqual(fab['screw'], fc.Dim.INCH(0.116))
+        fab2 = self.drillRacks['fab2']
+        self.assertEqual(len(fab2.drills()), 5)
+        self.assertEqual(fab2['screw'], fc.Dim.INCH(0.116))
+
+    def test_01errors(self):
+        self.assertRaises(rf.RuleFileError, self.install,
+                          self.write('bad.ini', '[ruleset x]\nminspace = 6\n'))
+        self.assertRaises(rf.RuleFileError, self.install,
+                          self.write('bad.json', '{"rulesets": '))
+        self.assertRaises(rf.RuleFileError, self.install,
+                          self.write('orphan.ini', '[ruleset x]\nfrom = y\n'))
+        self.assertRaises(rf.RuleFileError, self.install,
+                          os.path.join(self.dir, 'nosuch.json'))
+        # A misspelt rule in an expression is not kept as text.
+        fn = self.write('typo.ini', '[ruleset t]\nfrom = default\n'
+                        'pad = mindril + 2*minannulus\n')
+        try:
+            self.install(fn)
+        except rf.RuleFileError as e:
+            self.assertTrue("'mindril' (mindrill?)" in str(e))
+        else:
+            self.fail('No RuleFileError.')
+        self.assertFalse('pad' in self.ruleSets['t'])
+        self.install(self.write('a.ini', '[ruleset a]\nfrom = default\n'))
+        self.assertRaises(rf.RuleFileError, self.install,
+                          self.write('loop.ini', '[ruleset default]\nfrom = a\n'))
+
+    def test_02cache(self):
+        fn = self.write('fab.json', JSON)
+        entries = rf.load(fn)
+        key = 'rules:' + os.path.abspath(fn)
+        self.assertEqual(rf.load_state(key), entries)
+        # An unchanged file is not parsed again.
+        fake = [('ruleset', 'cached', None, {})]
+        rf.save_state(key, fake, [fn])
+        self.assertEqual(rf.load(fn), fake)
+        # Touched but unchanged files still hit on the hash.
+        st = os.stat(fn)
+        os.utime(fn, (st.st_atime, st.st_mtime + 10))
+        self.assertEqual(rf.load(fn), fake)
+        # Changed files are parsed.
+        self.write('fab.json', JSON.replace('6 mil', '5 mil'))
+        os.utime(fn, (st.st_atime, st.st_mtime + 20))
+        self.assertEqual(rf.load(fn)[0][3]['minspace'], fc.Dim.MIL(5))
+        self.assertEqual(len(rf.load(fn)), len(entries))
+
+    def test_03state(self):
+        rc = self.write('landmaker.rc', 'ruleset reflow from default\n')
+        reflow = fc.RulesDictionary(parent=self.ruleSets['default'])
+        reflow['minspace'] = fc.Dim.MIL(6)
+        self.ruleSets['reflow'] = reflow
+        snap = reflow.snapshot()
+        rf.save_state('rc', {'ruleSets': self.ruleSets}, [rc])
+        sets = rf.load_state('rc')['ruleSets']
+        self.assertTrue(sets['reflow'].parent is sets['default'])
+        self.assertEqual(sets['reflow'].snapshot(), snap)
+        # Restored sets take new versions, so a parent change shows.
+        version = sets['reflow'].chain_version()
+        sets['default']['minsilk'] = fc.Dim.MIL(7)
+        self.assertTrue(sets['reflow'].chain_version() > version)
+        self.assertEqual(sets['reflow'].snapshot()['minsilk'], fc.Dim.MIL(7))
+        self.write('landmaker.rc', 'ruleset other\n')
+        self.assertEqual(rf.load_state('rc'), None)
+        self.assertEqual(rf.load_state('nosuch'), None)
+
+    def test_04missing(self):
+        # A file missing when the state was saved must stay missing.
+        inc = os.path.join(self.dir, 'fab.inc')
+        rf.save_state('rc', {'x': 1}, [inc])
+        self.assertEqual(rf.load_state('rc'), {'x': 1})
+        self.write('fab.inc', 'rule minsilk = 12mil\n')
+        self.assertEqual(rf.load_state('rc'), None)
+
+if __name__ == '__main__':
+    ut.main()
@@ -0,0 +1,46 @@
+import landmaker.footprintcore as fc
+import unittest as ut
+
+class TestViaField(ut.TestCase):
+    def setUp(self):
+        self.ur = fc.Pt.MM(2, 3)
+        self.ll = -self.ur
+
+    def coords(self, pts):
+        return [(round(p.x.mm, 6), round(p.y.mm, 6)) for p in pts]
+
+    def test_00counts(self):
+        pts = fc.Footprint.via_field(self.ll, self.ur, fc.Dim.MM(0.3),
+                                     counts=(2, 3))
+        self.assertEqual(self.coords(pts), [(-1, -2), (-1, 0), (-1, 2),
+                                            (1, -2), (1, 0), (1, 2)])
+
+    def test_01stagger(self):
+        pts = fc.Footprint.via_field(self.ll, self.ur, fc.Dim.MM(0.3),
+                                     counts=(3, 3), stagger=True)
+        self.assertEqual(len(pts), 8)
+        self.assertEqual(self.coords(pts)[3:5], [(0, -1), (0, 1)])
+
+    def test_02pitch(self):
+        # 4mm wide: 0.3 drill and 0.2 edges leave 3.3mm, so 4 at 1mm.
+        pts = fc.Footprint.via_field(self.ll, self.ur, fc.Dim.MM(0.3),
+            pitch=(fc.Dim.MM(1), fc.Dim.MM(1)), space=fc.Dim.MM(0.2))
+        xs = sorted(set([x for x, y in self.coords(pts)]))
+        self.assertEqual(xs, [-1.5, -0.5, 0.5, 1.5])
+        self.assertEqual(len(pts), 4 * 6)
+
+    def test_03space(self):
+        self.assertRaises(fc.ParamValueError, fc.Footprint.via_field,
+            self.ll, self.ur, fc.Dim.MM(0.8), counts=(4, 4),
+            space=fc.Dim.MM(0.3))
+        # Columns 0.5 apart are too close unless staggered.
+        pitch = (fc.Dim.MM(0.5), fc.Dim.MM(1.5))
+        self.assertRaises(fc.ParamValueError, fc.Footprint.via_field,
+            self.ll, self.ur, fc.Dim.MM(0.3), pitch=pitch,
+            space=fc.Dim.MM(0.3))
+        pts = fc.Footprint.via_field(self.ll, self.ur, fc.Dim.MM(0.3),
+            pitch=pitch, stagger=True, space=fc.Dim.MM(0.3))
+        self.assertEqual(len(pts), 4 * 4 + 3 * 3)
+
+if __name__ == '__main__':
+    ut.main()
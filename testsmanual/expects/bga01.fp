@@ -0,0 +1,42 @@
+Element["" "" "" "" 11342 11342 0 -14342 0 100 ""]
+(
+    # 4x5 ball grid array.
+    # Generated by landmaker 2026-10-19
+    # Plugin: bga
+    # Parameters: 
+    #   body=5 mm, 5 mm
+    #   rows=4.0
+    #   void=2.0, 1.0
+    #   cols=5.0
+    #   ball=0.4 mm
+    #   pitch=0.8 mm
+    #   depop=A1
+    # rules:
+    #   maskrelief = 4 mil
+    #   minspace = 8 mil
+    #   minsilk = 10 mil
+    #   refdessize = 40 mil
+    Pad[-3149 -4724 -3149 -4724 1574 1600 2374 "A2" "2" ""]
+    Pad[0 -4724 0 -4724 1574 1600 2374 "A3" "3" ""]
+    Pad[3149 -4724 3149 -4724 1574 1600 2374 "A4" "4" ""]
+    Pad[6299 -4724 6299 -4724 1574 1600 2374 "A5" "5" ""]
+    Pad[-6299 -1574 -6299 -1574 1574 1600 2374 "B1" "6" ""]
+    Pad[-3149 -1574 -3149 -1574 1574 1600 2374 "B2" "7" ""]
+    Pad[3149 -1574 3149 -1574 1574 1600 2374 "B4" "9" ""]
+    Pad[6299 -1574 6299 -1574 1574 1600 2374 "B5" "10" ""]
+    Pad[-6299 1574 -6299 1574 1574 1600 2374 "C1" "11" ""]
+    Pad[-3149 1574 -3149 1574 1574 1600 2374 "C2" "12" ""]
+    Pad[3149 1574 3149 1574 1574 1600 2374 "C4" "14" ""]
+    Pad[6299 1574 6299 1574 1574 1600 2374 "C5" "15" ""]
+    Pad[-6299 4724 -6299 4724 1574 1600 2374 "D1" "16" ""]
+    Pad[-3149 4724 -3149 4724 1574 1600 2374 "D2" "17" ""]
+    Pad[0 4724 0 4724 1574 1600 2374 "D3" "18" ""]
+    Pad[3149 4724 3149 4724 1574 1600 2374 "D4" "19" ""]
+    Pad[6299 4724 6299 4724 1574 1600 2374 "D5" "20" ""]
+    ElementLine[-6692 -9842 9842 -9842 1000]
+    ElementLine[9842 -9842 9842 9842 1000]
+    ElementLine[9842 9842 -9842 9842 1000]
+    ElementLine[-9842 9842 -9842 -6692 1000]
+    ElementLine[-9842 -6692 -6692 -9842 1000]
+    # Courtyard -11417,11417 11417,11417 11417,-11417 -11417,-11417
+)
@@ -0,0 +1,33 @@
+Element["" "" "" "" 41500 18999 0 -21999 0 100 ""]
+(
+    # 2x5 pin header.
+    # Generated by landmaker 2026-10-19
+    # Plugin: header
+    # Parameters: 
+    #   shroud=800 mil, 350 mil
+    #   rows=2.0
+    #   cols=5.0
+    #   drill=0.04 inch
+    #   dia=70 mil
+    # rules:
+    #   maskrelief = 4 mil
+    #   minspace = 8 mil
+    #   minsilk = 10 mil
+    #   refdessize = 40 mil
+    Pin[-20000 -5000 7000 1600 7800 4200 "1" "1" "square"]
+    Pin[-20000 5000 7000 1600 7800 4200 "2" "2" ""]
+    Pin[-10000 -5000 7000 1600 7800 4200 "3" "3" ""]
+    Pin[-10000 5000 7000 1600 7800 4200 "4" "4" ""]
+    Pin[0 -5000 7000 1600 7800 4200 "5" "5" ""]
+    Pin[0 5000 7000 1600 7800 4200 "6" "6" ""]
+    Pin[10000 -5000 7000 1600 7800 4200 "7" "7" ""]
+    Pin[10000 5000 7000 1600 7800 4200 "8" "8" ""]
+    Pin[20000 -5000 7000 1600 7800 4200 "9" "9" ""]
+    Pin[20000 5000 7000 1600 7800 4200 "10" "10" ""]
+    ElementLine[-35000 -17499 40000 -17499 1000]
+    ElementLine[40000 -17499 40000 17499 1000]
+    ElementLine[40000 17499 -40000 17499 1000]
+    ElementLine[-40000 17499 -40000 -12499 1000]
+    ElementLine[-40000 -12499 -35000 -17499 1000]
+    # Courtyard -41535,19094 41535,19094 41535,-19094 -41535,-19094
+)
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
+Element["" "" "" "" 15179 15179 0 -18179 0 100 ""]
 (
     # Screw hole.
     # Generated by landmaker 2014-07-21
@@ -13,4 +13,5 @@ Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
     #   minspace = 8 mil
     #   refdessize = 40 mil
     Pin[0 0 27559 1600 28359 12500 "1" "1" ""]
+    # Courtyard -14763,14763 14763,14763 14763,-14763 -14763,-14763
 )
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
+Element["" "" "" "" 3650 3650 0 -6650 0 100 ""]
 (
     # Screw hole.
     # Generated by landmaker 2014-07-21
@@ -13,4 +13,5 @@ Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
     #   minspace = 8 mil
     #   refdessize = 40 mil
     Pin[0 0 4500 1600 5300 2000 "1" "1" ""]
+    # Courtyard -3346,3346 3346,3346 3346,-3346 -3346,-3346
 )
@@ -0,0 +1,65 @@
+Element["" "" "" "" 12366 11334 0 -14334 0 100 ""]
+(
+    # 20-pin quad package.
+    # Generated by landmaker 2026-10-19
+    # Plugin: qfp
+    # Parameters: 
+    #   body=3 mm, 4 mm
+    #   pins=20.0
+    #   span=4 mm, 5 mm
+    #   padlen=0.8 mm
+    #   pitch=0.5 mm
+    #   shape=rect
+    #   xpins=4.0
+    #   thermal=1.9 mm, 2.8 mm
+    #   gang=None
+    #   vias=2.0, 3.0
+    #   thermalexp=1.7 mm, 2.6 mm
+    #   viadrill=0.3 mm
+    #   padwidth=0.25 mm
+    # rules:
+    #   maskrelief = 4 mil
+    #   minspace = 8 mil
+    #   minsilk = 10 mil
+    #   refdessize = 40 mil
+    Pad[-7381 -4921 -5216 -4921 984 1600 1968 "1" "1" "square"]
+    Pad[-7381 -2952 -5216 -2952 984 1600 1968 "2" "2" "square"]
+    Pad[-7381 -984 -5216 -984 984 1600 1968 "3" "3" "square"]
+    Pad[-7381 984 -5216 984 984 1600 1968 "4" "4" "square"]
+    Pad[-7381 2952 -5216 2952 984 1600 1968 "5" "5" "square"]
+    Pad[-7381 4921 -5216 4921 984 1600 1968 "6" "6" "square"]
+    Pad[-2952 9350 -2952 7185 984 1600 1968 "7" "7" "square"]
+    Pad[-984 9350 -984 7185 984 1600 1968 "8" "8" "square"]
+    Pad[984 9350 984 7185 984 1600 1968 "9" "9" "square"]
+    Pad[2952 9350 2952 7185 984 1600 1968 "10" "10" "square"]
+    Pad[5216 4921 7381 4921 984 1600 1968 "11" "11" "square"]
+    Pad[5216 2952 7381 2952 984 1600 1968 "12" "12" "square"]
+    Pad[5216 984 7381 984 984 1600 1968 "13" "13" "square"]
+    Pad[5216 -984 7381 -984 984 1600 1968 "14" "14" "square"]
+    Pad[5216 -2952 7381 -2952 984 1600 1968 "15" "15" "square"]
+    Pad[5216 -4921 7381 -4921 984 1600 1968 "16" "16" "square"]
+    Pad[2952 -7185 2952 -9350 984 1600 1968 "17" "17" "square"]
+    Pad[984 -7185 984 -9350 984 1600 1968 "18" "18" "square"]
+    Pad[-984 -7185 -984 -9350 984 1600 1968 "19" "19" "square"]
+    Pad[-2952 -7185 -2952 -9350 984 1600 1968 "20" "20" "square"]
+    # thermal pad
+    Pad[0 1771 0 -1771 7480 1600 0 "THRM" "21" "square"]
+    Pad[0 1771 0 -1771 6692 0 6692 "THRM" "21" "square"]
+    Pin[-1870 -3674 3181 1600 0 1181 "THRM" "21" ""]
+    Pin[-1870 0 3181 1600 0 1181 "THRM" "21" ""]
+    Pin[-1870 3674 3181 1600 0 1181 "THRM" "21" ""]
+    Pin[1870 -3674 3181 1600 0 1181 "THRM" "21" ""]
+    Pin[1870 0 3181 1600 0 1181 "THRM" "21" ""]
+    Pin[1870 3674 3181 1600 0 1181 "THRM" "21" ""]
+    # end thermal pad
+    ElementLine[5905 -7874 5437 -7874 1000]
+    ElementLine[5905 -7874 5905 -7405 1000]
+    ElementLine[-5905 -7874 -5437 -7874 1000]
+    ElementLine[-5905 -7874 -5905 -7405 1000]
+    ElementLine[-5905 7874 -5437 7874 1000]
+    ElementLine[-5905 7874 -5905 7405 1000]
+    ElementLine[5905 7874 5437 7874 1000]
+    ElementLine[5905 7874 5905 7405 1000]
+    ElementArc[-10366 -4921 500 500 180 360 1000]
+    # Courtyard -12401,-2755 -8858,-2755 -8858,6496 -7480,6496 -7480,9448 -4527,9448 -4527,10826 4527,10826 4527,9448 7480,9448 7480,6496 8858,6496 8858,-6496 7480,-6496 7480,-9448 4527,-9448 4527,-10826 -4527,-10826 -4527,-9448 -7480,-9448 -7480,-7086 -12401,-7086
+)
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
+Element["" "" "" "" 33000 33700 0 -36700 0 100 ""]
 (
     # Alpha RE130F encoder.
     # Generated by landmaker 2014-07-27
@@ -27,4 +27,5 @@ Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
     ElementLine[26000 24500 26000 15000 1000]
     ElementLine[-26000 -24500 -7000 -24500 1000]
     ElementLine[-26000 -24500 -26000 -15000 1000]
+    # Courtyard -32677,15157 -27559,15157 -27559,25984 -7480,25984 -7480,33464 7480,33464 7480,25984 27559,25984 27559,15157 34645,15157 34645,-15157 27559,-15157 27559,-25984 7480,-25984 7480,-33464 -7480,-33464 -7480,-25984 -27559,-25984 -27559,-15157 -32677,-15157
 )
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 0 0 100 ""]
+Element["" "" "" "" 23742 27090 0 -30090 0 100 ""]
 (
     # Generated by landmaker 2014-07-28
     # Copyright 2014 David B. Curtis
@@ -39,5 +39,6 @@ Element["" "" "" "" 1000 1000 0 0 0 100 ""]
     ElementLine[14846 25590 -14846 25590 1000]
     ElementLine[-14846 25590 -14846 -25590 1000]
     ElementLine[-14846 -25590 14846 -25590 1000]
-    # <silk arc>
+    ElementArc[0 -25590 2969 2969 0 180 1000]
+    # Courtyard -23425,24803 -16338,24803 -16338,27165 16338,27165 16338,24803 23425,24803 23425,-24803 16338,-24803 16338,-27165 -16338,-27165 -16338,-24803 -23425,-24803
 )
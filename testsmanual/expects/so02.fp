@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 0 0 100 ""]
+Element["" "" "" "" 23742 28559 0 -31559 0 100 ""]
 (
     # Generated by landmaker 2014-08-07
     # Copyright 2014 David B. Curtis
@@ -52,8 +52,10 @@ Element["" "" "" "" 1000 1000 0 0 0 100 ""]
     Pin[5905 20669 3500 1600 0 1500 "THRM" "21" ""]
     # end thermal pad
     ElementLine[14846 -25590 14846 25590 1000]
-    ElementLine[14846 25590 -14846 25590 1000]
+    ElementLine[14846 25590 13311 25590 1000]
+    ElementLine[-13311 25590 -14846 25590 1000]
     ElementLine[-14846 25590 -14846 -25590 1000]
-    ElementLine[-14846 -25590 14846 -25590 1000]
-    # <silk arc>
+    ElementLine[-14846 -25590 -13311 -25590 1000]
+    ElementLine[13311 -25590 14846 -25590 1000]
+    # Courtyard -23425,24803 -16338,24803 -16338,27165 -12795,27165 -12795,28543 12795,28543 12795,27165 16338,27165 16338,24803 23425,24803 23425,-24803 16338,-24803 16338,-27165 12795,-27165 12795,-28543 -12795,-28543 -12795,-27165 -16338,-27165 -16338,-24803 -23425,-24803
 )
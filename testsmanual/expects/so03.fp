@@ -0,0 +1,44 @@
+Element["" "" "" "" 24661 27090 0 -30090 0 100 ""]
+(
+    # Generated by landmaker 2026-10-19
+    # Plugin: so
+    # Parameters: 
+    #   span=10.65 mm
+    #   pkglen=13 mm
+    #   padlen=1.3 mm
+    #   gang=None
+    #   pitch=1.27 mm
+    #   pins=20.0
+    #   padwidth=0.6 mm
+    # rules:
+    #   maskrelief = 4 mil
+    #   minspace = 8 mil
+    #   minsilk = 10 mil
+    #   refdessize = 40 mil
+    Pad[-21161 -22500 -18405 -22500 2362 1600 5000 "1" "1" ""]
+    Pad[-21161 -17500 -18405 -17500 2362 1600 5000 "2" "2" ""]
+    Pad[-21161 -12500 -18405 -12500 2362 1600 5000 "3" "3" ""]
+    Pad[-21161 -7500 -18405 -7500 2362 1600 5000 "4" "4" ""]
+    Pad[-21161 -2500 -18405 -2500 2362 1600 5000 "5" "5" ""]
+    Pad[-21161 2499 -18405 2499 2362 1600 5000 "6" "6" ""]
+    Pad[-21161 7499 -18405 7499 2362 1600 5000 "7" "7" ""]
+    Pad[-21161 12499 -18405 12499 2362 1600 5000 "8" "8" ""]
+    Pad[-21161 17499 -18405 17499 2362 1600 5000 "9" "9" ""]
+    Pad[-21161 22499 -18405 22499 2362 1600 5000 "10" "10" ""]
+    Pad[18405 -22500 21161 -22500 2362 1600 5000 "20" "20" ""]
+    Pad[18405 -17500 21161 -17500 2362 1600 5000 "19" "19" ""]
+    Pad[18405 -12500 21161 -12500 2362 1600 5000 "18" "18" ""]
+    Pad[18405 -7500 21161 -7500 2362 1600 5000 "17" "17" ""]
+    Pad[18405 -2500 21161 -2500 2362 1600 5000 "16" "16" ""]
+    Pad[18405 2499 21161 2499 2362 1600 5000 "15" "15" ""]
+    Pad[18405 7499 21161 7499 2362 1600 5000 "14" "14" ""]
+    Pad[18405 12499 21161 12499 2362 1600 5000 "13" "13" ""]
+    Pad[18405 17499 21161 17499 2362 1600 5000 "12" "12" ""]
+    Pad[18405 22499 21161 22499 2362 1600 5000 "11" "11" ""]
+    ElementLine[13927 -25590 13927 25590 1000]
+    ElementLine[13927 25590 -13927 25590 1000]
+    ElementLine[-13927 25590 -13927 -25590 1000]
+    ElementLine[-13927 -25590 13927 -25590 1000]
+    ElementArc[0 -25590 2785 2785 0 180 1000]
+    # Courtyard -23425,24803 -15551,24803 -15551,27165 15551,27165 15551,24803 23425,24803 23425,-24803 15551,-24803 15551,-27165 -15551,-27165 -15551,-24803 -23425,-24803
+)
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 12000 0 100 ""]
+Element["" "" "" "" 26150 11500 0 -14500 0 100 ""]
 (
     # foo
     # Generated by landmaker 2014-07-27
@@ -21,4 +21,5 @@ Element["" "" "" "" 1000 1000 0 12000 0 100 ""]
     ElementLine[16100 10000 -16100 10000 1000]
     ElementLine[16100 -10000 16100 10000 1000]
     ElementLine[-16100 -10000 -16100 10000 1000]
+    # Courtyard -25787,3346 -17716,3346 -17716,11614 17716,11614 17716,3346 25787,3346 25787,-3346 17716,-3346 17716,-11614 -17716,-11614 -17716,-3346 -25787,-3346
 )
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 9500 0 100 ""]
+Element["" "" "" "" 30400 9000 0 -12000 0 100 ""]
 (
     # foo
     # Generated by landmaker 2014-07-27
@@ -21,4 +21,5 @@ Element["" "" "" "" 1000 1000 0 9500 0 100 ""]
     ElementLine[22599 7500 -22599 7500 1000]
     ElementLine[22599 -7500 22599 7500 1000]
     ElementLine[-22599 -7500 -22599 7500 1000]
+    # Courtyard -30118,2559 -24212,2559 -24212,9055 24212,9055 24212,2559 30118,2559 30118,-2559 24212,-2559 24212,-9055 -24212,-9055 -24212,-2559 -30118,-2559
 )
@@ -1,4 +1,4 @@
-Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
+Element["" "" "" "" 27771 21085 0 -24085 0 100 ""]
 (
     # Molex 54819-0519 USB connector.
     # Generated by landmaker 2014-08-05
@@ -53,4 +53,5 @@ Element["" "" "" "" 1000 1000 0 7874 0 100 ""]
     ElementLine[-22047 8661 -25196 8661 1000]
     ElementLine[-25196 8661 -22047 -8661 1000]
     ElementLine[-22047 8661 -25196 -8661 1000]
+    # Courtyard -27755,12795 -26181,12795 -26181,20669 -13582,20669 -13582,18307 3740,18307 3740,9448 5511,9448 5511,-9448 3740,-9448 3740,-18307 -13582,-18307 -13582,-20669 -26181,-20669 -26181,-12795 -27755,-12795
 )